@@ -52,114 +52,38 @@ print("[INFO] All non-UTF-8 characters will be replaced with '?'")
 # import
 # ================================
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, g, stream_with_context
 from flask_cors import CORS
-from optimizer import optimize_portfolio, PortfolioOptimizer
+from optimizer import optimize_portfolio, optimize_portfolio_batch, PortfolioOptimizer, get_result_cache_stats
 from chatbot import chat
 from stock_data import get_stock_price
+from fx_rate_service import fx_rate_service
 from stock_price_service import StockPriceService, create_price_endpoints
+from stock_search_index import stock_search_index
+from perf_metrics import PhaseTimer, metrics_sink
+from json_provider import SanitizingJSONProvider, remove_emojis
+from covariance import covariance_cache
+from job_queue import job_manager, QueueFullError
+from warmup import warmup
 from workflow_engine import (
  workflow_engine, 
  create_portfolio_agent,
  WorkflowState
 )
 import traceback
-import yfinance as yf
-import requests
 import uuid
 import urllib.parse
 import json
+import time
 from pathlib import Path
 
-# ================================
-# JSON 데이터 로더
-# ================================
-
-def load_korean_stocks():
-    """한국 주식 데이터 JSON 파일 로드"""
-    data_dir = Path(__file__).parent / 'data'
-    json_file = data_dir / 'korean_stocks.json'
-    
-    if not json_file.exists():
-        logger.warning(f"Korean stocks JSON file not found: {json_file}, using fallback")
-        return {}
-    
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # JSON 배열을 딕셔너리로 변환: {ticker: (name_en, name_ko)}
-        korean_stocks = {}
-        for stock in data:
-            ticker = stock.get('ticker', '')
-            name_en = stock.get('name_en', '')
-            name_ko = stock.get('name_ko', '')
-            if ticker:
-                korean_stocks[ticker] = (name_en, name_ko)
-        
-        logger.info(f"Loaded {len(korean_stocks)} Korean stocks from JSON")
-        return korean_stocks
-    except Exception as e:
-        logger.error(f"Failed to load Korean stocks JSON: {e}")
-        return {}
-
-def load_us_stocks():
-    """미국 주식/ETF 데이터 JSON 파일 로드"""
-    data_dir = Path(__file__).parent / 'data'
-    json_file = data_dir / 'us_stocks.json'
-    
-    if not json_file.exists():
-        logger.warning(f"US stocks JSON file not found: {json_file}, using fallback")
-        return {}
-    
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # JSON 배열을 딕셔너리로 변환: {symbol: name}
-        us_stocks = {}
-        for stock in data:
-            symbol = stock.get('symbol', '')
-            name = stock.get('name', '')
-            if symbol:
-                us_stocks[symbol] = name
-        
-        logger.info(f"Loaded {len(us_stocks)} US stocks/ETFs from JSON")
-        return us_stocks
-    except Exception as e:
-        logger.error(f"Failed to load US stocks JSON: {e}")
-        return {}
-
 # ================================
 # ================================
 # Windows cp949 ? ?ы
 # ================================
 
-def remove_emojis(text):
-    """
-    ???? ? (Windows cp949 ?)
-    """
-    import re
-    # ?ш? ? ?⑦
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  #  ?
-        "\U0001F300-\U0001F5FF"  # ?щ & ?
-        "\U0001F680-\U0001F6FF"  #  & ??
-        "\U0001F1E0-\U0001F1FF"  # ?
-        "\U00002702-\U000027B0"
-        "\U000024C2-\U0001F251"
-        "\U0001F900-\U0001F9FF"  # ? ?щ
-        "\U0001FA00-\U0001FAFF"  # ? ?щ
-        "\U00002600-\U000026FF"  # ? ?щ
-        "\U00002700-\U000027BF"  # Dingbats
-        "]+",
-        flags=re.UNICODE
-    )
-    return emoji_pattern.sub(r'', text)
-
 def safe_encode_error(error_msg):
-    """? ? ?? ? ??? ?"""
+    """에러 메시지에서 이모지 제거 (Windows cp949 호환)"""
     return remove_emojis(str(error_msg))
 
 # ( )
@@ -196,68 +120,50 @@ ALPHA_VANTAGE_KEY = os.getenv('ALPHA_VANTAGE_API_KEY', '')
 if not ALPHA_VANTAGE_KEY:
  logger.warning("ALPHA_VANTAGE_API_KEY not set in environment. Stock search may be limited.")
 
+# 종목 검색
+SEARCH_RESULT_LIMIT = 10
+SEARCH_ENRICH_TIMEOUT_SECONDS = float(os.getenv('SEARCH_ENRICH_TIMEOUT_SECONDS', 1.5))  # enrich=true 가격 조회 데드라인
+
 app = Flask(__name__, static_folder='static')
+app.json = SanitizingJSONProvider(app)  # 모든 JSON 응답: 직렬화 1회 + 이모지 제거 (orjson 있으면 사용)
 CORS(app) # CORS ( )
 
-# ================================
-# JSON (after_request )
-# ================================
-@app.after_request
-def clean_response(response):
-    """모든 JSON 응답에서 이모지 자동 제거"""
-    if response.content_type and 'application/json' in response.content_type:
-        try:
-            import json
-            data = json.loads(response.get_data(as_text=True))
-            # 이모지 제거
-            def clean_dict(obj):
-                if isinstance(obj, dict):
-                    return {k: clean_dict(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [clean_dict(item) for item in obj]
-                elif isinstance(obj, str):
-                    return remove_emojis(obj)
-                else:
-                    return obj
-            
-            cleaned_data = clean_dict(data)
-            response.set_data(json.dumps(cleaned_data, ensure_ascii=True))
-        except:
-            # JSON 파싱 실패 시 원본 응답 반환
-            pass
-    return response
+# 종목 검색 인덱스 (시작 시 1회 빌드, JSON 변경 시 자동 재로드)
+stock_search_index.load()
 
 # ================================
-# Windows cp949 
+# Per-phase timing (optimize endpoints)
 # ================================
+def start_request_timer():
+    """이 요청의 PhaseTimer (응답 후처리가 끝나면 metrics_sink 에 기록됨)"""
+    g.phase_timer = PhaseTimer()
+    return g.phase_timer
 
-def remove_emojis(text):
- """
- (Windows cp949 )
- () - \U0001f4e6 () 
- """
- import re
- # ( )
- emoji_pattern = re.compile(
- "["
- "\U0001F600-\U0001F64F" # 
- "\U0001F300-\U0001F5FF" # & 
- "\U0001F680-\U0001F6FF" # & 
- "\U0001F1E0-\U0001F1FF" # 
- "\U00002702-\U000027B0"
- "\U000024C2-\U0001F251"
- "\U0001F900-\U0001F9FF" # ( )
- "\U0001FA00-\U0001FAFF" # 
- "\U00002600-\U000026FF" # 
- "\U00002700-\U000027BF" # Dingbats
- "]+",
- flags=re.UNICODE
- )
- return emoji_pattern.sub(r'', text)
 
-def safe_encode_error(error_msg):
- """"""
- return remove_emojis(str(error_msg))
+def timings_requested(data) -> bool:
+    """
+    body의 "timings": true 또는 ?timings=1 이면 응답에 timings 블록 포함
+
+    timings 블록은 응답 직렬화 전에 만들어지므로 serialize 구간이 없고 total_seconds 도
+    그 시점까지의 값입니다. serialize 를 포함한 전체 구간은 Server-Timing 헤더와
+    /api/metrics 에만 기록됩니다.
+    """
+    if isinstance(data, dict) and data.get('timings'):
+        return True
+    return request.args.get('timings', '').lower() in ('1', 'true')
+
+
+@app.after_request
+def record_request_metrics(response):
+    """PhaseTimer가 있는 요청: Server-Timing 헤더 추가 + metrics_sink 기록"""
+    timer = g.get('phase_timer')
+    if timer is not None:
+        response.headers['Server-Timing'] = ', '.join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in timer.phases.items()
+        ) + f", total;dur={timer.elapsed() * 1000:.1f}"
+        metrics_sink.observe(request.endpoint or request.path, timer, status=response.status_code)
+    return response
+
 
 def safe_json_response(data, status_code=200):
     """
@@ -270,23 +176,9 @@ def safe_json_response(data, status_code=200):
     Returns:
         Response: Flask 응답 객체
     """
-    import json
-    # 모든 문자열 값에서 이모지 제거
-    def clean_dict(obj):
-        if isinstance(obj, dict):
-            return {k: clean_dict(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [clean_dict(item) for item in obj]
-        elif isinstance(obj, str):
-            return remove_emojis(obj)
-        else:
-            return obj
-    
-    cleaned_data = clean_dict(data)
-    
-    # ensure_ascii=True로 안전한 JSON 생성
+    # app.json (SanitizingJSONProvider) 이 직렬화하면서 이모지 제거
     response = app.response_class(
-        response=json.dumps(cleaned_data, ensure_ascii=True),
+        response=app.json.dumps(data),
         status=status_code,
         mimetype='application/json'
     )
@@ -322,6 +214,39 @@ def health():
  })
 
 
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    """Liveness: 프로세스가 요청을 받을 수 있으면 200 (무거운 의존성 로딩과 무관)"""
+    return jsonify({
+        'status': 'alive',
+        'pid': os.getpid()
+    })
+
+
+@app.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    """
+    Readiness: warm-up (qiskit/yfinance import, solver pool 기동) 완료 시 200, 진행 중이면 503
+    
+    Response:
+    {
+        "status": "ready" | "warming_up",
+        "warmup": {
+            "ready": true,
+            "state": "ready",
+            "elapsed_seconds": 2.41,
+            "steps": {"import:qiskit": 0.31, ..., "solver_pool": 1.2},
+            "errors": {}
+        }
+    }
+    """
+    status = warmup.start().status()  # 아직 시작 안 됐으면 (다른 WSGI 서버 등) 여기서 시작
+    return jsonify({
+        'status': 'ready' if status['ready'] else 'warming_up',
+        'warmup': status
+    }), 200 if status['ready'] else 503
+
+
 @app.route('/api/optimize', methods=['POST'])
 @app.route('/api/portfolio/optimize', methods=['POST'])  # Spring Boot 호환성
 def optimize():
@@ -334,7 +259,11 @@ def optimize():
         "risk_factor": 0.5,  # 0.0 ~ 1.0 (기본값: 0.5)
         "method": "classical",  # "classical" 또는 "quantum" (기본값: "classical")
         "period": "1y",  # "1y", "6mo", "3mo" (기본값: "1y")
-        "reps": 1  # QAOA reps (기본값: 1)
+        "reps": 1,  # QAOA reps (기본값: 1)
+        "backend": "auto",  # QUBO 솔버: "auto", "exact", "qiskit", "numpy" (QAOA) 또는 "anneal" (기본값: 서버 설정 QAOA_BACKEND)
+        "starts": 1,  # QAOA multi-start 개수, solver pool 크기로 제한 (기본값: 서버 설정 QAOA_STARTS)
+        "covariance_estimator": "sample",  # "sample", "ledoit-wolf", "constant-correlation", "ewma"
+        "timings": false  # true면 구간별 소요 시간 블록 포함 (?timings=1 과 동일)
     }
  
     Response:
@@ -347,10 +276,19 @@ def optimize():
             "risk": 0.20,
             "sharpe_ratio": 0.75,
             "method": "classical"
+        },
+        "timings": {  # timings 요청 시
+            "total_seconds": 1.82,
+            "phases": {"fetch_data": 0.41, "calculate_returns": 0.01, "build_qubo": 0.02, "solve": 1.31, ...},
+            "qubits": 12, "backend": "exact", "result_cache": "miss", ...
         }
     }
+    
+    구간별 시간은 Server-Timing 헤더와 /api/metrics 집계에도 기록됩니다.
+    (serialize 구간은 본문 timings 에는 없고 헤더/집계에만 포함)
     """
     try:
+        timer = start_request_timer()
         data = request.get_json()
         
         # 필수 파라미터 확인
@@ -375,6 +313,9 @@ def optimize():
         # QAOA 회로 깊이 (reps)
         reps = data.get('reps', 1)  # 기본값: 1 (개발/테스트), 프로덕션: 2 추천
         precision = data.get('precision', 4)  # Weight precision in bits per asset
+        backend = data.get('backend')  # QUBO 솔버 (None이면 QAOA_BACKEND)
+        starts = data.get('starts')  # QAOA multi-start 개수 (None이면 QAOA_STARTS)
+        covariance_estimator = data.get('covariance_estimator')  # 공분산 추정기 (None이면 COVARIANCE_ESTIMATOR)
         
         # 유효성 검사
         if not 0.0 <= risk_factor <= 1.0:
@@ -389,6 +330,12 @@ def optimize():
                 'error': 'method는 "classical" 또는 "quantum"이어야 합니다.'
             }), 400
         
+        if starts is not None and (not isinstance(starts, int) or isinstance(starts, bool) or starts < 1):
+            return jsonify({
+                'success': False,
+                'error': 'starts는 1 이상의 정수여야 합니다.'
+            }), 400
+        
         logger.info(f"포트폴리오 최적화 요청: tickers={tickers}, method={method}, risk={risk_factor}")
         
         # 최적화 실행
@@ -399,22 +346,32 @@ def optimize():
                 method=method,
                 period=period,
                 reps=reps,
-                precision=precision
+                precision=precision,
+                backend=backend,
+                starts=starts,
+                timer=timer,
+                covariance_estimator=covariance_estimator
             )
         else:
             result = optimize_portfolio(
                 tickers=tickers,
                 risk_factor=risk_factor,
                 method=method,
-                period=period
+                period=period,
+                timer=timer,
+                covariance_estimator=covariance_estimator
             )
         
         logger.info(f"최적화 완료: {result['selected_tickers']}")
         
-        return jsonify({
+        response_data = {
             'success': True,
             'result': result
-        })
+        }
+        if timings_requested(data):
+            response_data['timings'] = timer.as_dict()
+        with timer.phase('serialize'):
+            return jsonify(response_data)
         
     except ValueError as e:
         logger.error(f"값 오류: {str(e)}")
@@ -482,6 +439,7 @@ def optimize_with_weights():
  }
     """
     try:
+        timer = start_request_timer()
         data = request.get_json()
         
         # 디버깅: JSON payload 확인 (이모지 제거)
@@ -538,6 +496,9 @@ def optimize_with_weights():
         # QAOA 회로 깊이 (reps)
         reps = data.get('reps', 1)  # 기본값: 1 (개발/테스트), 프로덕션: 2 추천
         precision = data.get('precision', 4)  # Weight precision in bits per asset
+        backend = data.get('backend')  # QUBO 솔버 (None이면 QAOA_BACKEND)
+        starts = data.get('starts')  # QAOA multi-start 개수 (None이면 QAOA_STARTS)
+        covariance_estimator = data.get('covariance_estimator')  # 공분산 추정기 (None이면 COVARIANCE_ESTIMATOR)
 
         # 유효성 검사
         if not 0.0 <= risk_factor <= 1.0:
@@ -552,6 +513,12 @@ def optimize_with_weights():
                 'error': 'method는 "classical" 또는 "quantum"이어야 합니다.'
             }), 400
 
+        if starts is not None and (not isinstance(starts, int) or isinstance(starts, bool) or starts < 1):
+            return jsonify({
+                'success': False,
+                'error': 'starts는 1 이상의 정수여야 합니다.'
+            }), 400
+
         weight_sum = sum(initial_weights)
         if abs(weight_sum - 1.0) > 0.01:
             return jsonify({
@@ -569,25 +536,26 @@ def optimize_with_weights():
             tickers=tickers,
             risk_factor=risk_factor,
             initial_weights=initial_weights,
-            fast_mode=fast_mode
+            fast_mode=fast_mode,
+            timer=timer,
+            covariance_estimator=covariance_estimator
         )
         optimizer.fetch_data(period=period)
         
-        # Only quantum optimization is supported
-        if method != 'quantum':
-            return jsonify({
-                'success': False,
-                'error': 'Only quantum optimization is supported.'
-            }), 400
-        
-        result = optimizer.optimize_with_weights(method='quantum', reps=reps, precision=precision)
+        result = optimizer.optimize_with_weights(
+            method=method, reps=reps, precision=precision, backend=backend, starts=starts
+        )
         
         logger.info(f"최적화 완료: 수익률 개선 {result['improvements']['return_improvement']:.2f}%")
         
-        return jsonify({
+        response_data = {
             'success': True,
             'result': result
-        })
+        }
+        if timings_requested(data):
+            response_data['timings'] = timer.as_dict()
+        with timer.phase('serialize'):
+            return jsonify(response_data)
         
     except ValueError as e:
         error_msg = safe_encode_error(str(e))
@@ -612,11 +580,108 @@ def optimize_with_weights():
         }), 500
 
 
+@app.route('/api/optimize/frontier', methods=['POST'])
+@app.route('/api/portfolio/optimize/frontier', methods=['POST'])  # Spring Boot 호환성
+def optimize_frontier():
+    """
+    효율적 투자선 (efficient frontier) API
+    
+    데이터를 한 번만 가져와 risk_factor 1.0 → 0.0 구간의 frontier 점들을 한 번에 계산
+    (risk_factor를 바꿔가며 /api/optimize 를 반복 호출하는 대신 사용)
+    
+    Request Body (JSON):
+    {
+        "tickers": ["AAPL", "GOOGL", "MSFT"],
+        "period": "1y",  # "1y", "6mo", "3mo" (기본값: "1y")
+        "points": 20,  # frontier 점 개수 (2 ~ 100, 기본값: 20)
+        "covariance_estimator": "ledoit-wolf",  # 기본값: 서버 설정 COVARIANCE_ESTIMATOR
+        "timings": false
+    }
+    
+    Response:
+    {
+        "success": true,
+        "result": {
+            "tickers": ["AAPL", "GOOGL", "MSFT"],
+            "points": 20,
+            "risk_factors": [1.0, 0.947, ...],
+            "expected_returns": [0.08, 0.09, ...],
+            "risks": [0.15, 0.151, ...],  # 오름차순
+            "sharpe_ratios": [0.53, 0.6, ...],
+            "weights": [[0.5, 0.3, 0.2], ...],  # 점별 전체 가중치 (tickers 순서)
+            "max_sharpe_index": 7,
+            "method": "classical"
+        }
+    }
+    """
+    try:
+        timer = start_request_timer()
+        data = request.get_json()
+        
+        if not data or 'tickers' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'tickers 필드가 필요합니다.'
+            }), 400
+        
+        tickers = data['tickers']
+        
+        if not isinstance(tickers, list) or len(tickers) < 2:
+            return jsonify({
+                'success': False,
+                'error': 'tickers는 2개 이상의 종목을 포함한 리스트여야 합니다.'
+            }), 400
+        
+        period = data.get('period', '1y')
+        points = data.get('points', 20)
+        covariance_estimator = data.get('covariance_estimator')
+        
+        if not isinstance(points, int) or isinstance(points, bool):
+            return jsonify({
+                'success': False,
+                'error': 'points는 정수여야 합니다.'
+            }), 400
+        
+        logger.info(f"Efficient frontier 요청: tickers={tickers}, points={points}")
+        
+        optimizer = PortfolioOptimizer(tickers=tickers, timer=timer, covariance_estimator=covariance_estimator)
+        optimizer.fetch_data(period=period)
+        result = optimizer.efficient_frontier(points=points)
+        
+        response_data = {
+            'success': True,
+            'result': result
+        }
+        if timings_requested(data):
+            response_data['timings'] = timer.as_dict()
+        with timer.phase('serialize'):
+            return jsonify(response_data)
+        
+    except ValueError as e:
+        error_msg = safe_encode_error(str(e))
+        logger.error(f"값 오류: {error_msg}")
+        return jsonify({
+            'success': False,
+            'error': error_msg
+        }), 400
+        
+    except Exception as e:
+        error_msg = safe_encode_error(str(e))
+        logger.error(f"Efficient frontier 오류: {error_msg}")
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류가 발생했습니다: {error_msg}'
+        }), 500
+
+
 @app.route('/api/optimize/batch', methods=['POST'])
 def optimize_batch():
     """
     배치 포트폴리오 최적화 API
     
+    모든 포트폴리오 종목의 합집합을 기간별로 한 번만 조회한 뒤 포트폴리오별로 잘라 쓰고,
+    포트폴리오들은 BATCH_WORKERS 개씩 동시에 최적화합니다 (QAOA 솔브는 solver pool 공유).
+    
     Request Body (JSON):
     {
         "portfolios": [
@@ -630,11 +695,27 @@ def optimize_batch():
                 "risk_factor": 0.7,
                 "method": "quantum"
             }
-        ]
+        ],
+        "timings": false,  # true면 포트폴리오별 / 전체 구간 소요 시간 포함
+        "stream": false  # true면 (또는 ?stream=1) 끝나는 순서대로 NDJSON 한 줄씩 전송
+    }
+    
+    Response:
+    {
+        "success": true,
+        "results": [{"success": true, "portfolio_index": 0, "result": {...}}, ...]  # portfolio_index 순서
     }
+    
+    Streaming response (application/x-ndjson): 포트폴리오마다
+    {"success": true, "portfolio_index": 1, "result": {...}} 한 줄, 마지막 줄은
+    {"done": true, "success": true, "count": 2}
     """
     try:
         data = request.get_json()
+        stream = bool(isinstance(data, dict) and data.get('stream')) or \
+            request.args.get('stream', '').lower() in ('1', 'true')
+        # 스트리밍 응답은 after_request 시점에 아직 작업 중이므로 metrics_sink 기록을 직접 함
+        timer = PhaseTimer() if stream else start_request_timer()
         
         if not data or 'portfolios' not in data:
             return jsonify({
@@ -643,49 +724,50 @@ def optimize_batch():
             }), 400
         
         portfolios = data['portfolios']
-        results = []
+        include_timings = timings_requested(data)
         
-        for i, portfolio in enumerate(portfolios):
-            try:
-                tickers = portfolio.get('tickers', [])
-                risk_factor = portfolio.get('risk_factor', 0.5)
-                method = portfolio.get('method', 'classical')
-                period = portfolio.get('period', '1y')
-                reps = portfolio.get('reps', 1)
-                
-                if method == 'quantum':
-                    result = optimize_portfolio(
-                        tickers=tickers,
-                        risk_factor=risk_factor,
-                        method=method,
-                        period=period,
-                        reps=reps
-                    )
-                else:
-                    result = optimize_portfolio(
-                        tickers=tickers,
-                        risk_factor=risk_factor,
-                        method=method,
-                        period=period
-                    )
-                
-                results.append({
-                    'success': True,
-                    'portfolio_index': i,
-                    'result': result
-                })
-                
-            except Exception as e:
-                results.append({
-                    'success': False,
-                    'portfolio_index': i,
-                    'error': str(e)
-                })
+        if not isinstance(portfolios, list):
+            return jsonify({
+                'success': False,
+                'error': 'portfolios는 리스트여야 합니다.'
+            }), 400
         
-        return jsonify({
+        timer.annotate(portfolios=len(portfolios))
+        logger.info(f"배치 최적화 요청: {len(portfolios)}개 포트폴리오 (stream={stream})")
+        
+        def finished_entries():
+            for entry, portfolio_timer in optimize_portfolio_batch(portfolios, timer=timer):
+                timer.merge(portfolio_timer)
+                if include_timings:
+                    entry['timings'] = portfolio_timer.as_dict()
+                yield entry
+        
+        if stream:
+            def generate():
+                count = 0
+                try:
+                    for entry in finished_entries():
+                        count += 1
+                        yield app.json.dumps(entry) + '\n'
+                    summary = {'done': True, 'success': True, 'count': count}
+                    if include_timings:
+                        summary['timings'] = timer.as_dict()
+                    yield app.json.dumps(summary) + '\n'
+                finally:
+                    metrics_sink.observe('optimize_batch', timer, status=200)
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        results = sorted(finished_entries(), key=lambda entry: entry['portfolio_index'])
+        
+        response_data = {
             'success': True,
             'results': results
-        })
+        }
+        if include_timings:
+            response_data['timings'] = timer.as_dict()
+        with timer.phase('serialize'):
+            return jsonify(response_data)
         
     except Exception as e:
         error_msg = safe_encode_error(str(e))
@@ -696,6 +778,46 @@ def optimize_batch():
         }), 500
 
 
+def workflow_optimization_func(timer: PhaseTimer):
+    """워크플로우 엔진에 넘기는 최적화 함수 (/api/optimize/workflow 와 workflow 작업이 공유)"""
+    def run_optimization(tickers, initial_weights, risk_factor, method, period, fast_mode=True):
+        """
+        Optimization wrapper for workflow
+        
+        Args:
+            tickers (list): 주식 티커 리스트
+            initial_weights (list): 초기 가중치 리스트
+            risk_factor (float): 리스크 팩터
+            method (str): 최적화 방법
+            period (str): 기간
+            fast_mode (bool): 빠른 모드 (기본값: True)
+        """
+        # Safe check: avoid NumPy array boolean evaluation
+        if initial_weights is not None and len(initial_weights) > 0:
+            # With weights
+            optimizer = PortfolioOptimizer(
+                tickers=tickers,
+                risk_factor=risk_factor,
+                initial_weights=initial_weights,
+                fast_mode=fast_mode,
+                timer=timer
+            )
+            optimizer.fetch_data(period=period)
+            return optimizer.optimize_with_weights(method=method)
+        else:
+            # Without weights
+            optimizer = PortfolioOptimizer(
+                tickers=tickers,
+                risk_factor=risk_factor,
+                fast_mode=fast_mode,
+                timer=timer
+            )
+            optimizer.fetch_data(period=period)
+            return optimizer.optimize(method=method)
+    
+    return run_optimization
+
+
 @app.route('/api/optimize/workflow', methods=['POST'])
 def optimize_with_workflow():
     """
@@ -731,6 +853,7 @@ def optimize_with_workflow():
     }
     """
     try:
+        timer = start_request_timer()
         data = request.get_json()
         
         if not data or 'tickers' not in data:
@@ -750,47 +873,15 @@ def optimize_with_workflow():
         
         logger.info(f"Created workflow: {workflow_id}")
         
-        # Prepare optimization function
-        def run_optimization(tickers, initial_weights, risk_factor, method, period, fast_mode=True):
-            """
-            Optimization wrapper for workflow
-            
-            Args:
-                tickers (list): 주식 티커 리스트
-                initial_weights (list): 초기 가중치 리스트
-                risk_factor (float): 리스크 팩터
-                method (str): 최적화 방법
-                period (str): 기간
-                fast_mode (bool): 빠른 모드 (기본값: True)
-            """
-            # Safe check: avoid NumPy array boolean evaluation
-            if initial_weights is not None and len(initial_weights) > 0:
-                # With weights
-                optimizer = PortfolioOptimizer(
-                    tickers=tickers,
-                    risk_factor=risk_factor,
-                    initial_weights=initial_weights,
-                    fast_mode=fast_mode
-                )
-                optimizer.fetch_data(period=period)
-                return optimizer.optimize_with_weights(method=method)
-            else:
-                # Without weights
-                optimizer = PortfolioOptimizer(
-                    tickers=tickers,
-                    risk_factor=risk_factor,
-                    fast_mode=fast_mode
-                )
-                optimizer.fetch_data(period=period)
-                return optimizer.optimize(method=method)
-        
         # Execute workflow
         result = workflow_engine.execute_workflow(
             workflow_id=workflow_id,
             input_data=data,
-            optimization_func=run_optimization
+            optimization_func=workflow_optimization_func(timer)
         )
         
+        if timings_requested(data):
+            result['timings'] = timer.as_dict()
         if result['success']:
             return jsonify(result)
         else:
@@ -840,6 +931,221 @@ def get_workflow_status(workflow_id):
         }), 500
 
 
+# ================================
+# Async optimization jobs
+# ================================
+JOB_KINDS = ('optimize', 'with-weights', 'workflow')
+
+
+def parse_job_request(data) -> tuple:
+    """POST /api/jobs/optimize 본문 검증 → (kind, params) (동기 엔드포인트와 같은 규칙, 실패 시 ValueError)"""
+    if not data or 'tickers' not in data:
+        raise ValueError('tickers 필드가 필요합니다.')
+    
+    tickers = data['tickers']
+    if not isinstance(tickers, list) or len(tickers) == 0:
+        raise ValueError('tickers는 비어있지 않은 리스트여야 합니다.')
+    
+    initial_weights = data.get('initial_weights')
+    kind = data.get('kind') or ('with-weights' if initial_weights else 'optimize')
+    if kind not in JOB_KINDS:
+        raise ValueError(f'kind는 {", ".join(JOB_KINDS)} 중 하나여야 합니다.')
+    
+    if kind == 'with-weights' and initial_weights is None:
+        raise ValueError('initial_weights 필드가 필요합니다.')
+    if initial_weights is not None:
+        if not isinstance(initial_weights, list) or len(initial_weights) != len(tickers):
+            raise ValueError(f'initial_weights의 개수는 tickers와 일치해야 합니다. (tickers: {len(tickers)}개, weights: {len(initial_weights) if isinstance(initial_weights, list) else 0}개)')
+        weight_sum = sum(initial_weights)
+        if abs(weight_sum - 1.0) > 0.01:
+            raise ValueError(f'initial_weights의 합이 1.0이어야 합니다. 현재: {weight_sum:.4f}')
+    
+    params = {
+        'tickers': tickers,
+        'initial_weights': initial_weights,
+        'risk_factor': data.get('risk_factor', 0.5),
+        'method': data.get('method', 'classical' if kind == 'optimize' else 'quantum'),
+        'period': data.get('period', '1y'),
+        'reps': data.get('reps', 1),
+        'precision': data.get('precision', 4),
+        'backend': data.get('backend'),
+        'starts': data.get('starts'),
+        'covariance_estimator': data.get('covariance_estimator'),
+        'fast_mode': data.get('fast_mode', True),
+        'timings': timings_requested(data)
+    }
+    
+    if not 0.0 <= params['risk_factor'] <= 1.0:
+        raise ValueError('risk_factor는 0.0과 1.0 사이여야 합니다.')
+    if params['method'] not in ['classical', 'quantum']:
+        raise ValueError('method는 "classical" 또는 "quantum"이어야 합니다.')
+    starts = params['starts']
+    if starts is not None and (not isinstance(starts, int) or isinstance(starts, bool) or starts < 1):
+        raise ValueError('starts는 1 이상의 정수여야 합니다.')
+    return kind, params
+
+
+def run_optimization_job(kind: str, params: dict, input_data: dict) -> dict:
+    """job_manager 워커 스레드에서 실행 (QAOA 솔브는 다시 solver pool 프로세스로 넘어감)"""
+    timer = PhaseTimer()
+    try:
+        if kind == 'workflow':
+            workflow_id = f"wf_{uuid.uuid4().hex[:8]}"
+            workflow_engine.create_workflow(workflow_id, create_portfolio_agent())
+            result = workflow_engine.execute_workflow(
+                workflow_id=workflow_id,
+                input_data=input_data,
+                optimization_func=workflow_optimization_func(timer)
+            )
+            if not result['success']:
+                raise RuntimeError(result.get('error', 'Workflow failed'))
+        else:
+            optimizer = PortfolioOptimizer(
+                tickers=params['tickers'],
+                risk_factor=params['risk_factor'],
+                initial_weights=params['initial_weights'],
+                fast_mode=params['fast_mode'],
+                timer=timer,
+                covariance_estimator=params['covariance_estimator']
+            )
+            optimizer.fetch_data(period=params['period'])
+            solve = optimizer.optimize_with_weights if kind == 'with-weights' else optimizer.optimize
+            result = solve(
+                method=params['method'], reps=params['reps'], precision=params['precision'],
+                backend=params['backend'], starts=params['starts']
+            )
+    finally:
+        metrics_sink.observe(f'jobs.{kind}', timer)
+    
+    if params['timings']:
+        result['timings'] = timer.as_dict()
+    return result
+
+
+@app.route('/api/jobs/optimize', methods=['POST'])
+@app.route('/api/portfolio/jobs/optimize', methods=['POST'])  # Spring Boot 호환성
+def submit_optimization_job():
+    """
+    비동기 최적화 작업 제출 API (즉시 job id 반환, 결과는 GET /api/jobs/<id> 로 조회)
+    
+    Request Body (JSON): /api/optimize, /with-weights, /workflow 와 같은 필드 +
+    {
+        "kind": "optimize",  # "optimize", "with-weights", "workflow" (기본값: initial_weights 가 있으면 "with-weights")
+        ...
+    }
+    
+    Response (202):
+    {
+        "success": true,
+        "job_id": "job_1a2b3c4d5e6f",
+        "status": "queued",
+        "status_url": "/api/jobs/job_1a2b3c4d5e6f"
+    }
+    
+    대기+실행 중 작업이 JOB_QUEUE_LIMIT 개 이상이면 429 (Retry-After 헤더 포함)
+    """
+    try:
+        data = request.get_json()
+        kind, params = parse_job_request(data)
+        
+        job = job_manager.submit(
+            kind, run_optimization_job, kind, params, data,
+            params={k: params[k] for k in ('tickers', 'risk_factor', 'method', 'period')}
+        )
+        logger.info(f"최적화 작업 제출: {job.id} kind={kind}, tickers={params['tickers']}, method={params['method']}")
+        
+        status_url = f"/api/jobs/{job.id}"
+        response = jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': status_url
+        })
+        response.headers['Location'] = status_url
+        return response, 202
+        
+    except QueueFullError as e:
+        logger.warning(f"작업 큐 포화: {e}")
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = '5'
+        return response, 429
+        
+    except ValueError as e:
+        error_msg = safe_encode_error(str(e))
+        logger.error(f"값 오류: {error_msg}")
+        return jsonify({
+            'success': False,
+            'error': error_msg
+        }), 400
+        
+    except Exception as e:
+        error_msg = safe_encode_error(str(e))
+        logger.error(f"작업 제출 오류: {error_msg}")
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류가 발생했습니다: {error_msg}'
+        }), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@app.route('/api/portfolio/jobs/<job_id>', methods=['GET'])  # Spring Boot 호환성
+def get_optimization_job(job_id):
+    """
+    최적화 작업 상태/결과 조회 API
+    
+    Response:
+    {
+        "success": true,
+        "job": {
+            "id": "job_1a2b3c4d5e6f",
+            "kind": "optimize",
+            "status": "queued|running|completed|failed",
+            "queue_position": 2,  # queued 일 때
+            "queue_seconds": 0.4,
+            "run_seconds": 3.1,
+            "result": {...},  # completed 일 때 (동기 엔드포인트의 result 와 동일)
+            "error": "...",  # failed 일 때
+            ...
+        }
+    }
+    
+    결과는 완료 후 JOB_RESULT_TTL_SECONDS 동안만 보관되며, 이후에는 404
+    """
+    try:
+        job = job_manager.get(job_id)
+        
+        if job is None:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found (unknown id or result expired)'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job
+        })
+        
+    except Exception as e:
+        error_msg = safe_encode_error(str(e))
+        logger.error(f"작업 상태 조회 오류: {error_msg}")
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류가 발생했습니다: {error_msg}'
+        }), 500
+
+
+@app.route('/api/jobs', methods=['GET'])
+def get_job_stats():
+    """작업 큐 통계 API (워커 수, 큐 상한, 상태별 작업 수, 누적 제출/거절 수)"""
+    return jsonify({
+        'success': True,
+        'data': job_manager.stats()
+    })
+
+
 @app.route('/api/chatbot/chat', methods=['POST'])
 def chatbot_chat():
     """
@@ -985,7 +1291,8 @@ def get_batch_prices_endpoint():
  "currentPrice": 71000,
  ...
  }
-    }
+    },
+    "errors": {"BADSYM": "no price data"}  # 심볼별 실패 사유
     }
     """
     try:
@@ -1000,11 +1307,12 @@ def get_batch_prices_endpoint():
         
         logger.info(f"배치 주가 조회 요청: {len(symbols)}개 심볼")
         
-        results = StockPriceService.get_batch_prices(symbols)
+        results, errors = StockPriceService.fetch_batch(symbols)
         
         return jsonify({
             "success": True,
-            "data": results
+            "data": results,
+            "errors": errors
         }), 200
         
     except Exception as e:
@@ -1022,6 +1330,113 @@ def get_batch_prices_endpoint():
         }), 500
 
 
+@app.route('/api/stock/cache/stats', methods=['GET'])
+def get_quote_cache_stats():
+    """
+    시세 캐시 통계 API
+    
+    Response:
+    {
+        "success": true,
+        "data": {"size": 12, "hits": 340, "misses": 12, "stale_hits": 25, ...}
+    }
+    """
+    return jsonify({
+        'success': True,
+        'data': StockPriceService.cache_stats()
+    })
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    최적화 요청 구간별 소요 시간 집계 API (최근 METRICS_WINDOW 개 요청 기준)
+    
+    Response:
+    {
+        "success": true,
+        "data": {
+            "optimize": {
+                "requests": 42,
+                "window": 500,
+                "metrics": {
+                    "total_seconds": {"count": 42, "mean": 1.9, "p50": 1.2, "p95": 6.1, "max": 9.8},
+                    "solve": {...}, "fetch_data": {...}, "cost_function_evals": {...}, ...
+                }
+            }
+        }
+    }
+    """
+    return jsonify({
+        'success': True,
+        'data': metrics_sink.snapshot()
+    })
+
+
+@app.route('/api/optimize/cache/stats', methods=['GET'])
+def get_optimization_cache_stats():
+    """
+    최적화 결과 캐시 통계 API
+    
+    /api/optimize, /with-weights, /batch, /workflow 가 공유하는 결과 캐시
+    (키: tickers, risk_factor, method, reps/precision/backend/starts, 공분산 추정기, 수익률 데이터 해시)
+    와 공분산 추정 캐시 통계
+    
+    Response:
+    {
+        "success": true,
+        "data": {"size": 5, "hits": 12, "misses": 5, "hit_rate": 0.7059, ...},
+        "covariance": {"size": 8, "hits": 20, "misses": 8, ...}
+    }
+    """
+    return jsonify({
+        'success': True,
+        'data': get_result_cache_stats(),
+        'covariance': covariance_cache.stats()
+    })
+
+
+@app.route('/api/fx/usd-krw', methods=['GET'])
+def get_usd_krw_rate():
+    """
+    USD/KRW 환율 API (공유 환율, 백그라운드 갱신)
+    
+    Query Parameters:
+        history: 과거 환율 기간 (선택, 예: '1mo', '1y')
+    
+    Response:
+    {
+        "success": true,
+        "data": {"rate": 1385.2, "source": "live", "updatedAt": "...", ...},
+        "history": {"dates": [...], "rates": [...]}  # history 지정 시
+    }
+    """
+    try:
+        fx_rate_service.get_rate()
+        response = {
+            'success': True,
+            'data': fx_rate_service.status()
+        }
+        
+        period = request.args.get('history')
+        if period:
+            series = fx_rate_service.get_history(period)
+            response['history'] = {
+                'dates': [d.strftime('%Y-%m-%d') for d in series.index],
+                'rates': [round(float(v), 4) for v in series.values]
+            }
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        error_msg = safe_encode_error(str(e))
+        logger.error(f"환율 조회 오류: {error_msg}")
+        return jsonify({
+            'success': False,
+            'error': f'서버 오류가 발생했습니다: {error_msg}'
+        }), 500
+
+
 @app.route('/api/stocks/search', methods=['GET'])
 @app.route('/api/portfolio/stock/search', methods=['GET'])  # Spring Boot 호환성
 def search_stocks_advanced():
@@ -1029,14 +1444,22 @@ def search_stocks_advanced():
     주식 검색 API (한국 + 미국 + ETF)
     
     검색 폴백 순서:
-    1. 로컬 DB 검색 (한국 주식 80개+, 미국 주식 60개+, ETF 30개)
+    1. 로컬 인덱스 검색 (한국 주식 80개+, 미국 주식 60개+, ETF 30개)
+       - 티커/영문명/단어 prefix, 한글명 부분 문자열 (메모리 인덱스, 파일 I/O 없음)
     2. Alpha Vantage API 검색 (모든 미국 주식/ETF, 타임아웃 10초)
     3. yfinance Fallback
        - 한국 주식: 6자리 코드 자동 인식 → .KS/.KQ 자동 추가
        - 미국 주식: 심볼만으로 조회
+    2, 3 은 외부 요청이라 기본적으로 로컬 인덱스에 결과가 없을 때만 실행 (remote 파라미터)
  
     Query Parameters:
         q: 검색어 (티커 코드, 영문명, 한글명)
+        enrich: true 이면 시세 캐시에 없는 로컬 결과의 가격을 짧은 데드라인으로 조회 (기본 false)
+        remote: auto (기본, 로컬 결과가 없을 때만) | true (항상) | false (로컬만)
+                Alpha Vantage / yfinance 검색 실행 여부
+ 
+    로컬 결과의 가격(currentPrice 등)은 시세 캐시에 있을 때만 포함되며,
+    없으면 "pricePending": true 로 표시됩니다 (POST /api/stock/prices 로 조회).
  
     Response:
         [
@@ -1052,314 +1475,53 @@ def search_stocks_advanced():
     try:
         # 원본 쿼리 유지 (한글 검색 지원)
         query_original = request.args.get('q', '').strip()
-        query_upper = query_original.upper()  # 대문자 변환은 검색에만 사용
         
         if not query_original or len(query_original) < 1:
             return jsonify([])
         
         results = []
         
-        # 한국 주식 검색 (한글 이름 포함) - JSON 파일에서 로드
-        korean_stocks = load_korean_stocks()
-        
-        # JSON 파일이 없거나 비어있으면 fallback 데이터 사용
-        if not korean_stocks:
-            logger.warning("Using fallback Korean stocks data")
-            korean_stocks = {
-                # 대형주 (Large Cap)
-                '005930': ('Samsung Electronics', '삼성전자'),
-            '000660': ('SK Hynix', 'SK하이닉스'),
-            '035420': ('NAVER', '네이버'),
-            '035720': ('Kakao', '카카오'),
-            '051910': ('LG Chem', 'LG화학'),
-            '006400': ('Samsung SDI', '삼성SDI'),
-            '005380': ('Hyundai Motor', '현대자동차'),
-            '012330': ('Hyundai Mobis', '현대모비스'),
-            '028260': ('Samsung C&T', '삼성물산'),
-            '000270': ('Kia Corporation', '기아'),
-            '005490': ('POSCO Holdings', 'POSCO홀딩스'),
-            '003550': ('LG', 'LG'),
-            '034730': ('SK', 'SK'),
-            
-            # 제약/바이오 (Pharma/Bio)
-            '207940': ('Samsung Biologics', '삼성바이오로직스'),
-            '326030': ('SK Biopharmaceuticals', 'SK바이오팜'),
-            '128940': ('Han Mi Pharm', '한미약품'),
-            '214450': ('Celltrion Healthcare', '셀트리온헬스케어'),
-            '068270': ('Celltrion', '셀트리온'),
-            '251270': ('Netmarble', '넷마블'),
-            '067280': ('Merck Korea', '멕크론코리아'),
-            '003670': ('Posco Future M', '포스코퓨처엠'),
-            
-            # IT/게임 (Tech/Gaming)
-            '036570': ('NCsoft', '엔씨소프트'),
-            '259960': ('Krafton', '크래프톤'),
-            '018260': ('Samsung SDS', '삼성SDS'),
-            '035900': ('JYP Entertainment', 'JYP엔터테인먼트'),
-            '035760': ('CJ ENM', 'CJ ENM'),
-            '011200': ('HMM', 'HMM'),
-            '028300': ('HLB', 'HLB'),
-            '006260': ('LS', 'LS'),
-            
-            # 금융 (Finance)
-            '086790': ('Hana Financial Group', '하나금융지주'),
-            '105560': ('KB Financial Group', 'KB금융'),
-            '055550': ('Shinhan Financial Group', '신한지주'),
-            '032830': ('Samsung Life Insurance', '삼성생명'),
-            '018880': ('Samsung Securities', '삼성증권'),
-            '006360': ('GS', 'GS'),
-            '000120': ('CJ', 'CJ'),
-            '000150': ('Doosan', '두산'),
-            
-            # 통신 (Telecom)
-            '017670': ('SK Telecom', 'SK텔레콤'),
-            '030200': ('KT', 'KT'),
-            '032640': ('LG Uplus', 'LG유플러스'),
-            
-            # 에너지/화학 (Energy/Chemical)
-            '010950': ('S-Oil', 'S-Oil'),
-            '009540': ('Korea Gas', '한국가스공사'),
-            '096770': ('SK Innovation', 'SK이노베이션'),
-            '010130': ('Korea Zinc', '한국아연'),
-            '015760': ('Korea Electric Power', '한국전력'),
-            '011780': ('Korea Gas Corporation', '한국가스공사'),
-            '002380': ('KCC', 'KCC'),
-            '003230': ('Samyang Holdings', '삼양홀딩스'),
-            
-            # 자동차/부품 (Auto/Parts)
-            '161390': ('Hanon Systems', '한온시스템'),
-            '000720': ('Hyundai Engineering & Construction', '현대건설'),
-            '012450': ('Hanwha Aerospace', '한화에어로스페이스'),
-            '009830': ('Hanwha Solutions', '한화솔루션'),
-            
-            # 소비재/유통 (Consumer/Retail)
-            '033780': ('KT&G', 'KT&G'),
-            '028150': ('GS Retail', 'GS리테일'),
-            '004020': ('Hyundai Steel', '현대제철'),
-            '002790': ('Amorepacific', '아모레퍼시픽'),
-            
-            # 기타 (Others)
-            '009150': ('Samsung Electro-Mechanics', '삼성전기'),
-            '006800': ('Mirae Asset Securities', '미래에셋증권'),
-            '003520': ('Yungjin Pharm', '영진약품'),
-            '004170': ('Shinsegae', '신세계'),
-            '001570': ('Kumho Tire', '금호타이어'),
-            '007310': ('Ottogi', '오뚜기'),
-            '002310': ('Asia Paper', '아세아제지'),
-            '005830': ('DB Insurance', 'DB손해보험'),
-            '005940': ('NH Investment & Securities', 'NH투자증권'),
-            '006370': ('Doosan Heavy Industries', '두산중공업'),
-            '008770': ('Hotel Shilla', '호텔신라'),
-            '010140': ('Samsung Fire & Marine', '삼성화재'),
-            '011070': ('LG Innotek', 'LG이노텍'),
-            '016360': ('Samsung Securities', '삼성증권'),
-            '017800': ('Hyundai Elevator', '현대엘리베이터'),
-            '020150': ('Iljin Materials', '일진머티리얼즈'),
-            '023530': ('Lotte Chemical', '롯데케미칼'),
-            '024110': ('Heungkuk Fire & Marine', '흥국화재'),
-            '028050': ('Samsung C&T', '삼성물산'),
-            '029780': ('Samsung Card', '삼성카드'),
-            '030000': ('Hyundai Department Store', '현대백화점'),
-            '032350': ('Lotte Tour Development', '롯데관광개발'),
-            '033270': ('Yuhan Corporation', '유한양행'),
-            '034020': ('Doosan Corporation', '두산'),
-            '035250': ('Kangwon Land', '강원랜드'),
-            '036460': ('Korea Gas Corporation', '한국가스공사'),
-            '037270': ('Yungjin Pharm', '영진약품'),
-            '039130': ('HD Hyundai', 'HD현대'),
-            '042660': ('Daewoo Shipbuilding', '대우조선해양'),
-            '047810': ('Korea Aerospace Industries', '한국항공우주산업'),
-            '051900': ('LG Household & Health Care', 'LG생활건강'),
-            '052690': ('Hanwha Techwin', '한화테크윈')
-        }
-        
-        # 한국 주식 검색 루프 (한글 이름 검색 지원)
-        for code, (name_en, name_ko) in korean_stocks.items():
-            # 티커 코드, 영문 이름, 한글 이름 모두 검색
-            if (query_upper in code or 
-                query_upper in name_en.upper() or 
-                query_original in name_ko):
-                ticker = f"{code}.KS"
-                # 한글 이름이 있으면 한글 이름 사용, 없으면 영문 이름
-                display_name = name_ko if name_ko else name_en
-                try:
-                    price_data = get_stock_price(ticker)
-                    if price_data and price_data.get('success'):
-                        price_info = price_data.get('data', {})
-                        results.append({
-                            'ticker': ticker,
-                            'name': display_name,
-                            'nameEn': name_en,
-                            'nameKo': name_ko,
-                            'exchange': 'KRX',
-                            'currentPrice': price_info.get('currentPrice', 0),
-                            'currency': price_info.get('currency', 'KRW'),
-                            'changePercent': price_info.get('changePercent', '0%'),
-                            'changeAmount': price_info.get('changeAmount', 0),
-                            'source': 'local'
-                        })
-                    else:
-                        results.append({
-                            'ticker': ticker,
-                            'name': display_name,
-                            'nameEn': name_en,
-                            'nameKo': name_ko,
-                            'exchange': 'KRX',
-                            'source': 'local'
-                        })
-                except Exception as e:
-                    logger.debug(f"Price fetch failed for {ticker}: {str(e)}")
-                    results.append({
-                        'ticker': ticker,
-                        'name': display_name,
-                        'nameEn': name_en,
-                        'nameKo': name_ko,
-                        'exchange': 'KRX',
-                        'source': 'local'
+        # 로컬 인덱스 검색 (한국 + 미국, 시작 시 로드된 메모리 인덱스)
+        for match in stock_search_index.search(query_original, limit=SEARCH_RESULT_LIMIT):
+            entry = {k: v for k, v in match.items() if k in ('ticker', 'name', 'nameEn', 'nameKo', 'exchange')}
+            entry['source'] = 'local'
+            results.append(entry)
+        
+        # 가격은 시세 캐시에 있는 것만 첨부 (검색 응답이 Yahoo 응답 시간에 묶이지 않도록)
+        # enrich=true 이면 캐시에 없는 종목을 짧은 데드라인으로 일괄 조회
+        if results:
+            tickers = [r['ticker'] for r in results]
+            quotes = StockPriceService.get_cached_prices(tickers)
+            missing = [t for t in tickers if t not in quotes]
+            if missing and request.args.get('enrich', 'false').lower() == 'true':
+                fetched, _ = StockPriceService.fetch_batch(
+                    missing,
+                    symbol_timeout=SEARCH_ENRICH_TIMEOUT_SECONDS,
+                    request_timeout=SEARCH_ENRICH_TIMEOUT_SECONDS
+                )
+                quotes.update(fetched)
+            for entry in results:
+                quote = quotes.get(entry['ticker'])
+                if quote:
+                    entry.update({
+                        'currentPrice': quote.get('currentPrice', 0),
+                        'currency': quote.get('currency'),
+                        'changePercent': quote.get('changePercent', '0'),
+                        'changeAmount': quote.get('changeAmount', 0),
+                        'priceUpdated': quote.get('lastUpdated')
                     })
+                else:
+                    # 클라이언트가 POST /api/stock/prices 로 나중에 채움
+                    entry['pricePending'] = True
         
-        # 미국 주식 데이터베이스 (주식 + ETF) - JSON 파일에서 로드
-        us_stocks = load_us_stocks()
-        
-        # JSON 파일이 없거나 비어있으면 fallback 데이터 사용
-        if not us_stocks:
-            logger.warning("Using fallback US stocks data")
-            us_stocks = {
-            # Tech Giants
-            'AAPL': 'Apple Inc.',
-            'MSFT': 'Microsoft Corporation',
-            'GOOGL': 'Alphabet Inc.',
-            'GOOG': 'Alphabet Inc. (Class C)',
-            'AMZN': 'Amazon.com Inc.',
-            'META': 'Meta Platforms Inc.',
-            'NVDA': 'NVIDIA Corporation',
-            'TSLA': 'Tesla Inc.',
-            'AMD': 'Advanced Micro Devices',
-            'INTC': 'Intel Corporation',
-            'CSCO': 'Cisco Systems',
-            'ORCL': 'Oracle Corporation',
-            'ADBE': 'Adobe Inc.',
-            'CRM': 'Salesforce Inc.',
-            'NFLX': 'Netflix Inc.',
-            
-            # Finance
-            'BRK.B': 'Berkshire Hathaway',
-            'JPM': 'JPMorgan Chase',
-            'V': 'Visa Inc.',
-            'MA': 'Mastercard Inc.',
-            'BAC': 'Bank of America',
-            'WFC': 'Wells Fargo',
-            'GS': 'Goldman Sachs',
-            'MS': 'Morgan Stanley',
-            'C': 'Citigroup',
-            'AXP': 'American Express',
-            
-            # Consumer
-            'WMT': 'Walmart Inc.',
-            'HD': 'Home Depot',
-            'DIS': 'Walt Disney',
-            'MCD': 'McDonald\'s Corporation',
-            'NKE': 'Nike Inc.',
-            'SBUX': 'Starbucks Corporation',
-            'KO': 'Coca-Cola Company',
-            'PEP': 'PepsiCo Inc.',
-            'COST': 'Costco Wholesale',
-            'TGT': 'Target Corporation',
-            
-            # Healthcare
-            'UNH': 'UnitedHealth Group',
-            'JNJ': 'Johnson & Johnson',
-            'PFE': 'Pfizer Inc.',
-            'ABBV': 'AbbVie Inc.',
-            'TMO': 'Thermo Fisher Scientific',
-            'ABT': 'Abbott Laboratories',
-            'MRK': 'Merck & Co.',
-            'LLY': 'Eli Lilly and Company',
-            
-            # Energy
-            'XOM': 'Exxon Mobil',
-            'CVX': 'Chevron Corporation',
-            
-            # Telecom
-            'T': 'AT&T Inc.',
-            'VZ': 'Verizon Communications',
-            
-            # Industrial
-            'BA': 'Boeing Company',
-            'CAT': 'Caterpillar Inc.',
-            'GE': 'General Electric',
-            
-            # 주요 ETF (Major ETFs)
-            'SPY': 'SPDR S&P 500 ETF Trust',
-            'QQQ': 'Invesco QQQ Trust',
-            'VOO': 'Vanguard S&P 500 ETF',
-            'VTI': 'Vanguard Total Stock Market ETF',
-            'IWM': 'iShares Russell 2000 ETF',
-            'DIA': 'SPDR Dow Jones Industrial Average ETF',
-            'VEA': 'Vanguard FTSE Developed Markets ETF',
-            'VWO': 'Vanguard FTSE Emerging Markets ETF',
-            'BND': 'Vanguard Total Bond Market ETF',
-            'GLD': 'SPDR Gold Trust',
-            'SLV': 'iShares Silver Trust',
-            'USO': 'United States Oil Fund',
-            'TLT': 'iShares 20+ Year Treasury Bond ETF',
-            'HYG': 'iShares iBoxx $ High Yield Corporate Bond ETF',
-            'XLF': 'Financial Select Sector SPDR Fund',
-            'XLK': 'Technology Select Sector SPDR Fund',
-            'XLE': 'Energy Select Sector SPDR Fund',
-            'XLV': 'Health Care Select Sector SPDR Fund',
-            'XLI': 'Industrial Select Sector SPDR Fund',
-            'XLP': 'Consumer Staples Select Sector SPDR Fund',
-            'XLY': 'Consumer Discretionary Select Sector SPDR Fund',
-            'XLB': 'Materials Select Sector SPDR Fund',
-            'XLU': 'Utilities Select Sector SPDR Fund',
-            'XLC': 'Communication Services Select Sector SPDR Fund',
-            'XRE': 'Real Estate Select Sector SPDR Fund',
-            'ARKK': 'ARK Innovation ETF',
-            'ARKQ': 'ARK Autonomous Technology & Robotics ETF',
-            'ARKG': 'ARK Genomic Revolution ETF',
-            'ARKW': 'ARK Next Generation Internet ETF',
-            'ARKF': 'ARK Fintech Innovation ETF'
-        }
+        # 입력마다 호출되는 자동완성이 외부 요청(최대 10초 + yfinance)에 묶이지 않도록
+        # 로컬 결과가 있으면 바로 반환 (remote=true 일 때만 추가 검색)
+        remote = request.args.get('remote', 'auto').lower()
+        if remote == 'false' or (remote != 'true' and results):
+            return jsonify(results[:SEARCH_RESULT_LIMIT])
         
-        # 미국 주식 검색 루프
-        for ticker, name in us_stocks.items():
-            if query_upper in ticker or query_upper in name.upper():
-                if not any(r['ticker'] == ticker for r in results):
-                    # Determine exchange based on ticker
-                    exchange = 'NYSE' if ticker in ['BRK.B', 'JPM', 'V', 'BAC', 'WMT', 'JNJ', 'PG', 'KO', 'PEP', 'XOM', 'CVX', 'BA', 'CAT', 'GE'] else 'NASDAQ'
-                    try:
-                        price_data = get_stock_price(ticker)
-                        if price_data and price_data.get('success'):
-                            price_info = price_data.get('data', {})
-                            results.append({
-                                'ticker': ticker,
-                                'name': name,
-                                'exchange': exchange,
-                                'currentPrice': price_info.get('currentPrice', 0),
-                                'currency': price_info.get('currency', 'USD'),
-                                'changePercent': price_info.get('changePercent', '0%'),
-                                'changeAmount': price_info.get('changeAmount', 0),
-                                'source': 'local'
-                            })
-                        else:
-                            results.append({
-                                'ticker': ticker,
-                                'name': name,
-                                'exchange': exchange,
-                                'source': 'local'
-                            })
-                    except Exception as e:
-                        logger.debug(f"Price fetch failed for {ticker}: {str(e)}")
-                        results.append({
-                            'ticker': ticker,
-                            'name': name,
-                            'exchange': exchange,
-                            'source': 'local'
-                        })
-        
-        # Alpha Vantage API - 모든 미국 주식/ETF 검색 (항상 실행)
-        # 로컬 결과가 있어도 미국 주식/ETF는 Alpha Vantage에서 추가 검색
+        # Alpha Vantage API - 모든 미국 주식/ETF 검색
+        import requests  # 첫 사용 시 로드 (warmup 스레드가 미리 로드)
         try:
             logger.info(f"Searching Alpha Vantage for: {query_original}")
             # URL 인코딩으로 한글 및 특수문자 지원
@@ -1410,8 +1572,10 @@ def search_stocks_advanced():
         
         # yfinance Fallback - 한국 주식 및 미국 주식 검색
         # 폴백 순서: 로컬 DB → Alpha Vantage → yfinance
-        if len(results) < 10:
+        if len(results) < SEARCH_RESULT_LIMIT:
             try:
+                import yfinance as yf  # 첫 사용 시 로드 (warmup 스레드가 미리 로드)
+                
                 # 1. 한국 주식 검색 시도 (6자리 코드 자동 인식)
                 if query_original.isdigit() and len(query_original) == 6:
                     logger.info(f"Detected 6-digit Korean stock code: {query_original}, trying .KS and .KQ suffixes")
@@ -1452,7 +1616,7 @@ def search_stocks_advanced():
                     if found_korean:
                         logger.info("Korean stock found via yfinance, skipping US stock lookup")
                         # 최대 10개 결과만 반환
-                        return jsonify(results[:10])
+                        return jsonify(results[:SEARCH_RESULT_LIMIT])
                 
                 # 2. 미국 주식 검색 시도 (심볼만으로 조회)
                 # 한국 주식 코드가 아니거나, 한국 주식을 찾지 못한 경우
@@ -1496,7 +1660,7 @@ def search_stocks_advanced():
                 # 에러가 발생해도 기존 결과는 반환
         
         # 최대 10개 결과만 반환
-        return jsonify(results[:10])
+        return jsonify(results[:SEARCH_RESULT_LIMIT])
         
     except Exception as e:
         error_msg = safe_encode_error(str(e))
@@ -1555,6 +1719,8 @@ if __name__ == '__main__':
     print("Windows cp949 compatible: emoji-free responses")
     print("=" * 60)
 
+    warmup.start()  # qiskit / yfinance / solver pool 백그라운드 로드 (/api/health/ready)
+    
     try:
         app.run(host='127.0.0.1', port=5000, debug=True, threaded=True, use_reloader=False)
     except OSError as e:
@@ -0,0 +1,82 @@
+"""
+QAOA backend benchmark: Qiskit StatevectorSampler vs NumPy diagonal-cost simulator
+
+Runs both solver jobs in-process on the same synthetic portfolio QUBO (no network)
+and reports wall time, COBYLA evaluations and the energy of the returned bitstring
+against the exact QUBO minimum (energy gap and approximation ratio).
+
+Usage:
+    python bench_qaoa_backends.py --assets 3 4 5 --precision 3 --reps 1 --maxiter 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from optimizer import (
+    PortfolioOptimizer, _solve_exact_qubo, _solve_numpy_qaoa_job, _solve_qaoa_job, NUMPY_QAOA_MAX_QUBITS
+)
+
+
+def synthetic_problem(n_assets: int, seed: int):
+    rng = np.random.default_rng(seed)
+    mean_returns = rng.normal(0.10, 0.08, n_assets)
+    factors = rng.normal(0, 0.15, (n_assets, n_assets))
+    cov_matrix = factors @ factors.T / n_assets + np.diag(rng.uniform(0.01, 0.05, n_assets))
+    return mean_returns, cov_matrix
+
+
+def run_case(backend: str, job, args, exact, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = job(*args)
+        times.append(time.perf_counter() - started)
+    evals = result.metadata.get('cost_function_evals')
+    gap = result.fval - exact.fval
+    spread = exact.metadata['max_energy'] - exact.fval
+    ratio = (exact.metadata['max_energy'] - result.fval) / spread if spread > 0 else 1.0
+    print(f"  {backend:<10} {min(times):>9.3f}s {np.median(times):>9.3f}s {str(evals):>7} "
+          f"{result.fval:>14.4f} {gap:>12.4f} {ratio:>9.6f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', type=int, nargs='+', default=[3, 4, 5])
+    parser.add_argument('--precision', type=int, default=3)
+    parser.add_argument('--reps', type=int, default=1)
+    parser.add_argument('--maxiter', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-qiskit', action='store_true', help="NumPy backend only (large qubit counts)")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"reps={args.reps}, maxiter={args.maxiter}, precision={args.precision}, repeat={args.repeat}")
+    print(f"  {'backend':<10} {'best':>10} {'median':>10} {'evals':>7} {'energy':>14} {'gap':>12} {'ratio':>9}")
+
+    for n_assets in args.assets:
+        num_qubits = n_assets * args.precision
+        mean_returns, cov_matrix = synthetic_problem(n_assets, args.seed)
+        optimizer = PortfolioOptimizer([f"A{i}" for i in range(n_assets)], risk_factor=0.5)
+        _, linear, quadratic = optimizer._build_qubo_formulation(
+            n_assets, args.precision, mean_returns, cov_matrix, lambda_param=0.5
+        )
+        job_args = (linear, quadratic, n_assets, args.precision, args.reps, args.maxiter)
+
+        print(f"\n{n_assets} assets / {num_qubits} qubits")
+        if num_qubits > NUMPY_QAOA_MAX_QUBITS:
+            print(f"  skipped (> NUMPY_QAOA_MAX_QUBITS={NUMPY_QAOA_MAX_QUBITS})")
+            continue
+        exact = _solve_exact_qubo(linear, quadratic, n_assets, args.precision)
+        run_case('exact', _solve_exact_qubo, job_args[:4], exact, args.repeat)
+
+        if not args.skip_qiskit:
+            run_case('qiskit', _solve_qaoa_job, job_args, exact, args.repeat)
+        run_case('numpy', _solve_numpy_qaoa_job, job_args, exact, args.repeat)
+        run_case('numpy-c64', lambda *a: _solve_numpy_qaoa_job(*a, dtype='complex64'),
+                 job_args, exact, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Server throughput benchmark: Flask dev server vs gunicorn (preloaded workers)
+
+Sends the same request mix to each running server at several concurrency levels
+and reports throughput, latency percentiles and errors.
+
+Start the servers first (different ports):
+    python app.py                                                  # dev server, 127.0.0.1:5000
+    GUNICORN_BIND=127.0.0.1:8000 gunicorn -c gunicorn.conf.py wsgi:app
+
+Usage:
+    python bench_server.py --target dev=http://127.0.0.1:5000 --target gunicorn=http://127.0.0.1:8000
+    python bench_server.py --target gunicorn=http://127.0.0.1:8000 --workload quantum --concurrency 1 4 8
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+DEFAULT_TICKERS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN']
+
+
+def make_request(workload: str, tickers, rng: random.Random):
+    """(method, path, json body) for one request of the workload"""
+    if workload == 'health':
+        return 'GET', '/api/health', None
+    # Random risk_factor so requests miss the result cache and actually solve
+    body = {'tickers': tickers, 'risk_factor': round(rng.random(), 4), 'period': '1y'}
+    if workload == 'quantum':
+        body.update(method='quantum', backend='exact')
+    else:
+        body.update(method='classical')
+    return 'POST', '/api/optimize', body
+
+
+def run_level(base_url: str, workload: str, tickers, concurrency: int, total: int, seed: int):
+    rng = random.Random(seed)
+    planned = [make_request(workload, tickers, rng) for _ in range(total)]
+    local = threading.local()
+
+    def send(plan):
+        method, path, body = plan
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()  # Keep-alive connection per client thread
+        session = local.session
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=120)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(send, planned))
+    wall = time.perf_counter() - started
+
+    latencies = np.array([latency for latency, _ in outcomes])
+    errors = sum(1 for _, ok in outcomes if not ok)
+    return total / wall, np.percentile(latencies, 50), np.percentile(latencies, 95), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', required=True, help="name=base_url (repeatable)")
+    parser.add_argument('--workload', choices=['health', 'classical', 'quantum'], default='classical')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=100, help="Requests per concurrency level")
+    parser.add_argument('--tickers', nargs='+', default=DEFAULT_TICKERS)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    targets = [target.split('=', 1) for target in args.target]
+    print(f"workload={args.workload}, requests={args.requests}, tickers={args.tickers}")
+
+    for name, base_url in targets:
+        base_url = base_url.rstrip('/')
+        # Warm-up: price history, solver pool
+        method, path, body = make_request(args.workload, args.tickers, random.Random(0))
+        requests.request(method, base_url + path, json=body, timeout=120)
+
+        print(f"\n{name} ({base_url})")
+        print(f"  {'conc':>5} {'req/s':>9} {'p50':>9} {'p95':>9} {'errors':>7}")
+        for concurrency in args.concurrency:
+            rps, p50, p95, errors = run_level(base_url, args.workload, args.tickers, concurrency, args.requests, args.seed)
+            print(f"  {concurrency:>5} {rps:>9.1f} {p50 * 1000:>7.0f}ms {p95 * 1000:>7.0f}ms {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
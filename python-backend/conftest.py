@@ -0,0 +1,12 @@
+"""
+pytest configuration for python-backend
+
+Unit tests live next to the module they cover (test_optimizer.py, test_ttl_cache.py, ...):
+
+    python -m pytest -q
+
+test_korean_stocks.py, test_quantum.py and test_with_progress.py are manual end-to-end
+scripts (live yfinance data + QAOA at import time), run them directly with python.
+"""
+
+collect_ignore = ['test_korean_stocks.py', 'test_quantum.py', 'test_with_progress.py']
@@ -0,0 +1,149 @@
+"""
+USD/KRW exchange rate service
+공유 환율 + 백그라운드 주기 갱신 + 마지막 정상값 폴백 + 과거 환율 시계열
+
+- get_rate(): 메모리의 공유 환율 반환 (첫 호출만 HTTP 요청, 실패 시 이후 호출은 즉시 폴백)
+- 백그라운드 스레드가 FX_REFRESH_SECONDS 간격으로 갱신
+- 갱신 실패 시 마지막 정상 환율 유지 (없으면 DEFAULT_USD_TO_KRW)
+- get_history()/to_krw(): 날짜별 환율 시계열로 가격 히스토리를 벡터 연산으로 원화 변환
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FX_API_URL = 'https://api.exchangerate-api.com/v4/latest/USD'
+FX_REQUEST_TIMEOUT_SECONDS = 3
+FX_REFRESH_SECONDS = int(os.getenv('FX_REFRESH_SECONDS', 600))
+FX_HISTORY_TICKER = 'KRW=X'  # Yahoo Finance USD/KRW
+DEFAULT_USD_TO_KRW = 1300.0
+
+
+class FxRateService:
+    """Single shared USD/KRW rate refreshed in the background"""
+
+    def __init__(self, refresh_seconds: int = FX_REFRESH_SECONDS, fallback_rate: float = DEFAULT_USD_TO_KRW):
+        self.refresh_seconds = refresh_seconds
+        self.fallback_rate = fallback_rate
+        self._rate: Optional[float] = None
+        self._updated_at: Optional[float] = None
+        self._failures = 0
+        self._first_fetch_done = False  # First fetch attempted (success or not): never block again
+        self._lock = threading.Lock()
+        self._first_fetch_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def get_rate(self) -> float:
+        """Current USD -> KRW rate (only the first call ever blocks, for at most one request)"""
+        self._ensure_refresher()
+        with self._lock:
+            if self._rate is not None:
+                return self._rate
+
+            if self._first_fetch_done:
+                # First fetch failed: serve the fallback, the refresher keeps retrying
+                return self.fallback_rate
+
+        # First use: one blocking fetch, shared by concurrent callers
+        with self._first_fetch_lock:
+            with self._lock:
+                if self._rate is not None:
+                    return self._rate
+                if self._first_fetch_done:
+                    return self.fallback_rate
+            refreshed = self.refresh()
+            with self._lock:
+                self._first_fetch_done = True
+                if refreshed:
+                    return self._rate
+        print(f"Using fallback exchange rate: 1 USD = {self.fallback_rate} KRW")
+        return self.fallback_rate
+
+    def refresh(self) -> bool:
+        """Fetch the latest rate; keeps the last known good rate on failure"""
+        try:
+            import requests  # 첫 사용 시 로드 (warmup 스레드가 미리 로드)
+            response = requests.get(FX_API_URL, timeout=FX_REQUEST_TIMEOUT_SECONDS)
+            if response.status_code == 200:
+                krw_rate = response.json()['rates'].get('KRW')
+                if krw_rate and krw_rate > 1000:  # Sanity check
+                    with self._lock:
+                        self._rate = float(krw_rate)
+                        self._updated_at = time.time()
+                        self._failures = 0
+                    print(f"Real-time exchange rate: 1 USD = {krw_rate:.2f} KRW")
+                    return True
+        except Exception as e:
+            print(f"Failed to fetch exchange rate: {e}")
+
+        with self._lock:
+            self._failures += 1
+        return False
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'rate': self._rate if self._rate is not None else self.fallback_rate,
+                'source': 'live' if self._rate is not None else 'fallback',
+                'updatedAt': datetime.fromtimestamp(self._updated_at).isoformat() if self._updated_at else None,
+                'ageSeconds': round(time.time() - self._updated_at, 1) if self._updated_at else None,
+                'refreshSeconds': self.refresh_seconds,
+                'consecutiveFailures': self._failures
+            }
+
+    def get_history(self, period: str = '1y'):
+        """
+        Daily USD/KRW closes (date-indexed pandas Series, served from the price-history store)
+        """
+        import pandas as pd
+        from market_data import price_history_store
+
+        history, _ = price_history_store.get_history([FX_HISTORY_TICKER], period=period)
+        if FX_HISTORY_TICKER not in history.columns:
+            return pd.Series(dtype=float, name=FX_HISTORY_TICKER)
+        return history[FX_HISTORY_TICKER].dropna()
+
+    def to_krw(self, prices, period: str = '1y'):
+        """
+        Convert a date-indexed USD price Series/DataFrame to KRW using each day's rate
+
+        The FX closes are aligned to prices.index with forward fill (days without an FX
+        close use the previous day's rate); dates before the FX history start use the
+        current shared rate.
+        """
+        rates = self.get_history(period)
+        if rates.empty:
+            return prices * self.get_rate()
+        aligned = rates.reindex(rates.index.union(prices.index)).ffill().reindex(prices.index)
+        aligned = aligned.fillna(self.get_rate())
+        if hasattr(prices, 'columns'):
+            return prices.mul(aligned, axis=0)
+        return prices * aligned.values
+
+    def _ensure_refresher(self):
+        # Also restarts the thread in forked worker processes
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='fx-refresher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh()
+
+    def stop(self):
+        self._stop.set()
+
+
+# Shared service instance
+fx_rate_service = FxRateService()
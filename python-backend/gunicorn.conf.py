@@ -0,0 +1,60 @@
+"""
+gunicorn configuration for the Flask quantum service
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+- preload_app: wsgi.py (qiskit, pandas, yfinance, optimizer, search index) is imported
+  once in the master and shared copy-on-write by the forked workers
+- workers x threads: GUNICORN_WORKERS processes, GUNICORN_THREADS request threads each
+  (gthread). QAOA solves run in each worker's solver pool, so SOLVER_POOL_SIZE defaults
+  to the CPU count split across workers.
+- Async jobs (/api/jobs) run in the worker that accepted them, but their state is kept
+  in JOB_DB_PATH (SQLite), so a status poll may land on any worker
+- Graceful reload:
+    kill -HUP <master>    re-read this file and replace workers one by one
+                          (the preloaded application code is NOT re-imported)
+    kill -USR2 <master>   start a new master with fresh code, then
+    kill -TERM <old master> once the new workers are up (zero-downtime deploy)
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', max(2, min(4, multiprocessing.cpu_count()))))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_class = 'gthread'
+preload_app = True
+
+# Quantum requests may fetch history and then solve for QUANTUM_TIMEOUT_SECONDS
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers periodically (bounds memory growth, like SOLVER_MAX_JOBS_PER_WORKER).
+# A recycled worker finishes its queued jobs before exiting (within graceful_timeout);
+# finished results stay in JOB_DB_PATH, jobs cut off are reported as failed.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# Read by solver_pool at import time (the app is preloaded after this file runs)
+os.environ.setdefault('SOLVER_POOL_SIZE', str(max(1, multiprocessing.cpu_count() // workers)))
+
+
+def when_ready(server):
+    # Move everything preloaded into the permanent generation so GC passes in the
+    # workers don't touch (and copy) the shared pages
+    gc.freeze()
+    server.log.info(f"Preloaded app shared by {workers} workers x {threads} threads, "
+                    f"SOLVER_POOL_SIZE={os.environ['SOLVER_POOL_SIZE']} per worker")
+
+
+def post_fork(server, worker):
+    # Solver pool + lazy modules per worker, in the background (/api/health/ready)
+    from warmup import warmup
+    warmup.start()
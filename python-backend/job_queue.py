@@ -0,0 +1,289 @@
+"""
+Asynchronous optimization jobs
+요청 스레드를 솔버 작업에 묶어두지 않도록 최적화를 백그라운드 작업으로 실행
+
+- submit(): 즉시 job id 반환, 제출받은 프로세스의 제한된 워커 스레드 풀에서 실행
+- 작업 상태/결과는 SQLite (JOB_DB_PATH, 기본 data/jobs.sqlite3) 에 저장:
+  gunicorn 워커가 여러 개여도 어느 워커에서든 조회 가능, 워커 재시작(max_requests) 후에도 유지
+- 대기+실행 중 작업 수(전체 워커 합계)가 JOB_QUEUE_LIMIT 이상이면 QueueFullError (HTTP 429)
+- 완료/실패한 작업 결과는 JOB_RESULT_TTL_SECONDS 동안 보관 후 삭제
+- 실행 프로세스가 heartbeat 를 남기지 않는 대기/실행 중 작업(워커 강제 종료 등)은 failed 처리
+- CPU 작업(QAOA 등)은 워커 스레드 안에서 다시 solver pool 프로세스로 넘어감
+"""
+
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', 32))  # Queued + running jobs
+JOB_RESULT_TTL_SECONDS = int(os.getenv('JOB_RESULT_TTL_SECONDS', 600))
+JOB_MAX_RETAINED = 1000  # Finished jobs kept at most (oldest evicted first)
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', str(Path(__file__).parent / 'data' / 'jobs.sqlite3'))
+JOB_HEARTBEAT_SECONDS = 10  # Owner process refreshes its pending jobs this often
+JOB_ORPHAN_SECONDS = 60  # Pending job without a heartbeat for this long: owner process is gone
+JOB_PURGE_SECONDS = 1.0  # Min interval between expiry/orphan sweeps per process
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result BLOB,
+    error TEXT,
+    error_type TEXT,
+    owner TEXT NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+"""
+
+
+class QueueFullError(RuntimeError):
+    """Too many queued/running jobs; the client should retry later"""
+
+
+class Job:
+    """One submitted job and its outcome"""
+
+    def __init__(self, kind: str, params: Optional[Dict] = None):
+        self.id = f"job_{uuid.uuid4().hex[:12]}"
+        self.kind = kind
+        self.params = params or {}
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.error_type: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row, include_result: bool = True) -> 'Job':
+        job = cls.__new__(cls)
+        job.id = row['id']
+        job.kind = row['kind']
+        job.params = json.loads(row['params'])
+        job.status = row['status']
+        job.created_at = row['created_at']
+        job.started_at = row['started_at']
+        job.finished_at = row['finished_at']
+        # Written by this service's own worker processes (numpy values and all), never by clients
+        job.result = pickle.loads(row['result']) if include_result and row['result'] is not None else None
+        job.error = row['error']
+        job.error_type = row['error_type']
+        return job
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        def iso(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+        data = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at),
+            'queue_seconds': round((self.started_at or time.time()) - self.created_at, 3),
+            'run_seconds': round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None
+        }
+        if self.status == 'failed':
+            data['error'] = self.error
+            data['error_type'] = self.error_type
+        if include_result and self.status == 'completed':
+            data['result'] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Bounded background job runner with TTL-based result retention
+
+    Jobs run in the process that accepted them; their state lives in a SQLite
+    file shared by every process on the host, so any gunicorn worker can report
+    on any job and results outlive the worker that produced them.
+
+    Args:
+        workers: 프로세스당 동시에 실행되는 작업 수
+        queue_limit: 대기 + 실행 중 작업 상한 (모든 프로세스 합계, 초과 시 QueueFullError)
+        result_ttl: 완료된 작업 결과 보관 시간 (초)
+        db_path: 작업 상태 SQLite 파일
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_limit: int = JOB_QUEUE_LIMIT,
+                 result_ttl: float = JOB_RESULT_TTL_SECONDS, db_path: str = JOB_DB_PATH):
+        self.workers = max(1, int(workers))
+        self.queue_limit = max(1, int(queue_limit))
+        self.result_ttl = result_ttl
+        self.db_path = Path(db_path)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None  # Process the executor / heartbeat thread belong to
+        self._owner = ''
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'expired': 0, 'orphaned': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (re-opened after fork: connections must not cross processes)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _ensure_workers(self) -> ThreadPoolExecutor:
+        """Executor + heartbeat thread of the current process (called with self._lock held)"""
+        if self._executor is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='optimize-job')
+            threading.Thread(target=self._heartbeat, args=(self._owner,), name='job-heartbeat', daemon=True).start()
+        return self._executor
+
+    def submit(self, kind: str, func: Callable, *args, params: Optional[Dict] = None, **kwargs) -> Job:
+        """Queue func(*args, **kwargs); raises QueueFullError when queue_limit jobs are pending"""
+        job = Job(kind, params)
+        conn = self._connect()
+        self._purge(conn)
+        with self._lock:
+            executor = self._ensure_workers()
+            conn.execute('BEGIN IMMEDIATE')  # Count + insert atomically across processes
+            try:
+                active = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+                if active >= self.queue_limit:
+                    self._stats['rejected'] += 1
+                    raise QueueFullError(f"Job queue is full ({active}/{self.queue_limit} jobs pending)")
+                conn.execute(
+                    'INSERT INTO jobs (id, kind, params, status, created_at, owner, heartbeat_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (job.id, job.kind, json.dumps(job.params), job.status, job.created_at, self._owner, time.time())
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self._stats['submitted'] += 1
+        executor.submit(self._run, job, func, args, kwargs)
+        logger.info(f"Job {job.id} ({kind}) queued ({active + 1}/{self.queue_limit} pending)")
+        return job
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict]:
+        conn = self._connect()
+        self._purge(conn)
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = Job.from_row(row, include_result=include_result)
+        data = job.to_dict(include_result=include_result)
+        if job.status == 'queued':
+            data['queue_position'] = 1 + conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (job.created_at,)
+            ).fetchone()[0]
+        return data
+
+    def stats(self) -> Dict:
+        conn = self._connect()
+        self._purge(conn)
+        counts = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        for status, count in conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+            counts[status] = count
+        with self._lock:
+            process_stats = dict(self._stats)  # Counters of this process only
+        return {
+            'workers': self.workers,
+            'queue_limit': self.queue_limit,
+            'result_ttl_seconds': self.result_ttl,
+            'current': counts,
+            **process_stats
+        }
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None,
+                error_type: Optional[str] = None):
+        self._connect().execute(
+            'UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, error_type = ? WHERE id = ?',
+            (status, time.time(), pickle.dumps(result) if status == 'completed' else None, error, error_type, job.id)
+        )
+
+    def _run(self, job: Job, func: Callable, args, kwargs):
+        try:
+            self._connect().execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), job.id)
+            )
+            result = func(*args, **kwargs)
+            self._finish(job, 'completed', result=result)
+            with self._lock:
+                self._stats['completed'] += 1
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            self._finish(job, 'failed', error=str(e),
+                         error_type='invalid_request' if isinstance(e, ValueError) else 'server_error')
+            with self._lock:
+                self._stats['failed'] += 1
+
+    def _heartbeat(self, owner: str):
+        """Mark this process's pending jobs alive so other processes don't fail them as orphans"""
+        while True:
+            time.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                self._connect().execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                    (time.time(), owner)
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    def _purge(self, conn: sqlite3.Connection):
+        """
+        Drop expired finished jobs, fail pending jobs whose process died (worker killed,
+        container restarted). Runs at most every JOB_PURGE_SECONDS per process so status
+        polling doesn't take the write lock on every request. Caller must not hold self._lock.
+        """
+        now = time.time()
+        if now - self._last_purge < JOB_PURGE_SECONDS:
+            return
+        self._last_purge = now
+        orphaned = conn.execute(
+            "UPDATE jobs SET status = 'failed', finished_at = ?, error_type = 'server_error', "
+            "error = 'Worker process exited before the job finished; please resubmit' "
+            "WHERE status IN ('queued', 'running') AND heartbeat_at < ?",
+            (now, now - JOB_ORPHAN_SECONDS)
+        ).rowcount
+        expired = conn.execute(
+            'DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?', (now - self.result_ttl,)
+        ).rowcount
+        expired += conn.execute(
+            'DELETE FROM jobs WHERE id IN (SELECT id FROM jobs WHERE finished_at IS NOT NULL '
+            'ORDER BY finished_at DESC LIMIT -1 OFFSET ?)', (JOB_MAX_RETAINED,)
+        ).rowcount
+        with self._lock:
+            self._stats['orphaned'] += orphaned
+            self._stats['expired'] += expired
+
+
+# Shared job manager instance
+job_manager = JobManager()
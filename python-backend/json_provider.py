@@ -0,0 +1,78 @@
+"""
+Single-pass JSON responses
+직렬화 한 번 + 정규식 한 번으로 이모지 제거 (after_request 재파싱/재직렬화 제거)
+
+- 직렬화 결과를 ensure_ascii=False 로 만든 뒤 텍스트의 JSON 문자열 리터럴을 한 번 훑어
+  값(value) 문자열에만 미리 컴파일한 정규식 적용. 키(key)는 기존 clean_dict 처럼 그대로 유지
+  (이모지 범위에 '"', '\\' 가 없으므로 리터럴 안에서 지워도 JSON 이 깨지지 않음)
+- ASCII 전용 텍스트/문자열은 정규식 없이 그대로 반환
+- orjson 이 설치되어 있으면 사용 (numpy 배열/스칼라 직접 직렬화), 없으면 표준 json
+"""
+
+import re
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+# Compiled once (remove_emojis used to recompile it on every call)
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # Emoticons
+    "\U0001F300-\U0001F5FF"  # Symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # Transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # Flags
+    "\U00002702-\U000027B0"
+    "\U000024C2-\U0001F251"
+    "\U0001F900-\U0001F9FF"  # Supplemental symbols & pictographs
+    "\U0001FA00-\U0001FAFF"  # Symbols & pictographs extended-A
+    "\U00002600-\U000026FF"  # Miscellaneous symbols
+    "\U00002700-\U000027BF"  # Dingbats
+    "]+",
+    flags=re.UNICODE
+)
+
+
+# A JSON string literal, plus the ':' that follows it when it is an object key
+JSON_STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"(\s*:)?')
+
+
+def remove_emojis(text: str) -> str:
+    """이모지 제거 (Windows cp949 호환)"""
+    if text.isascii():
+        return text
+    return EMOJI_PATTERN.sub('', text)
+
+
+def _clean_string_literal(match: re.Match) -> str:
+    literal = match.group(0)
+    if match.group(1) or literal.isascii():  # Keys are left alone
+        return literal
+    return EMOJI_PATTERN.sub('', literal)
+
+
+def remove_emojis_from_values(text: str) -> str:
+    """Serialized JSON with emojis removed from string values only"""
+    if text.isascii():
+        return text
+    return JSON_STRING_PATTERN.sub(_clean_string_literal, text)
+
+
+class SanitizingJSONProvider(DefaultJSONProvider):
+    """jsonify()/app.json.dumps() output with emojis removed from string values in the same pass"""
+
+    ensure_ascii = False  # Escaped surrogate pairs would hide emojis from the pattern
+
+    def dumps(self, obj, **kwargs) -> str:
+        # orjson only produces compact output; indent (debug mode) and other options use json
+        if orjson is not None and set(kwargs) <= {'separators'}:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            text = orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        else:
+            text = super().dumps(obj, **kwargs)
+        return remove_emojis_from_values(text)
@@ -0,0 +1,336 @@
+"""
+Market data access
+주가 히스토리 일괄 다운로드 (yfinance) + 로컬 히스토리 저장소
+
+- 여러 티커를 한 번의 배치 호출로 다운로드
+- 배치 호출 실패 시 제한된 병렬 개별 요청으로 폴백
+- 결과를 날짜 인덱스 float 행렬로 정렬하고 티커별 실패 사유 보고
+- PriceHistoryStore: 티커별 .npy 파일에 일별 종가 저장, 누락된 최근 구간만 갱신
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl  # POSIX: serialize meta.json updates across processes (gunicorn workers)
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DOWNLOAD_WORKERS = 8  # Max parallel requests (batch threads and per-ticker fallback)
+
+# Local price-history store
+PRICE_HISTORY_DIR = os.getenv('PRICE_HISTORY_DIR', str(Path(__file__).parent / 'data' / 'price_history'))
+PRICE_HISTORY_REFRESH_SECONDS = int(os.getenv('PRICE_HISTORY_REFRESH_SECONDS', 3600))  # Tail re-check interval
+PERIOD_DAYS = {
+    '5d': 7, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653
+}
+
+
+def _normalize_index(index) -> pd.DatetimeIndex:
+    """Exchange-local timestamps -> tz-naive calendar dates (KRX and US rows align by date)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def _download_batch(tickers: List[str], period: Optional[str], start: Optional[str]) -> pd.DataFrame:
+    """One yf.download call for all tickers -> DataFrame of closes (columns = tickers)"""
+    import yfinance as yf
+
+    kwargs = {'start': start} if start else {'period': period}
+    raw = yf.download(
+        tickers,
+        group_by='column',
+        auto_adjust=True,  # Same prices as Ticker.history()
+        actions=False,
+        threads=min(len(tickers), HISTORY_DOWNLOAD_WORKERS),
+        progress=False,
+        **kwargs
+    )
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+
+    if isinstance(raw.columns, pd.MultiIndex):
+        closes = raw['Close']
+    else:
+        # Older yfinance returns flat columns for a single ticker
+        closes = raw[['Close']].rename(columns={'Close': tickers[0]})
+
+    closes = closes.copy()
+    closes.index = _normalize_index(closes.index)
+    return closes
+
+
+def _download_single(ticker: str, period: Optional[str], start: Optional[str]) -> pd.Series:
+    import yfinance as yf
+
+    kwargs = {'start': start} if start else {'period': period}
+    hist = yf.Ticker(ticker).history(**kwargs)
+    if hist.empty:
+        raise ValueError("no data")
+    closes = hist['Close'].copy()
+    closes.index = _normalize_index(closes.index)
+    return closes
+
+
+def _download_parallel(tickers: List[str], period: Optional[str], start: Optional[str]) -> Tuple[Dict[str, pd.Series], Dict[str, str]]:
+    """Bounded parallel per-ticker fallback"""
+    series, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=min(len(tickers), HISTORY_DOWNLOAD_WORKERS)) as executor:
+        futures = {ticker: executor.submit(_download_single, ticker, period, start) for ticker in tickers}
+        for ticker, future in futures.items():
+            try:
+                series[ticker] = future.result()
+            except Exception as e:
+                failures[ticker] = str(e) or type(e).__name__
+    return series, failures
+
+
+def download_history(tickers: List[str], period: str = "1y", start: Optional[str] = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Download daily closes for all tickers at once
+
+    Args:
+        tickers: 티커 리스트
+        period: yfinance 기간 ('1y', '6mo', '3mo' 등)
+        start: 시작일 ('YYYY-MM-DD'). 지정 시 period 대신 사용
+
+    Returns:
+        (date-indexed float DataFrame with one column per successful ticker in request order,
+         {ticker: failure reason} for tickers without data)
+    """
+    import yfinance as yf  # Lazy (~0.2 s): only needed when the local store misses
+
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return pd.DataFrame(), {}
+
+    failures: Dict[str, str] = {}
+    try:
+        closes = _download_batch(tickers, period, start)
+        batch_errors = getattr(getattr(yf, 'shared', None), '_ERRORS', {}) or {}
+        series = {}
+        for ticker in tickers:
+            column = closes[ticker].dropna() if ticker in closes.columns else pd.Series(dtype=float)
+            if column.empty:
+                failures[ticker] = str(batch_errors.get(ticker, 'no data'))
+            else:
+                series[ticker] = column
+    except Exception as e:
+        logger.warning(f"Batch history download failed ({e}), falling back to per-ticker requests")
+        series, failures = _download_parallel(tickers, period, start)
+
+    if not series:
+        return pd.DataFrame(), failures
+
+    data = pd.DataFrame(series)
+    data = data[[t for t in tickers if t in series]].astype(float).sort_index()
+    data = data[~data.index.duplicated(keep='last')]
+    return data, failures
+
+
+class PriceHistoryStore:
+    """
+    On-disk daily close history with incremental refresh
+
+    Layout (per ticker, memory-mappable):
+        <dir>/<TICKER>.dates.npy  datetime64[D]
+        <dir>/<TICKER>.close.npy  float64
+        <dir>/meta.json           {ticker: {'covered_from': 'YYYY-MM-DD', 'checked_at': epoch}}
+
+    Reads are served from disk. Only the missing tail (since the last stored date)
+    is downloaded, at most once per refresh interval; a full download happens only
+    when a longer period than ever stored is requested. If Yahoo is unreachable,
+    previously stored data is returned as-is.
+
+    Several processes may share the directory: meta.json is re-read when another
+    process replaced it, and updates are merged into the current file under an
+    exclusive lock on meta.json.lock (POSIX) instead of overwriting it.
+    """
+
+    def __init__(self, directory: str = PRICE_HISTORY_DIR, refresh_seconds: int = PRICE_HISTORY_REFRESH_SECONDS):
+        self.directory = Path(directory)
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Dict] = {}
+        self._meta_mtime: Optional[int] = None
+
+    # ---------- file I/O ----------
+
+    def _paths(self, ticker: str) -> Tuple[Path, Path]:
+        safe_name = re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+        return self.directory / f"{safe_name}.dates.npy", self.directory / f"{safe_name}.close.npy"
+
+    def _load_meta(self, force: bool = False) -> Dict[str, Dict]:
+        """meta.json contents, re-read when the file changed on disk (or always with force)"""
+        meta_path = self.directory / 'meta.json'
+        try:
+            mtime = meta_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if force or mtime != self._meta_mtime:
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    self._meta = json.load(f)
+            except (OSError, ValueError):
+                self._meta = {}
+            self._meta_mtime = mtime
+        return self._meta
+
+    @contextmanager
+    def _meta_file_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.directory / 'meta.json.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _update_meta(self, updates: Dict[str, Dict]):
+        """
+        Merge {ticker: {'checked_at', 'covered_from'?}} into meta.json
+
+        The file is re-read under the lock so entries written by other processes
+        survive; checked_at keeps the latest value, covered_from the earliest.
+        Caller holds self._lock.
+        """
+        with self._meta_file_lock():
+            meta = self._load_meta(force=True)
+            for ticker, update in updates.items():
+                entry = meta.setdefault(ticker, {})
+                entry['checked_at'] = max(entry.get('checked_at', 0), update['checked_at'])
+                covered_from = update.get('covered_from')
+                if covered_from and (entry.get('covered_from') is None or covered_from < entry['covered_from']):
+                    entry['covered_from'] = covered_from
+
+            tmp_path = self.directory / f"meta.json.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self.directory / 'meta.json')
+            self._meta_mtime = (self.directory / 'meta.json').stat().st_mtime_ns
+
+    def read(self, ticker: str) -> Optional[pd.Series]:
+        """Stored closes for one ticker (None if never stored)"""
+        dates_path, close_path = self._paths(ticker)
+        if not dates_path.exists() or not close_path.exists():
+            return None
+        try:
+            dates = np.load(dates_path, mmap_mode='r')
+            closes = np.load(close_path, mmap_mode='r')
+            series = pd.Series(np.array(closes, dtype=float), index=pd.DatetimeIndex(np.array(dates)), name=ticker)
+            del dates, closes  # Release the mappings (files may be replaced later)
+            return series
+        except (OSError, ValueError) as e:
+            logger.warning(f"Corrupt price history for {ticker}: {e}")
+            return None
+
+    def _write(self, ticker: str, series: pd.Series):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        series = series.dropna().sort_index()
+        series = series[~series.index.duplicated(keep='last')]
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        for path, values in zip(self._paths(ticker), (series.index.values.astype('datetime64[D]'),
+                                                      series.values.astype(np.float64))):
+            tmp_path = path.with_name(path.name + suffix)
+            np.save(tmp_path, values)
+            os.replace(tmp_path, path)
+
+    # ---------- refresh ----------
+
+    def _merge_and_store(self, frame: pd.DataFrame, stored: Dict[str, Optional[pd.Series]], covered_from: Optional[str]):
+        now = time.time()
+        updates = {}
+        with self._lock:
+            for ticker in frame.columns:
+                fresh = frame[ticker].dropna()
+                if fresh.empty:
+                    continue
+                old = stored.get(ticker)
+                merged = fresh if old is None else pd.concat([old[old.index < fresh.index[0]], fresh])
+                self._write(ticker, merged)
+                stored[ticker] = merged
+                updates[ticker] = {'checked_at': now, 'covered_from': covered_from}
+            if updates:
+                self._update_meta(updates)
+
+    def get_history(self, tickers: List[str], period: str = "1y") -> Tuple[pd.DataFrame, Dict[str, str]]:
+        """
+        Same contract as download_history(), served from the local store
+
+        Returns:
+            (date-indexed float DataFrame, {ticker: failure reason})
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if period not in PERIOD_DAYS:
+            # Unusual periods ('max', 'ytd', ...) bypass the store
+            return download_history(tickers, period=period)
+
+        start = (date.today() - timedelta(days=PERIOD_DAYS[period])).isoformat()
+        now = time.time()
+        with self._lock:
+            meta = {t: dict(self._load_meta().get(t, {})) for t in tickers}
+        stored = {t: self.read(t) for t in tickers}
+
+        # Never stored or not stored far enough back -> full download for the period
+        need_full = [t for t in tickers
+                     if stored[t] is None or meta[t].get('covered_from') is None or meta[t]['covered_from'] > start]
+        # Stored but possibly stale -> only the tail since the last stored day
+        need_tail = [t for t in tickers
+                     if t not in need_full and now - meta[t].get('checked_at', 0) > self.refresh_seconds]
+
+        failures: Dict[str, str] = {}
+        if need_full:
+            frame, full_failures = download_history(need_full, period=period)
+            self._merge_and_store(frame, stored, start)
+            failures.update(full_failures)
+
+        # Group tail refreshes by last stored date so each group is one batched call
+        tail_groups: Dict[str, List[str]] = {}
+        for ticker in need_tail:
+            tail_groups.setdefault(stored[ticker].index[-1].date().isoformat(), []).append(ticker)
+        for tail_start, group in tail_groups.items():
+            frame, tail_failures = download_history(group, start=tail_start)
+            self._merge_and_store(frame, stored, None)
+            if tail_failures:
+                # Offline or no new rows: keep serving stored data, retry after the refresh interval
+                with self._lock:
+                    self._update_meta({ticker: {'checked_at': now} for ticker in tail_failures})
+
+        series = {}
+        for ticker in tickers:
+            history = stored.get(ticker)
+            if history is None or history.empty:
+                failures.setdefault(ticker, 'no data')
+                continue
+            failures.pop(ticker, None)  # Stored data covers a failed refresh
+            series[ticker] = history[history.index >= pd.Timestamp(start)]
+
+        if not series:
+            return pd.DataFrame(), failures
+
+        data = pd.DataFrame(series)[[t for t in tickers if t in series]].astype(float).sort_index()
+        return data, failures
+
+
+# Shared store instance
+price_history_store = PriceHistoryStore()
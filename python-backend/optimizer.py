@@ -3,49 +3,618 @@ Qiskit-based Portfolio Optimization
 PROPER IMPLEMENTATION: Classical Mean-Variance + Quantum QUBO
 """
 
+import copy
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import numpy as np
 import pandas as pd
-from qiskit_algorithms import QAOA
-from qiskit_algorithms.optimizers import COBYLA
-from qiskit.primitives import StatevectorSampler
-from qiskit_optimization import QuadraticProgram
-from qiskit_optimization.algorithms import MinimumEigenOptimizer
-import yfinance as yf
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Iterator, Tuple, Optional
 import warnings
-import signal
-import threading
-from functools import wraps
+from market_data import price_history_store
+from solver_pool import get_solver_pool
+from ttl_cache import TTLCache
+from perf_metrics import PhaseTimer
+from covariance import estimate_covariance, validate_estimator
+from rolling_stats import ROLLING_STATS_ENABLED, daily_returns, rolling_stats_store
 warnings.filterwarnings('ignore')
 
+# qiskit / qiskit_algorithms / qiskit_optimization (~1 s) are imported inside the functions
+# that use them: importing this module (and app.py) stays fast, solver workers preload them
+if TYPE_CHECKING:
+    from qiskit_optimization import QuadraticProgram
+
 # Constants for quantum optimization
 QUANTUM_TIMEOUT_SECONDS = 20 # Fast timeout for production (Jupyter: 10-15s)
 WEIGHT_THRESHOLD = 1e-6
 QUANTUM_NOISE_RANGE = 0.01
 PENALTY_MULTIPLIER = 100.0
 DEFAULT_QAOA_MAXITER = 30 # Reduced for faster execution
+QAOA_WARM_MAXITER = 15 # COBYLA budget when starting from cached angles
+QAOA_WARM_RHOBEG = 0.25 # Smaller initial COBYLA step around cached angles
+QAOA_ANGLE_CACHE_TTL_SECONDS = int(os.getenv('QAOA_ANGLE_CACHE_TTL_SECONDS', 24 * 3600))
+QAOA_RISK_BUCKETS = 10 # risk_factor granularity for sharing cached angles
+QAOA_STARTS = int(os.getenv('QAOA_STARTS', 1)) # Independent seeded COBYLA starts (capped at solver pool size)
+QAOA_START_JITTER = 0.3 # Angle perturbation (radians) of extra starts around a warm point
+QAOA_START_SEED = 42
+QUANTUM_QUEUE_TIMEOUT_SECONDS = 20 # Max wait for a free solver worker
+
+# QUBO solver backend: 'qiskit' (QAOA, StatevectorSampler circuit), 'numpy' (QAOA, diagonal-cost
+# statevector), 'anneal' (classical simulated annealing), 'exact' (enumeration) or
+# 'auto' (exact up to EXACT_SOLVER_MAX_QUBITS, qiskit above)
+QAOA_BACKEND = os.getenv('QAOA_BACKEND', 'auto')
+QUBO_BACKENDS = ('auto', 'qiskit', 'numpy', 'anneal', 'exact')
+NUMPY_QAOA_MAX_QUBITS = int(os.getenv('NUMPY_QAOA_MAX_QUBITS', 22))  # 2^22 amplitudes = 64 MB (complex128)
+NUMPY_QAOA_DTYPE = os.getenv('NUMPY_QAOA_DTYPE', 'complex128')  # 'complex64' halves memory/bandwidth
+NUMPY_QAOA_SHOTS = 1024
+NUMPY_QAOA_MIXER_BLOCK = 4  # Qubits per mixer matmul (2^4 x 2^4 rotation)
+
+# Simulated annealing (backend='anneal' and QAOA timeout/error fallback)
+ANNEAL_REPLICAS = 64
+ANNEAL_SWEEPS = 200
+ANNEAL_FINAL_TEMPERATURE_RATIO = 1e-3  # T_final / T_initial (geometric schedule)
+ANNEAL_TIMEOUT_SECONDS = 10
+
+# Exact enumeration (backend='exact'/'auto' and ground truth for approximation ratios)
+EXACT_SOLVER_MAX_QUBITS = int(os.getenv('EXACT_SOLVER_MAX_QUBITS', 24))  # 2^24 states in ~30 ms
+EXACT_SOLVER_BLOCK_BITS = 16  # Low bits tabulated at once; high bits walked in Gray-code order
+
+# Optimization result cache (same tickers/params/data -> same result)
+RESULT_CACHE_TTL_SECONDS = int(os.getenv('RESULT_CACHE_TTL_SECONDS', 6 * 3600))
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', 256))
+UNCACHED_QUANTUM_STATUSES = ('anneal-fallback', 'synthetic-enhancement')  # Transient fallbacks are retried
+
+# Constants for classical mean-variance optimization
+CLASSICAL_MAX_ITER = 2000
+CLASSICAL_TOLERANCE = 1e-10
+FRONTIER_DEFAULT_POINTS = 20
+FRONTIER_MAX_POINTS = 100
+
+# Batch optimization
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 4))  # Portfolios optimized concurrently (quantum solves still share the solver pool)
+
+
+def _project_onto_simplex(v: np.ndarray) -> np.ndarray:
+    """Euclidean projection onto {w | w >= 0, sum(w) = 1} (sort-based, O(n log n))"""
+    u = np.sort(v)[::-1]
+    cumulative = np.cumsum(u) - 1.0
+    rho = np.nonzero(u - cumulative / np.arange(1, len(v) + 1) > 0)[0][-1]
+    theta = cumulative[rho] / (rho + 1.0)
+    return np.maximum(v - theta, 0.0)
+
+
+def _solve_mean_variance(mean_returns: np.ndarray, cov_matrix: np.ndarray, lambda_param: float,
+                         initial_weights: Optional[np.ndarray] = None,
+                         max_eigenvalue: Optional[float] = None) -> Tuple[np.ndarray, int, bool]:
+    """
+    minimize -lambda * mu^T w + (1 - lambda) * w^T Sigma w  over the simplex (FISTA with adaptive restart)
+    
+    initial_weights warm-starts the iteration; max_eigenvalue (of Sigma) can be passed in
+    to share one eigen-decomposition across many lambdas. Returns (weights, iterations, converged).
+    """
+    if max_eigenvalue is None:
+        max_eigenvalue = float(np.linalg.eigvalsh(cov_matrix)[-1])
+    
+    # Step size 1/L, L = Lipschitz constant of the gradient (2 * (1-lambda) * max eigenvalue)
+    lipschitz = 2 * (1 - lambda_param) * max_eigenvalue
+    step = 1.0 / max(lipschitz, 1e-12)
+    
+    def objective(w):
+        return -lambda_param * mean_returns @ w + (1 - lambda_param) * w @ cov_matrix @ w
+    
+    def gradient(w):
+        return -lambda_param * mean_returns + 2 * (1 - lambda_param) * (cov_matrix @ w)
+    
+    n_assets = len(mean_returns)
+    if initial_weights is None:
+        weights = np.ones(n_assets) / n_assets
+    else:
+        weights = _project_onto_simplex(np.asarray(initial_weights, dtype=float))
+    momentum_point = weights.copy()
+    t = 1.0
+    converged = False
+    iterations = 0
+    for iterations in range(1, CLASSICAL_MAX_ITER + 1):
+        next_weights = _project_onto_simplex(momentum_point - step * gradient(momentum_point))
+        if np.max(np.abs(next_weights - weights)) < CLASSICAL_TOLERANCE:
+            weights = next_weights
+            converged = True
+            break
+        next_t = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        if objective(next_weights) > objective(weights):
+            # Restart momentum when the objective goes up
+            momentum_point, next_t = next_weights, 1.0
+        else:
+            momentum_point = next_weights + ((t - 1) / next_t) * (next_weights - weights)
+        weights, t = next_weights, next_t
+    return weights, iterations, converged
+
+
+class QuboSolution:
+    """Picklable QUBO solve result (exposes variables_dict / fval like qiskit's OptimizationResult)"""
+    
+    def __init__(self, variables_dict: Dict[str, float], fval: float, probability: Optional[float] = None,
+                 metadata: Optional[Dict] = None):
+        self.variables_dict = variables_dict
+        self.fval = fval
+        self.probability = probability
+        self.metadata = metadata or {}
+
+
+def _make_quadratic_program(n_assets: int, precision: int, linear: np.ndarray,
+                            quadratic: np.ndarray) -> 'QuadraticProgram':
+    """Dense QUBO arrays -> QuadraticProgram with variables x_{i}_{bit} (asset-major order)"""
+    from qiskit_optimization import QuadraticProgram
+    
+    qp = QuadraticProgram()
+    qp.binary_var_list(
+        [f'{i}_{bit}' for i in range(n_assets) for bit in range(precision)],
+        name='x', key_format='_{}'
+    )
+    qp.minimize(linear=linear, quadratic=quadratic)
+    return qp
+
+
+def _default_initial_point(reps: int) -> np.ndarray:
+    """Linear-ramp start [gamma_1..gamma_p, beta_1..beta_p] (annealing-like: gamma grows, beta shrinks)"""
+    ramp = (np.arange(reps) + 0.5) / reps
+    return np.concatenate([np.pi * ramp, (np.pi / 4) * (1 - ramp)])
+
+
+def _qaoa_start_points(reps: int, starts: int, base_point: Optional[List[float]] = None) -> List[np.ndarray]:
+    """
+    Initial [gammas, betas] for each multi-start run
+
+    Start 0 is the warm point (or the linear ramp). Extra starts are jittered around
+    a warm point, or drawn uniformly from gamma in [0, pi], beta in [0, pi/2] when cold.
+    """
+    rng = np.random.default_rng(QAOA_START_SEED)
+    first = np.asarray(base_point if base_point is not None else _default_initial_point(reps), dtype=float)
+    points = [first]
+    for _ in range(starts - 1):
+        if base_point is not None:
+            points.append(first + rng.normal(0.0, QAOA_START_JITTER, first.shape))
+        else:
+            points.append(np.concatenate([rng.uniform(0, np.pi, reps), rng.uniform(0, np.pi / 2, reps)]))
+    return points
+
+
+def _qubo_to_ising(linear: np.ndarray, quadratic: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    QUBO -> Ising coefficients with x = (1 - z) / 2
+
+    E(x) = const + sum_i h_i z_i + sum_{i<j} J_ij z_i z_j  (J upper triangular)
+    """
+    coupling = np.asarray(quadratic, dtype=float) + np.asarray(quadratic, dtype=float).T
+    np.fill_diagonal(coupling, 0.0)
+    fields = -(np.asarray(linear, dtype=float) + np.diag(quadratic)) / 2 - coupling.sum(axis=1) / 4
+    return fields, np.triu(coupling, 1) / 4
+
+
+# Parameterized QAOA circuits per worker process: {(num_qubits, reps, coupled pairs): ansatz}
+_ANSATZ_CACHE: Dict[Tuple, Tuple] = {}
+ANSATZ_CACHE_SIZE = 16
+
+
+def _get_qaoa_ansatz(num_qubits: int, reps: int, pairs: Tuple[Tuple[int, int], ...]) -> Tuple:
+    """
+    QAOA circuit whose Hamiltonian coefficients are parameters too
+
+    Built once per (num_qubits, reps, coupling structure); a new QUBO with the same
+    shape only binds new h/J values. Returns (circuit, parameter order, gammas,
+    betas, fields, couplings, cache_hit).
+    """
+    key = (num_qubits, reps, pairs)
+    cached = _ANSATZ_CACHE.get(key)
+    if cached is not None:
+        return cached + (True,)
+    
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import ParameterVector
+    
+    gammas = ParameterVector('gamma', reps)
+    betas = ParameterVector('beta', reps)
+    fields = ParameterVector('h', num_qubits)
+    couplings = ParameterVector('J', len(pairs))
+    circuit = QuantumCircuit(num_qubits)
+    circuit.h(range(num_qubits))
+    for layer in range(reps):
+        # exp(-i gamma H_C): RZ(2 gamma h_i), RZZ(2 gamma J_ij)
+        for qubit in range(num_qubits):
+            circuit.rz(2 * gammas[layer] * fields[qubit], qubit)
+        for index, (i, j) in enumerate(pairs):
+            circuit.rzz(2 * gammas[layer] * couplings[index], i, j)
+        # exp(-i beta X) on every qubit
+        circuit.rx(2 * betas[layer], range(num_qubits))
+    circuit.measure_all()
+    
+    if len(_ANSATZ_CACHE) >= ANSATZ_CACHE_SIZE:
+        _ANSATZ_CACHE.pop(next(iter(_ANSATZ_CACHE)))
+    cached = (circuit, list(circuit.parameters), gammas, betas, fields, couplings)
+    _ANSATZ_CACHE[key] = cached
+    return cached + (False,)
+
+
+def _solve_qaoa_job(linear: np.ndarray, quadratic: np.ndarray, n_assets: int, precision: int,
+                    reps: int, maxiter: int, initial_point: Optional[List[float]] = None,
+                    seed: Optional[int] = None, rhobeg: float = 1.0) -> QuboSolution:
+    """
+    Solver-pool job: QAOA on Qiskit's StatevectorSampler with a cached ansatz
+
+    The QUBO is mapped to Ising fields/couplings (normalized by sqrt(sum h^2 + sum J^2),
+    the energy standard deviation over random states, so angles transfer between
+    problems) and bound into the cached circuit. COBYLA minimizes the sampled
+    <E>; the lowest-energy bitstring measured during the run is returned.
+    """
+    from qiskit.primitives import StatevectorSampler
+    from qiskit_algorithms.optimizers import COBYLA
+    
+    linear = np.asarray(linear, dtype=float)
+    quadratic = np.asarray(quadratic, dtype=float)
+    num_qubits = n_assets * precision
+    fields, couplings = _qubo_to_ising(linear, quadratic)
+    pairs = tuple(zip(*np.nonzero(couplings)))
+    scale = float(np.sqrt(np.sum(fields ** 2) + np.sum(couplings ** 2))) or 1.0
+    
+    circuit, parameters, gamma_params, beta_params, field_params, coupling_params, cache_hit = \
+        _get_qaoa_ansatz(num_qubits, reps, pairs)
+    position = {parameter: index for index, parameter in enumerate(parameters)}
+    values = np.zeros(len(parameters))
+    for qubit in range(num_qubits):
+        values[position[field_params[qubit]]] = fields[qubit] / scale
+    for index, (i, j) in enumerate(pairs):
+        values[position[coupling_params[index]]] = couplings[i, j] / scale
+    gamma_slots = [position[p] for p in gamma_params]
+    beta_slots = [position[p] for p in beta_params]
+    
+    sampler = StatevectorSampler(default_shots=NUMPY_QAOA_SHOTS, seed=seed)
+    best = {'energy': np.inf, 'bits': None, 'probability': 0.0}
+    
+    def sample(params: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        values[gamma_slots] = params[:reps]
+        values[beta_slots] = params[reps:]
+        counts = sampler.run([(circuit, values)]).result()[0].data.meas.get_counts()
+        bitstrings = list(counts)
+        # Rightmost character is qubit 0 (= variable 0)
+        bits = np.array([[char == '1' for char in reversed(bitstring)] for bitstring in bitstrings], dtype=float)
+        shares = np.array([counts[bitstring] for bitstring in bitstrings], dtype=float)
+        shares /= shares.sum()
+        energies = bits @ linear + np.einsum('si,ij,sj->s', bits, quadratic, bits)
+        return bits, shares, energies
+    
+    def expectation(params: np.ndarray) -> float:
+        bits, shares, energies = sample(params)
+        lowest = int(np.argmin(energies))
+        if energies[lowest] < best['energy']:
+            best.update(energy=float(energies[lowest]), bits=bits[lowest], probability=float(shares[lowest]))
+        return float(shares @ energies) / scale
+    
+    if initial_point is None:
+        initial_point = _default_initial_point(reps)
+    opt_result = COBYLA(maxiter=maxiter, rhobeg=rhobeg).minimize(expectation, np.asarray(initial_point, dtype=float))
+    
+    variables = {
+        f'x_{i}_{bit}': float(best['bits'][i * precision + bit])
+        for i in range(n_assets) for bit in range(precision)
+    }
+    return QuboSolution(
+        variables,
+        best['energy'],
+        probability=best['probability'],
+        metadata={
+            'backend': 'qiskit',
+            'cost_function_evals': int(opt_result.nfev) if opt_result.nfev is not None else None,
+            'optimal_point': [float(v) for v in opt_result.x],
+            'ansatz_cached': cache_hit
+        }
+    )
+
+
+def _qubo_energies(linear: np.ndarray, quadratic: np.ndarray) -> np.ndarray:
+    """
+    QUBO objective linear @ x + x^T Q x for every basis state, in O(N * 2^N)
+
+    Basis index b encodes x_k = (b >> k) & 1 (variable k = qubit k). The table is
+    built by doubling: adding variable k appends E + linear[k] + Q[k, k] + field_k,
+    where field_k = sum_{j<k} (Q[j, k] + Q[k, j]) x_j is itself built by doubling.
+    """
+    linear = np.asarray(linear, dtype=float)
+    quadratic = np.asarray(quadratic, dtype=float)
+    coupling = quadratic + quadratic.T
+    energies = np.zeros(1)
+    for k in range(len(linear)):
+        field = np.zeros(1)
+        for j in range(k):
+            field = np.concatenate([field, field + coupling[j, k]])
+        energies = np.concatenate([energies, energies + linear[k] + quadratic[k, k] + field])
+    return energies
+
+
+def _linear_table(coeffs: np.ndarray) -> np.ndarray:
+    """sum_j coeffs[j] * x_j for every basis state of len(coeffs) bits (doubling build)"""
+    table = np.zeros(1)
+    for coeff in coeffs:
+        table = np.concatenate([table, table + coeff])
+    return table
+
+
+def _solve_exact_qubo(linear: np.ndarray, quadratic: np.ndarray, n_assets: int, precision: int) -> QuboSolution:
+    """
+    Exact QUBO minimum by enumeration of all 2^N states
+
+    The low EXACT_SOLVER_BLOCK_BITS variables are tabulated with _qubo_energies; the
+    remaining high variables are walked in Gray-code order, so each step flips one
+    high bit: the high-only energy changes by an O(N) field term and the low table
+    shifts by one precomputed coupling table. Memory stays O(2^block) regardless of N.
+    The maximum energy is tracked as well (for approximation ratios).
+    """
+    linear = np.asarray(linear, dtype=float)
+    quadratic = np.asarray(quadratic, dtype=float)
+    num_vars = len(linear)
+    low_bits = min(num_vars, EXACT_SOLVER_BLOCK_BITS)
+    high_bits = num_vars - low_bits
+    coupling = quadratic + quadratic.T
+    
+    table = _qubo_energies(linear[:low_bits], quadratic[:low_bits, :low_bits])
+    cross_tables = [_linear_table(coupling[:low_bits, low_bits + h]) for h in range(high_bits)]
+    high_bias = linear[low_bits:] + np.diag(quadratic)[low_bits:]
+    high_coupling = coupling[low_bits:, low_bits:].copy()
+    np.fill_diagonal(high_coupling, 0.0)
+    
+    high_x = np.zeros(high_bits)
+    high_energy = 0.0
+    best_low = int(np.argmin(table))
+    best_energy, best_high = float(table[best_low]), 0
+    max_energy = float(table.max())
+    for step in range(1, 1 << high_bits):
+        h = (step & -step).bit_length() - 1  # Gray code: flip the lowest set bit of step
+        sign = 1.0 - 2.0 * high_x[h]
+        high_energy += sign * (high_bias[h] + high_coupling[h] @ high_x)
+        high_x[h] += sign
+        table += sign * cross_tables[h]
+        low = int(np.argmin(table))
+        if table[low] + high_energy < best_energy:
+            best_energy, best_low, best_high = float(table[low] + high_energy), low, step ^ (step >> 1)
+        max_energy = max(max_energy, float(table.max()) + high_energy)
+    
+    best = best_low | (best_high << low_bits)
+    variables = {
+        f'x_{i}_{bit}': float((best >> (i * precision + bit)) & 1)
+        for i in range(n_assets) for bit in range(precision)
+    }
+    return QuboSolution(
+        variables,
+        best_energy,
+        probability=1.0,
+        metadata={'backend': 'exact', 'states': 1 << num_vars, 'max_energy': max_energy}
+    )
+
+
+def _apply_mixer(state: np.ndarray, num_qubits: int, beta: float) -> np.ndarray:
+    """
+    exp(-i beta X) on every qubit
+
+    Qubits are rotated NUMPY_QAOA_MIXER_BLOCK at a time with the Kronecker power of
+    the single-qubit rotation (one batched matmul per block), which is several times
+    faster than one strided 2x2 update per qubit.
+    """
+    cos_b, sin_b = np.cos(beta), -1j * np.sin(beta)
+    rotation = np.array([[cos_b, sin_b], [sin_b, cos_b]], dtype=state.dtype)
+    block_matrices = {}
+    qubit = 0
+    while qubit < num_qubits:
+        width = min(NUMPY_QAOA_MIXER_BLOCK, num_qubits - qubit)
+        if width not in block_matrices:
+            matrix = rotation
+            for _ in range(width - 1):
+                matrix = np.kron(matrix, rotation)
+            block_matrices[width] = matrix
+        state = np.matmul(block_matrices[width], state.reshape(-1, 1 << width, 1 << qubit)).reshape(-1)
+        qubit += width
+    return state
+
+
+def _solve_numpy_qaoa_job(linear: np.ndarray, quadratic: np.ndarray, n_assets: int, precision: int,
+                          reps: int, maxiter: int, initial_point: Optional[List[float]] = None,
+                          seed: Optional[int] = 42, rhobeg: float = 1.0, dtype: str = NUMPY_QAOA_DTYPE) -> QuboSolution:
+    """
+    Solver-pool job: QAOA simulated directly on the statevector with NumPy
+
+    The cost Hamiltonian of a QUBO is diagonal, so its energies are tabulated once
+    and each layer is an elementwise phase exp(-i gamma E) followed by the
+    transverse-field mixer. Energies are rescaled to [0, 1] for the phase (same
+    minimizer, well-conditioned angles). COBYLA optimizes <E>; the lowest-energy
+    state among NUMPY_QAOA_SHOTS samples is returned, like MinimumEigenOptimizer.
+    """
+    from qiskit_algorithms.optimizers import COBYLA
+    
+    num_qubits = n_assets * precision
+    if num_qubits > NUMPY_QAOA_MAX_QUBITS:
+        raise ValueError(f"NumPy QAOA supports up to {NUMPY_QAOA_MAX_QUBITS} qubits (requested {num_qubits})")
+    
+    complex_dtype = np.dtype(dtype)
+    real_dtype = np.float32 if complex_dtype == np.complex64 else np.float64
+    energies = _qubo_energies(linear, quadratic)
+    spread = energies.max() - energies.min()
+    scaled = ((energies - energies.min()) / (spread if spread > 0 else 1.0)).astype(real_dtype)
+    uniform = np.full(1 << num_qubits, 1 / np.sqrt(1 << num_qubits), dtype=complex_dtype)
+    
+    def statevector(params: np.ndarray) -> np.ndarray:
+        gammas, betas = params[:reps], params[reps:]
+        state = uniform.copy()
+        for gamma, beta in zip(gammas, betas):
+            state *= np.exp(-1j * gamma * scaled).astype(complex_dtype, copy=False)
+            state = _apply_mixer(state, num_qubits, beta)
+        return state
+    
+    def expectation(params: np.ndarray) -> float:
+        state = statevector(params)
+        return float(np.dot(state.real ** 2 + state.imag ** 2, scaled))
+    
+    if initial_point is None:
+        initial_point = _default_initial_point(reps)
+    
+    opt_result = COBYLA(maxiter=maxiter, rhobeg=rhobeg).minimize(expectation, np.asarray(initial_point, dtype=float))
+    optimal_point = np.asarray(opt_result.x, dtype=float)
+    
+    state = statevector(optimal_point)
+    probabilities = (state.real ** 2 + state.imag ** 2).astype(np.float64)
+    probabilities /= probabilities.sum()
+    samples = np.random.default_rng(seed).choice(len(probabilities), size=NUMPY_QAOA_SHOTS, p=probabilities)
+    best = int(samples[np.argmin(energies[samples])])
+    
+    variables = {
+        f'x_{i}_{bit}': float((best >> (i * precision + bit)) & 1)
+        for i in range(n_assets) for bit in range(precision)
+    }
+    return QuboSolution(
+        variables,
+        float(energies[best]),
+        probability=float(probabilities[best]),
+        metadata={
+            'backend': 'numpy',
+            'dtype': complex_dtype.name,
+            'cost_function_evals': int(opt_result.nfev) if opt_result.nfev is not None else None,
+            'optimal_point': [float(v) for v in optimal_point],
+            'expectation': float(opt_result.fun) * (spread if spread > 0 else 1.0) + float(energies.min())
+        }
+    )
+
+
+def _solve_anneal_job(linear: np.ndarray, quadratic: np.ndarray, n_assets: int, precision: int,
+                      replicas: int = ANNEAL_REPLICAS, sweeps: int = ANNEAL_SWEEPS, seed: int = 42) -> QuboSolution:
+    """
+    Solver-pool job: batched simulated annealing on the QUBO
+
+    All replicas are updated together, one variable at a time. Flipping x_k changes
+    the energy by (1 - 2 x_k) * (bias_k + field_k) with field = x @ (Q + Q^T, zero
+    diagonal), so each flip costs one row update of the replica field matrix instead
+    of re-evaluating x^T Q x. The temperature falls geometrically from the median
+    |delta| of the random start; a zero-temperature pass then removes any remaining
+    single-flip improvements.
+    """
+    linear = np.asarray(linear, dtype=float)
+    quadratic = np.asarray(quadratic, dtype=float)
+    num_vars = len(linear)
+    coupling = quadratic + quadratic.T
+    np.fill_diagonal(coupling, 0.0)
+    bias = linear + np.diag(quadratic)
+    
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 2, size=(replicas, num_vars)).astype(float)
+    field = x @ coupling
+    
+    def flip(rows: np.ndarray, k: int):
+        step = 1 - 2 * x[rows, k]
+        x[rows, k] += step
+        field[rows] += step[:, None] * coupling[k]
+    
+    initial_scale = float(np.median(np.abs((1 - 2 * x) * (bias + field)))) or 1.0
+    temperatures = np.geomspace(initial_scale, initial_scale * ANNEAL_FINAL_TEMPERATURE_RATIO, sweeps)
+    for temperature in temperatures:
+        thresholds = rng.random((num_vars, replicas))
+        for k in rng.permutation(num_vars):
+            delta = (1 - 2 * x[:, k]) * (bias[k] + field[:, k])
+            rows = np.nonzero(thresholds[k] < np.exp(np.minimum(-delta / temperature, 0.0)))[0]
+            if rows.size:
+                flip(rows, k)
+    
+    # Greedy descent to a single-flip local minimum
+    for _ in range(num_vars):
+        improved = False
+        for k in range(num_vars):
+            delta = (1 - 2 * x[:, k]) * (bias[k] + field[:, k])
+            rows = np.nonzero(delta < -1e-12)[0]
+            if rows.size:
+                flip(rows, k)
+                improved = True
+        if not improved:
+            break
+    
+    energies = x @ linear + np.einsum('ri,ij,rj->r', x, quadratic, x)
+    best = int(np.argmin(energies))
+    variables = {
+        f'x_{i}_{bit}': float(x[best, i * precision + bit])
+        for i in range(n_assets) for bit in range(precision)
+    }
+    return QuboSolution(
+        variables,
+        float(energies[best]),
+        probability=float(np.mean(np.isclose(energies, energies[best]))),  # Share of replicas at the best energy
+        metadata={'backend': 'anneal', 'replicas': replicas, 'sweeps': sweeps}
+    )
+
+
+_QAOA_JOBS = {
+    'qiskit': _solve_qaoa_job,
+    'numpy': _solve_numpy_qaoa_job
+}
+
+# Optimal [gammas, betas] per (backend, qubits, reps, risk bucket), reused as the next initial_point
+_qaoa_angle_cache = TTLCache(max_size=256, ttl=QAOA_ANGLE_CACHE_TTL_SECONDS, name='qaoa-angles')
+
+
+# Solved portfolios per (method, tickers, risk_factor, solver params, covariance estimator, returns fingerprint)
+_result_cache = TTLCache(max_size=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL_SECONDS, name='optimization-results')
+
+
+RESULT_TELEMETRY_KEYS = ('queue_wait_seconds', 'solve_seconds', 'total_seconds', 'wall_seconds', 'worker_pid')
+
+
+def get_result_cache_stats() -> Dict:
+    return _result_cache.stats()
+
+
+def _without_telemetry(result: Dict) -> Dict:
+    """Deep copy of a solve result minus per-call timings (what the result cache keeps)"""
+    result = copy.deepcopy(result)
+    result.pop('execution', None)
+    for run in result.get('qaoa', {}).get('start_runs', []):
+        for key in RESULT_TELEMETRY_KEYS:
+            run.pop(key, None)
+    return result
+
+
+def _is_cacheable_result(result: Dict) -> bool:
+    """Transient fallbacks (UNCACHED_QUANTUM_STATUSES) are returned but never stored"""
+    return result.get('quantum_status') not in UNCACHED_QUANTUM_STATUSES
+
+
+def _angle_cache_key(backend: str, num_qubits: int, reps: int, risk_factor: float) -> Tuple:
+    return backend, num_qubits, reps, int(round(float(risk_factor) * QAOA_RISK_BUCKETS))
 
 
 class PortfolioOptimizer:
     """Qiskit 기반 포트폴리오 최적화 - PROPER QUANTUM IMPLEMENTATION"""
     
-    def __init__(self, tickers: List[str], risk_factor: float = 0.5, initial_weights: List[float] = None, fast_mode: bool = False):
+    def __init__(self, tickers: List[str], risk_factor: float = 0.5, initial_weights: List[float] = None, fast_mode: bool = False,
+                 timer: Optional[PhaseTimer] = None, covariance_estimator: Optional[str] = None):
         """
         Args:
             tickers: 주식 티커 리스트 (예: ['AAPL', 'GOOGL', 'MSFT'])
             risk_factor: 리스크 팩터 (0.0 ~ 1.0, 기본값: 0.5)
             initial_weights: 초기 가중치 리스트 (선택사항, None)
             fast_mode: 빠른 모드 (reps=1, maxiter=50, 기본값: False)
+            timer: 구간별 시간 측정 (선택사항, 없으면 새로 생성; Flask 핸들러가 요청 단위로 전달)
+            covariance_estimator: 'sample', 'ledoit-wolf', 'constant-correlation', 'ewma'
+                                  (기본값: COVARIANCE_ESTIMATOR 환경변수, 없으면 'sample')
         """
         self.tickers = tickers
         self.risk_factor = risk_factor
         self.initial_weights = initial_weights
         self.fast_mode = fast_mode
+        self.timer = timer or PhaseTimer()
+        self.covariance_estimator = validate_estimator(covariance_estimator)
+        self.covariance_info = {'estimator': self.covariance_estimator}
         self.expected_returns = None
         self.covariance_matrix = None
         self.data = None
+        self.period = None  # Window of the last fetch_data() (keys the rolling statistics)
         self.returns_data = None  # Daily returns for optimization
+        self.fetch_failures = {}  # {ticker: reason} from the last fetch_data()
         
         # 초기 가중치 검증
         if initial_weights is not None:
@@ -86,50 +655,73 @@ class PortfolioOptimizer:
             if not np.allclose(self.covariance_matrix, self.covariance_matrix.T):
                 raise ValueError("covariance_matrix는 대칭 행렬이어야 합니다.")
     
-    def fetch_data(self, period: str = "1y") -> pd.DataFrame:
-        """Yahoo Finance에서 주식 데이터 가져오기"""
+    def fetch_data(self, period: str = "1y",
+                   shared_prices: Optional[Tuple[pd.DataFrame, Dict[str, str]]] = None) -> pd.DataFrame:
+        """
+        주식 데이터 가져오기 (로컬 히스토리 저장소 우선, 누락 구간만 Yahoo Finance 일괄 다운로드)
+        
+        Args:
+            period: 데이터 기간
+            shared_prices: 배치 요청이 기간별로 한 번 받아둔 (가격 행렬, 실패 목록).
+                           주어지면 다운로드 없이 self.tickers 열만 잘라서 사용
+        """
         print(f"데이터 가져오는 중: {', '.join(self.tickers)}")
         
-        data = {}
+        with self.timer.phase('fetch_data'):
+            if shared_prices is None:
+                data, failures = price_history_store.get_history(self.tickers, period=period)
+            else:
+                data, failures = slice_prices(shared_prices, self.tickers)
+        self.fetch_failures = failures
+        
         for ticker in self.tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period=period)
-                if not hist.empty:
-                    data[ticker] = hist['Close']
-                    print(f"[OK] {ticker}: {len(hist)}일 데이터")
-                else:
-                    print(f"[WARN] {ticker}: 데이터 없음")
-            except Exception as e:
-                print(f"[ERROR] {ticker} 데이터 가져오기 실패: {str(e)}")
+            if ticker in data.columns:
+                print(f"[OK] {ticker}: {int(data[ticker].count())}일 데이터")
+            else:
+                print(f"[WARN] {ticker}: 데이터 없음 ({failures.get(ticker, 'no data')})")
         
-        if not data:
+        if data.empty:
             raise ValueError("데이터를 가져올 수 없습니다.")
         
-        self.data = pd.DataFrame(data)
+        self.data = data
+        self.period = period
         return self.data
     
     def calculate_returns(self) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
-        """일일 수익률 계산 및 연율화"""
+        """
+        일일 수익률 계산 및 연율화
+        
+        표본 공분산은 fetch_data() 기간별 rolling statistics에서 증분 갱신으로 가져오고
+        (전날 대비 들어온/나간 행만 반영), 다른 추정기는 covariance 모듈 캐시를 사용합니다.
+        """
         if self.data is None:
             raise ValueError("먼저 fetch_data()를 호출하세요.")
         
-        # 일일 수익률 계산
-        returns = self.data.pct_change().dropna()
-        self.returns_data = returns  # Store for optimization
-        
-        # 연율화된 기대 수익률
-        self.expected_returns = returns.mean().values * 252
-        
-        # 연율화된 공분산 행렬
-        self.covariance_matrix = returns.cov().values * 252
+        with self.timer.phase('calculate_returns'):
+            # 일일 수익률 계산
+            returns = daily_returns(self.data)
+            self.returns_data = returns  # Store for optimization
+            
+            if self.covariance_estimator == 'sample' and self.period is not None and ROLLING_STATS_ENABLED:
+                daily_mean, daily_covariance, mode = rolling_stats_store.get(returns, self.period)
+                self.expected_returns = daily_mean * 252
+                self.covariance_matrix = daily_covariance * 252
+                self.covariance_info = {'estimator': 'sample', 'rolling': mode}
+            else:
+                # 연율화된 기대 수익률
+                self.expected_returns = returns.mean().values * 252
+                
+                # 연율화된 공분산 행렬 (추정기별 캐시)
+                self.covariance_matrix, self.covariance_info = estimate_covariance(returns, self.covariance_estimator)
         
         print(f"기대 수익률 계산 완료: {len(self.expected_returns)}개 자산")
-        print(f"공분산 행렬 크기: {self.covariance_matrix.shape}")
+        print(f"공분산 행렬 크기: {self.covariance_matrix.shape} (estimator: {self.covariance_estimator})")
+        self.timer.annotate(covariance_estimator=self.covariance_estimator)
         
         return self.expected_returns, self.covariance_matrix, returns
     
-    def quantum_portfolio_optimization_qaoa(self, reps: int = None, precision: int = 4) -> Dict:
+    def quantum_portfolio_optimization_qaoa(self, reps: int = None, precision: int = 4,
+                                            backend: Optional[str] = None, starts: Optional[int] = None) -> Dict:
         """
         REAL Quantum Portfolio Optimization using Qiskit QAOA with timeout protection
         
@@ -149,10 +741,26 @@ class PortfolioOptimizer:
         Args:
             reps: Number of QAOA layers (default: 1, 개발/테스트용)
             precision: Number of bits per asset for weight encoding (default: 4)
+            backend: 'qiskit' (circuit simulation), 'numpy' (대각 비용 해밀토니안 직접 시뮬레이션),
+                     'anneal' (고전 simulated annealing), 'exact' (전수 열거) 또는
+                     'auto' (EXACT_SOLVER_MAX_QUBITS 이하면 exact, 초과하면 qiskit), 기본값: QAOA_BACKEND
+            starts: QAOA multi-start 개수 (기본값: QAOA_STARTS, solver pool 크기로 제한).
+                    서로 다른 seed/초기 각도의 COBYLA를 워커에서 동시에 실행하고
+                    (QUANTUM_TIMEOUT_SECONDS 공유) 에너지가 가장 낮은 결과를 사용합니다.
+        
+        EXACT_SOLVER_MAX_QUBITS 이하 문제에서는 QAOA/annealing 결과에 정확해 대비
+        approximation_ratio, exact_energy, energy_gap 을 함께 반환합니다.
+        
+        QAOA가 타임아웃/실패하면 같은 QUBO를 simulated annealing으로 풀고
+        (quantum_status='anneal-fallback'), 그마저 실패하면 proxy 가중치를 사용합니다.
         
         Returns:
             Quantum-optimized portfolio with quantum-specific metrics
         """
+        backend = backend or QAOA_BACKEND
+        if backend not in QUBO_BACKENDS:
+            raise ValueError(f"Unsupported QUBO backend: {backend} (expected one of {QUBO_BACKENDS})")
+        
         if self.expected_returns is None or self.covariance_matrix is None:
             self.calculate_returns()
         
@@ -163,222 +771,462 @@ class PortfolioOptimizer:
         mean_returns = self.expected_returns
         cov_matrix = self.covariance_matrix
         
+        num_qubits = n_assets * precision
+        if backend == 'auto':
+            # 작은 문제 (3~5 종목)는 정확해 열거가 QAOA 1회보다 빠름
+            backend = 'exact' if num_qubits <= EXACT_SOLVER_MAX_QUBITS else 'qiskit'
+        self.timer.annotate(qubits=num_qubits, backend=backend, reps=reps or 1)
+        
+        if backend == 'numpy' and num_qubits > NUMPY_QAOA_MAX_QUBITS:
+            raise ValueError(
+                f"numpy QAOA backend는 최대 {NUMPY_QAOA_MAX_QUBITS} 큐비트까지 지원합니다 "
+                f"(요청: {n_assets} assets x {precision} bits = {num_qubits})"
+            )
+        if backend == 'exact' and num_qubits > EXACT_SOLVER_MAX_QUBITS:
+            raise ValueError(
+                f"exact backend는 최대 {EXACT_SOLVER_MAX_QUBITS} 큐비트까지 지원합니다 "
+                f"(요청: {n_assets} assets x {precision} bits = {num_qubits})"
+            )
+        
         # Fast Mode 설정 (상업적 가치를 위해 빠른 실행 우선)
         if reps is None:
             reps = 1  # Always use reps=1 for commercial speed (10-15 seconds)
         
         maxiter = DEFAULT_QAOA_MAXITER  # Always use fast mode
         
+        # Warm start: angles optimized for the same size/depth/risk bucket converge in fewer iterations
+        angle_key = _angle_cache_key(backend, num_qubits, reps, self.risk_factor)
+        warm_point = _qaoa_angle_cache.peek(angle_key) if backend in _QAOA_JOBS else None
+        rhobeg = 1.0
+        if warm_point is not None:
+            maxiter = min(maxiter, QAOA_WARM_MAXITER)
+            rhobeg = QAOA_WARM_RHOBEG
+        
         print(f"\n{'='*60}")
         print(f"[QUANTUM] QAOA PORTFOLIO OPTIMIZATION")
         print(f"{'='*60}")
         print(f" Number of assets: {n_assets}")
         print(f" Mode: {'[FAST MODE]' if self.fast_mode else '[PRECISE MODE]'}")
+        print(f" QAOA backend: {backend}")
         print(f" QAOA reps (layers): {reps}")
-        print(f" Max iterations: {maxiter}")
+        print(f" Max iterations: {maxiter}{' (warm start)' if warm_point is not None else ''}")
         print(f" Weight precision (bits per asset): {precision}")
         print(f" Risk factor: {self.risk_factor}")
-        print(f" Total qubits: {n_assets * precision}")
+        print(f" Total qubits: {num_qubits}")
         print(f" Timeout: {QUANTUM_TIMEOUT_SECONDS} seconds")
         print(f"{'='*60}\n")
         
+        linear_coeffs = quadratic_coeffs = None
         try:
             # Build QUBO formulation using helper method
             lambda_param = 1 - self.risk_factor
-            qp, linear_coeffs, quadratic_coeffs = self._build_qubo_formulation(
-                n_assets, precision, mean_returns, cov_matrix, lambda_param
-            )
+            with self.timer.phase('build_qubo'):
+                qp, linear_coeffs, quadratic_coeffs = self._build_qubo_formulation(
+                    n_assets, precision, mean_returns, cov_matrix, lambda_param
+                )
             
             print(f" - QUBO formulation complete")
-            print(f" - Linear terms: {len(linear_coeffs)}")
-            print(f" - Quadratic terms: {len(quadratic_coeffs)}")
+            print(f" - Linear terms: {np.count_nonzero(linear_coeffs)}")
+            print(f" - Quadratic terms: {np.count_nonzero(quadratic_coeffs)}")
             print(f" - Constraints: {qp.get_num_linear_constraints()}")
             
-            # Solve using QAOA with timeout protection
-            print(f" - Initializing QAOA solver...")
-            optimizer = COBYLA(maxiter=maxiter)
-            sampler = StatevectorSampler()
-            qaoa = QAOA(sampler=sampler, optimizer=optimizer, reps=reps)
-            quantum_solver = MinimumEigenOptimizer(qaoa)
-            
-            print(f" - Running QAOA optimization (timeout: {QUANTUM_TIMEOUT_SECONDS}s)...")
-            print(f" - Quantum noise applied to encourage different solution space")
-            
-            # Execute with timeout using threading
-            result_container = {'result': None, 'exception': None}
-            
-            def solve_with_timeout():
-                try:
-                    result_container['result'] = quantum_solver.solve(qp)
-                except Exception as e:
-                    result_container['exception'] = e
-            
-            thread = threading.Thread(target=solve_with_timeout)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=QUANTUM_TIMEOUT_SECONDS)
+            if backend == 'exact':
+                # In-process: 2^24 states take tens of milliseconds, less than a worker round trip
+                started = time.perf_counter()
+                result = _solve_exact_qubo(linear_coeffs, quadratic_coeffs, n_assets, precision)
+                solve_time = time.perf_counter() - started
+                self.timer.add('solve', solve_time)
+                print(f" - Exact enumeration of {result.metadata['states']} states: {solve_time:.3f}s")
+                payload = self._build_qubo_result(
+                    result, n_assets, precision, reps, backend,
+                    solver='exact', quantum_status='exact', quantum_verified=False,
+                    execution={'solve_seconds': round(solve_time, 4), 'total_seconds': round(solve_time, 4)}
+                )
+                payload.update({'exact_energy': result.fval, 'energy_gap': 0.0, 'approximation_ratio': 1.0})
+                return payload
             
-            if thread.is_alive():
-                print(f"[ERROR] Quantum optimization timed out after {QUANTUM_TIMEOUT_SECONDS} seconds")
-                raise TimeoutError(f"Quantum optimization exceeded {QUANTUM_TIMEOUT_SECONDS} second timeout")
+            if backend == 'anneal':
+                print(f" - Running simulated annealing in solver pool (timeout: {ANNEAL_TIMEOUT_SECONDS}s)...")
+                with self.timer.phase('solve'):
+                    job = get_solver_pool().run(
+                        _solve_anneal_job, linear_coeffs, quadratic_coeffs, n_assets, precision,
+                        timeout=ANNEAL_TIMEOUT_SECONDS, queue_timeout=QUANTUM_QUEUE_TIMEOUT_SECONDS
+                    )
+                self.timer.annotate(solver_queue_wait_seconds=round(job.queue_wait, 4))
+                print(f" - Queue wait: {job.queue_wait:.2f}s, solve: {job.solve_time:.2f}s (worker {job.worker_pid})")
+                return self._attach_exact_check(self._build_qubo_result(
+                    job.value, n_assets, precision, reps, backend,
+                    solver='anneal', quantum_status='anneal', quantum_verified=False,
+                    execution=job.timings()
+                ), linear_coeffs, quadratic_coeffs, n_assets, precision)
             
-            if result_container['exception']:
-                raise result_container['exception']
+            # Solve using QAOA in isolated worker processes (killed on timeout)
+            starts = max(1, min(int(starts or QAOA_STARTS), get_solver_pool().size))
+            start_points = _qaoa_start_points(reps, starts, warm_point)
+            print(f" - Running {starts} QAOA start(s) in solver pool (shared timeout: {QUANTUM_TIMEOUT_SECONDS}s)...")
+            print(f" - Quantum noise applied to encourage different solution space")
             
-            if result_container['result'] is None:
-                raise RuntimeError("Quantum optimization returned no result")
+            started = time.perf_counter()
+            job, best_start, start_runs = self._run_qaoa_starts(
+                _QAOA_JOBS[backend], (linear_coeffs, quadratic_coeffs, n_assets, precision, reps, maxiter),
+                start_points, rhobeg
+            )
+            wall_time = time.perf_counter() - started
+            self.timer.add('solve', wall_time)
             
-            result = result_container['result']
+            result = job.value
+            print(f" - Best start: {best_start} (queue wait: {job.queue_wait:.2f}s, solve: {job.solve_time:.2f}s, "
+                  f"worker {job.worker_pid}), wall time: {wall_time:.2f}s")
             print(f" - QAOA optimization completed!")
             print(f" - Optimal value (energy): {result.fval:.6f}")
             
-            # Decode solution using helper method
-            weights = self._decode_quantum_solution(result, n_assets, precision)
-            
-            # weights 검증
-            if weights is None or len(weights) != n_assets:
-                raise RuntimeError("QAOA 솔루션 디코딩 실패")
-            
-            # weight_sum 검증
-            weight_sum = np.sum(weights)
-            if not (0.99 <= weight_sum <= 1.01):
-                print(f"[WARNING] 가중치 합계 = {weight_sum:.4f} (예상: 1.0), 정규화 중...")
-            if weight_sum > 0:
-                weights = weights / weight_sum
-            else:
-                weights = np.ones(n_assets) / n_assets
-            
-            # 음수 가중치 처리
-            if np.any(weights < -1e-6):
-                negative_weights = weights[weights < -1e-6]
-                print(f"[WARNING] 음수 가중치 발견: {negative_weights}")
-                weights = np.maximum(weights, 0)  # 0으로 클리핑
-            if np.sum(weights) > 0:
-                weights = weights / np.sum(weights)  # 재정규화
-            
-            # Calculate metrics using helper method
-            metrics = self._calculate_quantum_metrics(weights, mean_returns, cov_matrix, result)
-            
-            # Filter out near-zero weights
-            selected_tickers = [self.tickers[i] for i in range(n_assets) if weights[i] > WEIGHT_THRESHOLD]
-            selected_weights = [float(weights[i]) for i in range(n_assets) if weights[i] > WEIGHT_THRESHOLD]
-            
-            print(f"\n{'='*60}")
-            print(f"[SUCCESS] QUANTUM OPTIMIZATION COMPLETED!")
-            print(f"{'='*60}")
-            print(f" Selected assets: {selected_tickers}")
-            print(f" Weights: {[f'{w:.2%}' for w in selected_weights]}")
-            print(f" Expected return: {metrics['portfolio_return']:.2%}")
-            print(f" Risk (std): {metrics['portfolio_std']:.2%}")
-            print(f" Sharpe ratio: {metrics['sharpe_ratio']:.4f}")
-            print(f" Quantum energy: {metrics['quantum_energy']:.6f}")
-            print(f" Quantum probability: {metrics['quantum_probability']:.4f}")
-            print(f" QAOA reps: {reps}")
-            print(f"{'='*60}\n")
+            if result.metadata.get('optimal_point'):
+                _qaoa_angle_cache.set(angle_key, result.metadata['optimal_point'])
+            self.timer.annotate(
+                cost_function_evals=result.metadata.get('cost_function_evals'),
+                starts=starts,
+                solver_queue_wait_seconds=round(job.queue_wait, 4)
+            )
             
-            return {
-                'selected_tickers': selected_tickers,
-                'weights': selected_weights,
-                'expected_return': float(metrics['portfolio_return']),
-                'risk': float(metrics['portfolio_std']),
-                'sharpe_ratio': float(metrics['sharpe_ratio']),
-                'method': 'quantum',
-                'reps': reps,
-                'quantum_energy': metrics['quantum_energy'],
-                'quantum_probability': metrics['quantum_probability'],
-                'quantum_verified': True,
-                'optimization_value': metrics['quantum_energy']
+            payload = self._build_qubo_result(
+                result, n_assets, precision, reps, backend,
+                solver=f'qaoa-{backend}', quantum_status=None, quantum_verified=True,
+                execution={**job.timings(), 'wall_seconds': round(wall_time, 4)}
+            )
+            payload['qaoa'] = {
+                'warm_start': warm_point is not None,
+                'maxiter': maxiter,
+                'cost_function_evals': result.metadata.get('cost_function_evals'),
+                'ansatz_cached': result.metadata.get('ansatz_cached'),
+                'starts': starts,
+                'best_start': best_start,
+                'start_runs': start_runs
             }
+            return self._attach_exact_check(payload, linear_coeffs, quadratic_coeffs, n_assets, precision)
         
         except TimeoutError as e:
             print(f"[ERROR] {str(e)}")
-            print("[FALLBACK] Falling back to quantum-inspired proxy weights...")
-            return self._build_quantum_proxy_result()
         except Exception as e:
             print(f"[ERROR] Quantum optimization failed: {str(e)}")
             import traceback
             traceback.print_exc()
-            # Fallback to synthetic quantum-inspired result
-            print("[FALLBACK] Falling back to quantum-inspired proxy weights...")
-            return self._build_quantum_proxy_result()
+        
+        # Fallback 1: simulated annealing on the same QUBO (in-process, well under a second)
+        if linear_coeffs is not None and backend != 'anneal':
+            print("[FALLBACK] Solving the QUBO with simulated annealing...")
+            try:
+                with self.timer.phase('fallback_solve'):
+                    result = _solve_anneal_job(linear_coeffs, quadratic_coeffs, n_assets, precision)
+                return self._attach_exact_check(self._build_qubo_result(
+                    result, n_assets, precision, reps, backend,
+                    solver='anneal', quantum_status='anneal-fallback', quantum_verified=False
+                ), linear_coeffs, quadratic_coeffs, n_assets, precision)
+            except Exception as e:
+                print(f"[ERROR] Simulated annealing fallback failed: {str(e)}")
+        
+        # Fallback 2: synthetic quantum-inspired result
+        print("[FALLBACK] Falling back to quantum-inspired proxy weights...")
+        return self._build_quantum_proxy_result()
+    
+    def _run_qaoa_starts(self, job_func, job_args: Tuple, start_points: List[np.ndarray], rhobeg: float):
+        """
+        Run one QAOA job per start point concurrently under a single QUANTUM_TIMEOUT_SECONDS deadline
+
+        Returns (lowest-energy SolverJobResult, its start index, per-start telemetry). Starts that time out
+        or fail are reported in the telemetry; the error is raised only if every start failed.
+        """
+        pool = get_solver_pool()
+        deadline = time.perf_counter() + QUANTUM_TIMEOUT_SECONDS
+        
+        def run_start(index: int):
+            return pool.run(
+                job_func, *job_args,
+                timeout=QUANTUM_TIMEOUT_SECONDS, queue_timeout=QUANTUM_QUEUE_TIMEOUT_SECONDS, deadline=deadline,
+                initial_point=[float(v) for v in start_points[index]], seed=QAOA_START_SEED + index, rhobeg=rhobeg
+            )
+        
+        with ThreadPoolExecutor(max_workers=len(start_points), thread_name_prefix='qaoa-start') as executor:
+            futures = [executor.submit(run_start, index) for index in range(len(start_points))]
+        
+        best_job, best_start, start_runs, last_error = None, None, [], None
+        for index, future in enumerate(futures):
+            run = {
+                'start': index,
+                'seed': QAOA_START_SEED + index,
+                'initial_point': [round(float(v), 6) for v in start_points[index]]
+            }
+            try:
+                job = future.result()
+            except Exception as e:
+                last_error = e
+                run.update(status='timeout' if isinstance(e, TimeoutError) else 'error', error=str(e))
+                print(f" - Start {index} failed: {e}")
+            else:
+                run.update(
+                    status='ok',
+                    energy=float(job.value.fval),
+                    cost_function_evals=job.value.metadata.get('cost_function_evals'),
+                    **job.timings()
+                )
+                if best_job is None or job.value.fval < best_job.value.fval:
+                    best_job, best_start = job, index
+            start_runs.append(run)
+        
+        if best_job is None:
+            raise last_error
+        return best_job, best_start, start_runs
+    
+    def _attach_exact_check(self, payload: Dict, linear: np.ndarray, quadratic: np.ndarray,
+                            n_assets: int, precision: int) -> Dict:
+        """
+        Add exact_energy / approximation_ratio / energy_gap for small problems
+
+        approximation_ratio = (E_max - E) / (E_max - E_min): 1.0 is the exact optimum,
+        0.0 the worst bitstring.
+        """
+        if n_assets * precision > EXACT_SOLVER_MAX_QUBITS:
+            return payload
+        try:
+            with self.timer.phase('exact_check'):
+                exact = _solve_exact_qubo(linear, quadratic, n_assets, precision)
+        except Exception as e:
+            print(f"[WARNING] Exact ground-truth check failed: {str(e)}")
+            return payload
+        
+        energy = float(payload['quantum_energy'])
+        spread = exact.metadata['max_energy'] - exact.fval
+        payload['exact_energy'] = exact.fval
+        payload['energy_gap'] = energy - exact.fval
+        payload['approximation_ratio'] = float((exact.metadata['max_energy'] - energy) / spread) if spread > 0 else 1.0
+        print(f" - Approximation ratio vs exact optimum: {payload['approximation_ratio']:.6f} "
+              f"(gap {payload['energy_gap']:.6f})")
+        return payload
     
-    def optimize_quantum(self, reps: int = 1, precision: int = 4) -> Dict:
+    def _build_qubo_result(self, result, n_assets: int, precision: int, reps: int, backend: str, solver: str,
+                           quantum_status: Optional[str], quantum_verified: bool,
+                           execution: Optional[Dict] = None) -> Dict:
+        """Decode a QUBO solution (QAOA or annealing) into the quantum result payload"""
+        mean_returns = self.expected_returns
+        cov_matrix = self.covariance_matrix
+        
+        # Decode solution using helper method
+        with self.timer.phase('decode'):
+            weights = self._decode_quantum_solution(result, n_assets, precision)
+        
+        # weights 검증
+        if weights is None or len(weights) != n_assets:
+            raise RuntimeError("QAOA 솔루션 디코딩 실패")
+        
+        # weight_sum 검증
+        weight_sum = np.sum(weights)
+        if not (0.99 <= weight_sum <= 1.01):
+            print(f"[WARNING] 가중치 합계 = {weight_sum:.4f} (예상: 1.0), 정규화 중...")
+        if weight_sum > 0:
+            weights = weights / weight_sum
+        else:
+            weights = np.ones(n_assets) / n_assets
+        
+        # 음수 가중치 처리
+        if np.any(weights < -1e-6):
+            negative_weights = weights[weights < -1e-6]
+            print(f"[WARNING] 음수 가중치 발견: {negative_weights}")
+            weights = np.maximum(weights, 0)  # 0으로 클리핑
+        if np.sum(weights) > 0:
+            weights = weights / np.sum(weights)  # 재정규화
+        
+        # Calculate metrics using helper method
+        with self.timer.phase('decode'):
+            metrics = self._calculate_quantum_metrics(weights, mean_returns, cov_matrix, result)
+        
+        # Filter out near-zero weights
+        selected_tickers = [self.tickers[i] for i in range(n_assets) if weights[i] > WEIGHT_THRESHOLD]
+        selected_weights = [float(weights[i]) for i in range(n_assets) if weights[i] > WEIGHT_THRESHOLD]
+        
+        print(f"\n{'='*60}")
+        print(f"[SUCCESS] QUANTUM OPTIMIZATION COMPLETED! (solver: {solver})")
+        print(f"{'='*60}")
+        print(f" Selected assets: {selected_tickers}")
+        print(f" Weights: {[f'{w:.2%}' for w in selected_weights]}")
+        print(f" Expected return: {metrics['portfolio_return']:.2%}")
+        print(f" Risk (std): {metrics['portfolio_std']:.2%}")
+        print(f" Sharpe ratio: {metrics['sharpe_ratio']:.4f}")
+        print(f" Quantum energy: {metrics['quantum_energy']:.6f}")
+        print(f" Quantum probability: {metrics['quantum_probability']:.4f}")
+        print(f" QAOA reps: {reps}")
+        print(f"{'='*60}\n")
+        
+        payload = {
+            'selected_tickers': selected_tickers,
+            'weights': selected_weights,
+            'expected_return': float(metrics['portfolio_return']),
+            'risk': float(metrics['portfolio_std']),
+            'sharpe_ratio': float(metrics['sharpe_ratio']),
+            'method': 'quantum',
+            'backend': backend,
+            'solver': solver,
+            'reps': reps,
+            'quantum_energy': metrics['quantum_energy'],
+            'quantum_probability': metrics['quantum_probability'],
+            'quantum_verified': quantum_verified,
+            'optimization_value': metrics['quantum_energy']
+        }
+        if quantum_status:
+            payload['quantum_status'] = quantum_status
+        if execution:
+            payload['execution'] = execution
+        return payload
+    
+    def classical_portfolio_optimization(self) -> Dict:
+        """
+        Classical long-only mean-variance optimization (accelerated projected gradient)
+        
+        Solves the same objective the QUBO encodes, without the binary discretization:
+            minimize  -lambda * mu^T w + (1 - lambda) * w^T Sigma w
+            s.t.      w >= 0, sum(w) = 1
+        with lambda = 1 - risk_factor. Each iteration is one matrix-vector product
+        plus a simplex projection, so hundreds of assets solve in milliseconds.
+        
+        Returns:
+            Portfolio dict with the same schema as quantum_portfolio_optimization_qaoa
+        """
+        if self.expected_returns is None or self.covariance_matrix is None:
+            self.calculate_returns()
+        
+        self._validate_returns_and_covariance()
+        
+        n_assets = len(self.tickers)
+        mean_returns = np.asarray(self.expected_returns, dtype=float)
+        cov_matrix = np.asarray(self.covariance_matrix, dtype=float)
+        lambda_param = 1 - self.risk_factor
+        
+        weights, iterations, converged = _solve_mean_variance(mean_returns, cov_matrix, lambda_param)
+        objective_value = -lambda_param * mean_returns @ weights + (1 - lambda_param) * weights @ cov_matrix @ weights
+        
+        portfolio_return = float(weights @ mean_returns)
+        portfolio_std = float(np.sqrt(max(weights @ cov_matrix @ weights, 0.0)))
+        sharpe_ratio = portfolio_return / portfolio_std if portfolio_std > 0 else 0.0
+        
+        selected_tickers = [self.tickers[i] for i in range(n_assets) if weights[i] > WEIGHT_THRESHOLD]
+        selected_weights = [float(weights[i]) for i in range(n_assets) if weights[i] > WEIGHT_THRESHOLD]
+        
+        print(f"[CLASSICAL] Mean-variance solved in {iterations} iterations (converged: {converged})")
+        
+        return {
+            'selected_tickers': selected_tickers,
+            'weights': selected_weights,
+            'expected_return': portfolio_return,
+            'risk': portfolio_std,
+            'sharpe_ratio': float(sharpe_ratio),
+            'method': 'classical',
+            'iterations': iterations,
+            'converged': converged,
+            'optimization_value': float(objective_value)
+        }
+    
+    def efficient_frontier(self, points: int = FRONTIER_DEFAULT_POINTS) -> Dict:
+        """
+        Long-only mean-variance efficient frontier in one pass over the fetched data
+        
+        Sweeps risk_factor from 1.0 (minimum variance) to 0.0 (maximum return) over
+        `points` values, so risk is ascending. The covariance eigen-decomposition is done
+        once and each point warm-starts from the previous point's weights (neighbouring
+        points differ little, so most converge in a few iterations).
+        
+        Returns:
+            Parallel arrays for charting (risk_factors, expected_returns, risks,
+            sharpe_ratios) plus the full weight vector per point in tickers order
+        """
+        if not 2 <= int(points) <= FRONTIER_MAX_POINTS:
+            raise ValueError(f"points는 2~{FRONTIER_MAX_POINTS} 사이여야 합니다. 현재 값: {points}")
+        
+        if self.expected_returns is None or self.covariance_matrix is None:
+            self.calculate_returns()
+        self._validate_returns_and_covariance()
+        
+        mean_returns = np.asarray(self.expected_returns, dtype=float)
+        cov_matrix = np.asarray(self.covariance_matrix, dtype=float)
+        risk_factors = np.linspace(1.0, 0.0, int(points))
+        
+        with self.timer.phase('frontier'):
+            max_eigenvalue = float(np.linalg.eigvalsh(cov_matrix)[-1])
+            weights = None
+            all_weights, iterations = [], []
+            for risk_factor in risk_factors:
+                weights, point_iterations, _ = _solve_mean_variance(
+                    mean_returns, cov_matrix, 1 - risk_factor,
+                    initial_weights=weights, max_eigenvalue=max_eigenvalue
+                )
+                all_weights.append(weights)
+                iterations.append(point_iterations)
+            
+            weight_matrix = np.vstack(all_weights)
+            returns = weight_matrix @ mean_returns
+            risks = np.sqrt(np.maximum(np.einsum('ki,ij,kj->k', weight_matrix, cov_matrix, weight_matrix), 0.0))
+            sharpe_ratios = np.divide(returns, risks, out=np.zeros_like(returns), where=risks > 0)
+        
+        self.timer.annotate(frontier_points=int(points), frontier_iterations=int(sum(iterations)))
+        print(f"[FRONTIER] {points} points solved in {sum(iterations)} total iterations")
+        
+        return {
+            'tickers': list(self.tickers),
+            'points': int(points),
+            'risk_factors': [float(v) for v in risk_factors],
+            'expected_returns': [float(v) for v in returns],
+            'risks': [float(v) for v in risks],
+            'sharpe_ratios': [float(v) for v in sharpe_ratios],
+            'weights': [[float(w) for w in row] for row in weight_matrix],
+            'max_sharpe_index': int(np.argmax(sharpe_ratios)),
+            'iterations': iterations,
+            'method': 'classical',
+            'covariance': {k: v for k, v in self.covariance_info.items() if k not in ('cached', 'rolling')}
+        }
+    
+    def optimize_quantum(self, reps: int = 1, precision: int = 4, backend: Optional[str] = None,
+                         starts: Optional[int] = None) -> Dict:
         """Wrapper for quantum optimization with timeout"""
-        return self.quantum_portfolio_optimization_qaoa(reps=reps, precision=precision)
+        return self.quantum_portfolio_optimization_qaoa(reps=reps, precision=precision, backend=backend, starts=starts)
     
     def _build_qubo_formulation(self, n_assets: int, precision: int, mean_returns: np.ndarray, 
-                                cov_matrix: np.ndarray, lambda_param: float) -> Tuple[QuadraticProgram, Dict, Dict]:
+                                cov_matrix: np.ndarray, lambda_param: float) -> Tuple['QuadraticProgram', np.ndarray, np.ndarray]:
         """
         Build QUBO formulation for quantum optimization
         
+        Variable x_{i}_{bit} is stored at index i * precision + bit. The objective is
+        assembled with Kronecker/outer products instead of per-variable loops:
+        - linear:    -lambda * (mu + noise) (x) bit_values - 2P * v
+        - quadratic: (1 - lambda) * cov (x) outer(bit_values, bit_values) + budget penalty
+        
         Returns:
-            Tuple of (QuadraticProgram, linear_coeffs, quadratic_coeffs)
+            Tuple of (QuadraticProgram, linear vector (n*p,), quadratic matrix (n*p, n*p))
         """
-        qp = QuadraticProgram()
-        
-        # Add binary variables
-        for i in range(n_assets):
-            for bit in range(precision):
-                qp.binary_var(f'x_{i}_{bit}')
+        # Weight contributed by each precision bit: 2^bit / (2^precision - 1)
+        bit_values = (2.0 ** np.arange(precision)) / (2 ** precision - 1)
+        # Expanded per-variable weight vector v (length n*p)
+        var_values = np.tile(bit_values, n_assets)
         
         # Linear terms (expected return)
-        np.random.seed(42)  # For reproducibility
-        quantum_noise = np.random.uniform(-QUANTUM_NOISE_RANGE, QUANTUM_NOISE_RANGE, n_assets)
-        
-        linear_coeffs = {}
-        for i in range(n_assets):
-            for bit in range(precision):
-                weight_value = (2 ** bit) / (2 ** precision - 1)
-                var_name = f'x_{i}_{bit}'
-                adjusted_return = mean_returns[i] + quantum_noise[i]
-                linear_coeffs[var_name] = -lambda_param * adjusted_return * weight_value
+        rng = np.random.RandomState(42)  # For reproducibility (same stream as np.random.seed(42))
+        quantum_noise = rng.uniform(-QUANTUM_NOISE_RANGE, QUANTUM_NOISE_RANGE, n_assets)
+        adjusted_returns = np.asarray(mean_returns, dtype=float) + quantum_noise
+        linear = -lambda_param * np.kron(adjusted_returns, bit_values)
         
         # Quadratic terms (covariance/risk)
-        quadratic_coeffs = {}
-        for i in range(n_assets):
-            for j in range(n_assets):
-                for bit_i in range(precision):
-                    for bit_j in range(precision):
-                        weight_i = (2 ** bit_i) / (2 ** precision - 1)
-                        weight_j = (2 ** bit_j) / (2 ** precision - 1)
-                        key = (f'x_{i}_{bit_i}', f'x_{j}_{bit_j}')
-                        quadratic_coeffs[key] = (1 - lambda_param) * cov_matrix[i, j] * weight_i * weight_j
-        
-        # Add penalty terms for constraint: sum(weights) = 1
-        penalty_weight = PENALTY_MULTIPLIER * n_assets
+        quadratic = (1 - lambda_param) * np.kron(np.asarray(cov_matrix, dtype=float),
+                                                 np.outer(bit_values, bit_values))
         
-        for i in range(n_assets):
-            for bit_i in range(precision):
-                weight_i = (2 ** bit_i) / (2 ** precision - 1)
-                var_i = f'x_{i}_{bit_i}'
-                
-                # Self-penalty
-                if (var_i, var_i) not in quadratic_coeffs:
-                    quadratic_coeffs[(var_i, var_i)] = penalty_weight * weight_i * weight_i
-                else:
-                    quadratic_coeffs[(var_i, var_i)] += penalty_weight * weight_i * weight_i
-                
-                # Cross-penalty
-                for j in range(n_assets):
-                    if i != j:
-                        for bit_j in range(precision):
-                            weight_j = (2 ** bit_j) / (2 ** precision - 1)
-                            var_j = f'x_{j}_{bit_j}'
-                            key = (var_i, var_j) if var_i < var_j else (var_j, var_i)
-                            if key not in quadratic_coeffs:
-                                quadratic_coeffs[key] = 2 * penalty_weight * weight_i * weight_j
-                            else:
-                                quadratic_coeffs[key] += 2 * penalty_weight * weight_i * weight_j
-                
-                # Linear penalty
-                if var_i not in linear_coeffs:
-                    linear_coeffs[var_i] = -2 * penalty_weight * weight_i
-                else:
-                    linear_coeffs[var_i] += -2 * penalty_weight * weight_i
+        # Penalty terms for constraint: sum(weights) = 1
+        penalty_weight = PENALTY_MULTIPLIER * n_assets
+        budget = np.outer(var_values, var_values)
+        # Cross-asset pairs carry 2P * v_k * v_l in each triangle, bits of the same
+        # asset only get the diagonal self-penalty P * v_k^2
+        same_asset = np.kron(np.eye(n_assets), np.ones((precision, precision)))
+        quadratic += 2 * penalty_weight * budget * (1 - same_asset)
+        quadratic[np.diag_indices_from(quadratic)] += penalty_weight * var_values ** 2
+        linear = linear - 2 * penalty_weight * var_values
         
-        qp.minimize(linear=linear_coeffs, quadratic=quadratic_coeffs)
+        qp = _make_quadratic_program(n_assets, precision, linear, quadratic)
         
-        return qp, linear_coeffs, quadratic_coeffs
+        return qp, linear, quadratic
     
     def _decode_quantum_solution(self, result, n_assets: int, precision: int) -> np.ndarray:
         """Decode binary quantum solution to continuous weights"""
@@ -440,6 +1288,71 @@ class PortfolioOptimizer:
             'sharpe_ratio': float(sharpe_ratio)
         }
     
+    def _timed_classical_optimization(self) -> Dict:
+        with self.timer.phase('classical_solve'):
+            return self.classical_portfolio_optimization()
+    
+    def _data_fingerprint(self) -> str:
+        """Hash of the daily returns matrix (or of mu/Sigma when they were set directly)"""
+        digest = hashlib.blake2b(digest_size=16)
+        if self.returns_data is not None:
+            digest.update(repr(list(self.returns_data.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(self.returns_data, index=True).values.tobytes())
+        else:
+            digest.update(np.ascontiguousarray(self.expected_returns, dtype=float).tobytes())
+            digest.update(np.ascontiguousarray(self.covariance_matrix, dtype=float).tobytes())
+        return digest.hexdigest()
+    
+    def _solve_cached(self, method: str, **kwargs) -> Dict:
+        """
+        classical / quantum solve shared through the process-wide result cache
+        
+        Key: (method, tickers, risk_factor, normalized solver params, covariance estimator,
+        returns fingerprint).
+        The QUBO noise is seeded, so identical inputs give identical portfolios; concurrent
+        identical requests share one solve. Transient fallbacks (UNCACHED_QUANTUM_STATUSES)
+        are returned but not kept, so the next request retries the solver.
+        The cache keeps results without per-call telemetry: the request that solved gets its
+        own execution timings, cache hits get execution = {'cached': True, 'lookup_seconds'}.
+        """
+        if self.expected_returns is None or self.covariance_matrix is None:
+            self.calculate_returns()
+        
+        if method == 'classical':
+            params = ()
+            solve = self._timed_classical_optimization
+        else:
+            # null/missing -> default (JSON "reps": null must not reach int())
+            reps = int(kwargs.get('reps') or 1)  # 기본값: 1 (개발/테스트), 프로덕션: 2
+            precision = int(kwargs.get('precision') or 4)
+            backend = kwargs.get('backend') or QAOA_BACKEND
+            starts = int(kwargs.get('starts') or QAOA_STARTS)
+            params = (reps, precision, backend, starts)
+            solve = partial(
+                self.quantum_portfolio_optimization_qaoa, reps=reps, precision=precision, backend=backend, starts=starts
+            )
+        key = (method, tuple(self.tickers), round(float(self.risk_factor), 6), params,
+               self.covariance_estimator, self._data_fingerprint())
+        
+        solved = []
+        def load():
+            result = solve()
+            result['covariance'] = {k: v for k, v in self.covariance_info.items() if k not in ('cached', 'rolling')}
+            solved.append(result)
+            return _without_telemetry(result)
+        
+        started = time.perf_counter()
+        cached = _result_cache.get(key, load, cacheable=_is_cacheable_result)
+        self.timer.annotate(result_cache='miss' if solved else 'hit')
+        if solved:
+            return solved[0]
+        
+        # Cache hit (or a concurrent identical request's solve): no timings of our own
+        print(f"[CACHE] Reusing {method} result for {', '.join(self.tickers)} (risk {self.risk_factor})")
+        result = copy.deepcopy(cached)
+        result['execution'] = {'cached': True, 'lookup_seconds': round(time.perf_counter() - started, 4)}
+        return result
+    
     def optimize_with_weights(self, method: str = 'quantum', **kwargs) -> Dict:
         """
         초기 가중치를 사용한 포트폴리오 최적화
@@ -462,13 +1375,10 @@ class PortfolioOptimizer:
         
         original_metrics = self.calculate_portfolio_metrics(self.initial_weights)
         
-        if method != 'quantum':
-            raise ValueError("Only 'quantum' optimization is supported.")
-        
-        reps = kwargs.get('reps', 1)  # 기본값: 1 (개발/테스트), 프로덕션: 2
-        precision = kwargs.get('precision', 4)
+        if method not in ('quantum', 'classical'):
+            raise ValueError(f"Unsupported optimization method: {method}")
         
-        optimized_result = self.quantum_portfolio_optimization_qaoa(reps=reps, precision=precision)
+        optimized_result = self._solve_cached(method, **kwargs)
         
         # 최적화 결과를 전체 벡터로 매핑 (optimized_result는 selected만 포함)
         n = len(self.tickers)
@@ -530,7 +1440,8 @@ class PortfolioOptimizer:
         
         # Detect if quantum result collapsed back to original portfolio
         weights_delta = sum(abs(optimized_weights[i] - self.initial_weights[i]) for i in range(n))
-        if method == 'quantum' and (not quantum_verified or weights_delta < 1e-3):
+        quantum_status = optimized_result.get('quantum_status', 'hardware')
+        if method == 'quantum' and (quantum_status == 'synthetic-enhancement' or weights_delta < 1e-3):
             synthetic_weights = self._generate_quantum_proxy_weights()
             optimized_weights = synthetic_weights
             optimized_metrics = self.calculate_portfolio_metrics(optimized_weights)
@@ -538,6 +1449,7 @@ class PortfolioOptimizer:
             optimized_result.setdefault('quantum_probability', 0.0)
             optimized_result.setdefault('quantum_energy', optimized_metrics['expected_return'])
             optimized_result['quantum_status'] = 'synthetic-enhancement'
+            optimized_result['solver'] = 'proxy'
 
         result = {
             'original': {
@@ -565,12 +1477,25 @@ class PortfolioOptimizer:
         # Add quantum-specific metrics if quantum method
         if method == 'quantum':
             quantum_status = optimized_result.get('quantum_status', 'hardware')
+            if quantum_verified:
+                note = "Quantum hardware result verified."
+            elif quantum_status == 'anneal':
+                note = "QUBO solved with classical simulated annealing."
+            elif quantum_status == 'exact':
+                note = "Small QUBO solved exactly by classical enumeration."
+            elif quantum_status == 'anneal-fallback':
+                note = "QAOA unavailable or timed out. QUBO solved with simulated annealing instead."
+            else:
+                note = "Quantum solver fallback detected. Applied quantum-inspired enhancement."
             result['quantum'] = {
                 'quantum_energy': optimized_result.get('quantum_energy', 0.0),
                 'quantum_probability': optimized_result.get('quantum_probability', 0.0),
                 'reps': optimized_result.get('reps', 1),
+                'backend': optimized_result.get('backend'),
+                'solver': optimized_result.get('solver', 'proxy'),
+                'approximation_ratio': optimized_result.get('approximation_ratio'),
                 'status': quantum_status,
-                'note': "Quantum hardware result verified." if quantum_verified else "Quantum solver fallback detected. Applied quantum-inspired enhancement."
+                'note': note
             }
         
         return result
@@ -667,6 +1592,7 @@ class PortfolioOptimizer:
             'risk': float(metrics['risk']),
             'sharpe_ratio': float(metrics['sharpe_ratio']),
             'method': 'quantum',
+            'solver': 'proxy',
             'reps': 0,
             'quantum_energy': float(metrics['expected_return']),
             'quantum_probability': 0.0,
@@ -702,6 +1628,7 @@ class PortfolioOptimizer:
             'risk': default_risk,
             'sharpe_ratio': default_sharpe,
             'method': 'quantum',
+            'solver': 'proxy',
             'reps': 0,
             'quantum_energy': default_return,
             'quantum_probability': 0.0,
@@ -713,40 +1640,152 @@ class PortfolioOptimizer:
     def optimize(self, method: str = 'quantum', **kwargs) -> Dict:
         """
         Args:
-            method: 'quantum' (양자 최적화 전용)
-            **kwargs: 추가 옵션 (reps, precision 등)
+            method: 'quantum' (QAOA) 또는 'classical' (mean-variance)
+            **kwargs: 추가 옵션 (reps, precision, backend, starts 등)
         
         Returns:
             최적화된 포트폴리오 딕셔너리
         """
-        if method != 'quantum':
-            raise ValueError(f"Only 'quantum' optimization is supported. Received: {method}")
-        
-        reps = kwargs.get('reps', 1)  # 기본값: 1 (개발/테스트), 프로덕션: 2
-        precision = kwargs.get('precision', 4)
-        return self.optimize_quantum(reps=reps, precision=precision)
+        if method not in ('quantum', 'classical'):
+            raise ValueError(f"Unsupported optimization method: {method}")
+        return self._solve_cached(method, **kwargs)
+
+
+def slice_prices(shared_prices: Tuple[pd.DataFrame, Dict[str, str]],
+                 tickers: List[str]) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Sub-frame of a shared price matrix, identical to fetching `tickers` on their own
+    
+    price_history_store.get_history() outer-joins the per-ticker histories, so the
+    union matrix restricted to `tickers` only differs by rows none of them traded on.
+    """
+    prices, failures = shared_prices
+    tickers = list(dict.fromkeys(tickers))
+    columns = [t for t in tickers if t in prices.columns]
+    data = prices[columns].dropna(how='all') if columns else pd.DataFrame()
+    return data, {t: failures.get(t, 'no data') for t in tickers if t not in columns}
+
+
+def fetch_batch_prices(portfolios: List[Dict], timer: Optional[PhaseTimer] = None) -> Dict[str, Tuple[pd.DataFrame, Dict[str, str]]]:
+    """
+    Fetch the union of every portfolio's tickers once per period
+    
+    Returns:
+        {period: (price matrix, {ticker: failure reason})}; periods whose fetch failed are
+        left out so their portfolios fall back to fetching on their own
+    """
+    timer = timer or PhaseTimer()
+    universes: Dict[str, List[str]] = {}
+    for portfolio in portfolios:
+        # Malformed entries are reported per portfolio by optimize_portfolio_batch()
+        if not isinstance(portfolio, dict):
+            continue
+        tickers = portfolio.get('tickers')
+        period = portfolio.get('period', '1y')
+        if isinstance(period, str) and isinstance(tickers, list) and all(isinstance(t, str) for t in tickers):
+            universes.setdefault(period, []).extend(tickers)
+    
+    shared = {}
+    for period, tickers in universes.items():
+        tickers = list(dict.fromkeys(tickers))
+        try:
+            with timer.phase('fetch_data'):
+                shared[period] = price_history_store.get_history(tickers, period=period)
+            print(f"[BATCH] {period}: {len(tickers)}개 종목 가격 한 번에 조회")
+        except Exception as e:
+            print(f"[WARN] Shared price fetch failed for {period}, portfolios fetch individually: {e}")
+    timer.annotate(unique_tickers=sum(len(set(t)) for t in universes.values()), price_fetches=len(shared))
+    return shared
+
+
+def optimize_portfolio_batch(portfolios: List[Dict], timer: Optional[PhaseTimer] = None,
+                             max_workers: int = BATCH_WORKERS) -> Iterator[Tuple[Dict, PhaseTimer]]:
+    """
+    Optimize several portfolios concurrently on one shared price fetch
+    
+    Prices for the union of tickers are fetched once per period and sliced per portfolio.
+    Portfolios run on a thread pool; their QAOA solves go to the shared solver process
+    pool, so at most SOLVER_POOL_SIZE of them solve at the same time.
+    
+    Args:
+        portfolios: [{"tickers", "risk_factor", "method", "period", "reps", "covariance_estimator"}, ...]
+        timer: 배치 전체 PhaseTimer (공유 가격 조회 구간 기록)
+        max_workers: 동시에 처리하는 포트폴리오 수
+    
+    Yields:
+        ({'success', 'portfolio_index', 'result' | 'error'}, portfolio PhaseTimer) in completion order
+    """
+    if not portfolios:
+        return
+    try:
+        shared = fetch_batch_prices(portfolios, timer)
+    except Exception as e:
+        print(f"[WARN] Shared price fetch failed, portfolios fetch individually: {e}")
+        shared = {}
+    
+    def run(index: int, portfolio: Dict) -> Tuple[Dict, PhaseTimer]:
+        portfolio_timer = PhaseTimer()
+        try:
+            if not isinstance(portfolio, dict):
+                raise ValueError("portfolio must be an object")
+            method = portfolio.get('method', 'classical')
+            period = portfolio.get('period', '1y')
+            if not isinstance(period, str):
+                raise ValueError(f"period must be a string, got {type(period).__name__}")
+            kwargs = {'reps': portfolio.get('reps', 1)} if method == 'quantum' else {}
+            result = optimize_portfolio(
+                tickers=portfolio.get('tickers', []),
+                risk_factor=portfolio.get('risk_factor', 0.5),
+                method=method,
+                period=period,
+                timer=portfolio_timer,
+                covariance_estimator=portfolio.get('covariance_estimator'),
+                shared_prices=shared.get(period),
+                **kwargs
+            )
+            return {'success': True, 'portfolio_index': index, 'result': result}, portfolio_timer
+        except Exception as e:
+            return {'success': False, 'portfolio_index': index, 'error': str(e)}, portfolio_timer
+    
+    workers = max(1, min(int(max_workers), len(portfolios)))
+    if timer is not None:
+        timer.annotate(batch_workers=workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-optimize') as executor:
+        futures = [executor.submit(run, index, portfolio) for index, portfolio in enumerate(portfolios)]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Consumer stopped early (e.g. streaming client disconnected): drop portfolios not started yet
+            for future in futures:
+                future.cancel()
 
 
 def optimize_portfolio(tickers: List[str], risk_factor: float = 0.5, 
-                       method: str = 'quantum', period: str = "1y", **kwargs) -> Dict:
+                       method: str = 'quantum', period: str = "1y", timer: Optional[PhaseTimer] = None,
+                       covariance_estimator: Optional[str] = None,
+                       shared_prices: Optional[Tuple[pd.DataFrame, Dict[str, str]]] = None, **kwargs) -> Dict:
     """
     포트폴리오 최적화 함수
     
     Args:
         tickers: 주식 티커 리스트
         risk_factor: 리스크 팩터 (0.0 ~ 1.0)
-        method: 'quantum'
+        method: 'quantum' 또는 'classical'
         period: 데이터 기간 ('1y', '6mo', '3mo' 등)
-        **kwargs: 추가 옵션 (quantum의 경우 reps, precision)
+        timer: 구간별 시간 측정용 PhaseTimer (선택사항)
+        covariance_estimator: 공분산 추정기 ('sample', 'ledoit-wolf', 'constant-correlation', 'ewma')
+        shared_prices: 배치 요청에서 미리 받아둔 (가격 행렬, 실패 목록) (선택사항)
+        **kwargs: 추가 옵션 (quantum의 경우 reps, precision, backend, starts)
     
     Returns:
         최적화된 포트폴리오 딕셔너리
     """
-    if method != 'quantum':
-        raise ValueError(f"Only 'quantum' optimization is supported. Received: {method}")
+    if method not in ('quantum', 'classical'):
+        raise ValueError(f"Unsupported optimization method: {method}")
     
-    optimizer = PortfolioOptimizer(tickers, risk_factor)
-    optimizer.fetch_data(period=period)
+    optimizer = PortfolioOptimizer(tickers, risk_factor, timer=timer, covariance_estimator=covariance_estimator)
+    optimizer.fetch_data(period=period, shared_prices=shared_prices)
     return optimizer.optimize(method=method, **kwargs)
 
 
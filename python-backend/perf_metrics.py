@@ -0,0 +1,118 @@
+"""
+Lightweight per-phase timing for optimization requests
+요청 단위 구간별 시간 측정 + 프로세스 전역 집계
+
+- PhaseTimer: time.perf_counter() 기반 구간 측정 (fetch_data, build_qubo, solve, ...)
+  + 카운터 (qubits, cost_function_evals, result_cache 등)
+- MetricsSink: endpoint/구간별 최근 N개 샘플 보관, count/mean/p50/p95/max 집계
+- PERF_METRICS_LOG=1 이면 요청마다 한 줄 로그 출력
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_WINDOW = int(os.getenv('METRICS_WINDOW', 500))  # Samples kept per (endpoint, phase)
+PERF_METRICS_LOG = os.getenv('PERF_METRICS_LOG', '0') == '1'
+
+
+class PhaseTimer:
+    """Durations of named phases (seconds) plus counters for one request"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float):
+        """Repeated phases accumulate (e.g. fetch_data called twice)"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, other: 'PhaseTimer'):
+        """Add another timer's phases (e.g. per-portfolio timers into the batch request timer)"""
+        for name, seconds in other.phases.items():
+            self.add(name, seconds)
+
+    def annotate(self, **counters):
+        self.counters.update(counters)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict:
+        return {
+            'total_seconds': round(self.elapsed(), 4),
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            **self.counters
+        }
+
+
+class MetricsSink:
+    """Thread-safe rolling window of phase durations and numeric counters per endpoint"""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self._series: Dict[str, Dict[str, deque]] = {}
+        self._requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, timer: PhaseTimer, status: Optional[int] = None):
+        timings = timer.as_dict()
+        samples = {'total_seconds': timings['total_seconds']}
+        samples.update(timer.phases)
+        samples.update({
+            name: value for name, value in timer.counters.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        })
+
+        with self._lock:
+            series = self._series.setdefault(endpoint, {})
+            for name, value in samples.items():
+                series.setdefault(name, deque(maxlen=self.window)).append(float(value))
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+
+        if PERF_METRICS_LOG:
+            logger.info(f"perf endpoint={endpoint} status={status} {timings}")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            series = {endpoint: {name: list(values) for name, values in names.items()}
+                      for endpoint, names in self._series.items()}
+            requests = dict(self._requests)
+
+        result = {}
+        for endpoint, names in series.items():
+            result[endpoint] = {'requests': requests.get(endpoint, 0), 'window': self.window, 'metrics': {}}
+            for name, values in names.items():
+                ordered = sorted(values)
+                result[endpoint]['metrics'][name] = {
+                    'count': len(ordered),
+                    'mean': round(sum(ordered) / len(ordered), 4),
+                    'p50': round(ordered[len(ordered) // 2], 4),
+                    'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                    'max': round(ordered[-1], 4)
+                }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._requests.clear()
+
+
+# Shared sink instance
+metrics_sink = MetricsSink()
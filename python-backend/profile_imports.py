@@ -0,0 +1,73 @@
+"""
+Import-time profile for the Flask service (cold start regression check)
+
+Imports the module in a fresh interpreter with `python -X importtime`, prints the
+slowest imports by cumulative time and fails when
+  - a module in warmup.LAZY_MODULES (qiskit, yfinance, ...) is imported eagerly, or
+  - the total import time exceeds --budget seconds.
+
+Usage:
+    python profile_imports.py                     # profile `import app`, top 25
+    python profile_imports.py --budget 1.5        # also fail above 1.5 s
+    python profile_imports.py --module optimizer --top 40
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from warmup import LAZY_MODULES
+
+
+def profile(module: str) -> List[Tuple[str, int, int, int]]:
+    """(name, self_us, cumulative_us, depth) per import line, in import order"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=Path(__file__).parent, capture_output=True, text=True, encoding='utf-8', errors='replace'
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--budget', type=float, default=None, help="Max total import seconds")
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    total = next((cumulative for name, _, cumulative, _ in rows if name == args.module), 0) / 1e6
+    print(f"import {args.module}: {total:.3f}s ({len(rows)} modules)")
+    print(f"  {'cumulative':>10} {'self':>8}  module")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"  {cumulative_us / 1e6:>9.3f}s {self_us / 1e6:>7.3f}s  {'  ' * depth}{name}")
+
+    failures = []
+    imported = {name for name, _, _, _ in rows}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    if eager:
+        failures.append(f"lazy modules imported eagerly: {', '.join(eager)}")
+    if args.budget is not None and total > args.budget:
+        failures.append(f"import time {total:.3f}s exceeds budget {args.budget:.3f}s")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    if failures:
+        sys.exit(1)
+    print("[OK] no lazy module imported eagerly" + (f", within {args.budget:.3f}s budget" if args.budget else ""))
+
+
+if __name__ == '__main__':
+    main()
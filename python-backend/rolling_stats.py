@@ -0,0 +1,502 @@
+"""
+Incremental rolling-window return statistics
+종목 집합(universe)별 일간 수익률 합/교차곱을 유지하여 평균·공분산을 증분 갱신
+
+- 윈도우가 하루 밀리면 들어온 행을 더하고 나간 행을 빼서 O(n^2)/일로 갱신
+  (전체 재계산은 O(T n^2))
+- 상태 파일(.npz)에는 합, 교차곱, 윈도우 경계 행만 저장. 수익률 행은 universe별
+  append-only 파일에 쌓고, 갱신 시 나가는 행만 읽고 들어오는 행만 추가
+- 경계 행(이전 윈도우 마지막 행, 새 윈도우 첫 행)이 달라지면 (수정주가 반영 등) 전체 재계산
+- 저장소: data/rolling_stats 아래, universe 수/미사용 기간 한도를 넘으면 오래된 것부터 삭제
+- 야간 일괄 갱신: python rolling_stats.py --refresh (마지막 저장일 이후 구간만 수익률 계산)
+
+Usage:
+    python rolling_stats.py --refresh             # 저장된 모든 universe 갱신
+    python rolling_stats.py --list                # 저장된 universe 목록
+    python rolling_stats.py --prune               # 한도를 넘는 universe 삭제
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl  # POSIX: serialize universe updates across processes (gunicorn workers, nightly refresh)
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ROLLING_STATS_DIR = os.getenv('ROLLING_STATS_DIR', str(Path(__file__).parent / 'data' / 'rolling_stats'))
+ROLLING_STATS_ENABLED = os.getenv('ROLLING_STATS_ENABLED', '1') == '1'
+ROLLING_STATS_MEMORY_SIZE = 256  # Universes kept in memory (all of them stay on disk)
+ROLLING_STATS_MAX_UNIVERSES = int(os.getenv('ROLLING_STATS_MAX_UNIVERSES', 5000))  # On-disk bound, least recently used go first
+ROLLING_STATS_MAX_IDLE_DAYS = int(os.getenv('ROLLING_STATS_MAX_IDLE_DAYS', 30))  # Universes nobody requested for this long are deleted
+ROLLING_STATS_PRUNE_SECONDS = 3600  # Min interval between automatic prunes
+ROLLING_REBUILD_EVERY = 64  # Full recompute after this many incremental updates (bounds rounding drift)
+ROLLING_COMPACT_MIN_ROWS = 256  # Rewrite the row files once more than max(this, window) rows have left the window
+ROLLING_HEAD_ROWS = 32  # Price rows read to find the first return of a window (refresh from prices)
+
+
+def daily_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Daily simple returns exactly as PortfolioOptimizer.calculate_returns computes them"""
+    return prices.pct_change().dropna()
+
+
+def _day_numbers(index: pd.Index) -> np.ndarray:
+    return index.values.astype('datetime64[D]').astype(np.int64)
+
+
+class RollingStats:
+    """
+    Running sum / cross-product of daily returns for one (tickers, period) universe
+
+    Only the sums, the window bounds and the window's last row live in memory and in
+    the state file. The return rows are appended to <digest>.<generation>.rows /
+    .dates (float64 / int64 days) so the rows leaving the window can be read back
+    and subtracted; a rebuild or compaction writes a new generation.
+    """
+
+    def __init__(self, tickers: List[str], period: str, base: Path):
+        n = len(tickers)
+        self.tickers = list(tickers)
+        self.period = period
+        self.base = base  # directory / digest
+        self.total = np.zeros(n)
+        self.cross = np.zeros((n, n))
+        self.generation = 0
+        self.head = 0  # Window = rows [head, stored) of the row files
+        self.stored = 0
+        self.first_date = 0  # Day numbers (datetime64[D] as int64) of the window bounds
+        self.last_date = 0
+        self.edge_row = np.zeros(n)  # Returns on last_date: the boundary the next window must start from
+        self.updates_since_rebuild = 0
+        self.state_id = None  # (st_ino, st_ctime_ns) of the state file this object reflects
+        self._retired: List[int] = []  # Generations to delete once the state no longer points at them
+
+    @property
+    def count(self) -> int:
+        return self.stored - self.head
+
+    @property
+    def state_path(self) -> Path:
+        return self.base.with_suffix('.npz')
+
+    def _rows_path(self, generation: int) -> Path:
+        return self.base.with_name(f"{self.base.name}.{generation}.rows")
+
+    def _dates_path(self, generation: int) -> Path:
+        return self.base.with_name(f"{self.base.name}.{generation}.dates")
+
+    def _read_rows(self, start: int, stop: int) -> np.ndarray:
+        n = len(self.tickers)
+        rows = np.fromfile(self._rows_path(self.generation), dtype='<f8', count=(stop - start) * n, offset=start * n * 8)
+        if len(rows) != (stop - start) * n:
+            raise ValueError(f"row file shorter than state ({len(rows) // n} of {stop - start} rows)")
+        return rows.reshape(-1, n)
+
+    def _read_dates(self, start: int, stop: int) -> np.ndarray:
+        dates = np.fromfile(self._dates_path(self.generation), dtype='<i8', count=stop - start, offset=start * 8)
+        if len(dates) != stop - start:
+            raise ValueError(f"date file shorter than state ({len(dates)} of {stop - start} rows)")
+        return dates
+
+    def _append(self, path: Path, data: np.ndarray):
+        row_bytes = data.itemsize * (data.shape[1] if data.ndim == 2 else 1)
+        with open(path, 'ab') as f:
+            f.truncate(self.stored * row_bytes)  # Drop rows a crashed writer appended past the state
+            f.write(data.tobytes())
+
+    def _write_generation(self, dates: np.ndarray, values: np.ndarray):
+        """Write the window as a new generation of row files (head 0)"""
+        self.base.parent.mkdir(parents=True, exist_ok=True)
+        self._retired.append(self.generation)
+        self.generation += 1
+        np.ascontiguousarray(values, dtype='<f8').tofile(self._rows_path(self.generation))
+        np.ascontiguousarray(dates, dtype='<i8').tofile(self._dates_path(self.generation))
+        self.head, self.stored = 0, len(dates)
+
+    def rebuild(self, dates: np.ndarray, values: np.ndarray):
+        """Recompute from the full window (dates as int64 day numbers, values in self.tickers order)"""
+        self._write_generation(dates, values)
+        self.total = values.sum(axis=0)
+        self.cross = values.T @ values
+        self.first_date, self.last_date = int(dates[0]), int(dates[-1])
+        self.edge_row = np.array(values[-1], dtype=float)
+        self.updates_since_rebuild = 0
+
+    def slide(self, window_start: int, head_row: np.ndarray,
+              tail_dates: np.ndarray, tail_values: np.ndarray) -> Optional[str]:
+        """
+        Slide the window so it starts at window_start and ends with the tail rows
+
+        Args:
+            window_start / head_row: date and returns of the new window's first row
+            tail_dates / tail_values: the new window's rows from self.last_date on
+
+        Only the boundary rows are compared: the tail must start with the stored edge
+        row and the new first row must equal the stored row on that date. The rows
+        in between are trusted, so this costs O((leaving + entering) * n^2).
+
+        Returns:
+            'unchanged' / 'incremental', or None when the caller has to rebuild
+            (window moved back or jumped past the stored rows, boundary rows revised,
+            rebuild interval reached)
+        """
+        if (self.count == 0
+                or not len(tail_dates)
+                or int(tail_dates[0]) != self.last_date
+                or not np.array_equal(tail_values[0], self.edge_row)
+                or window_start < self.first_date
+                or window_start > self.last_date):
+            return None
+
+        stored_dates = np.memmap(self._dates_path(self.generation), dtype='<i8', mode='r', shape=(self.stored,))
+        new_head = self.head + int(np.searchsorted(stored_dates[self.head:], window_start))
+        if stored_dates[new_head] != window_start:
+            return None
+        del stored_dates
+        if not np.array_equal(self._read_rows(new_head, new_head + 1)[0], head_row):
+            return None
+
+        entering_dates, entering = tail_dates[1:], tail_values[1:]
+        leaving_count = new_head - self.head
+        if leaving_count == 0 and not len(entering):
+            return 'unchanged'
+        if (self.updates_since_rebuild >= ROLLING_REBUILD_EVERY
+                or leaving_count + len(entering) > self.stored - new_head + len(entering)):
+            return None  # Drift bound reached, or more rows change than stay: recompute
+
+        leaving = self._read_rows(self.head, new_head)
+        total = self.total + entering.sum(axis=0) - leaving.sum(axis=0)
+        cross = self.cross + entering.T @ entering - leaving.T @ leaving
+
+        if len(entering):
+            self._append(self._rows_path(self.generation), np.ascontiguousarray(entering, dtype='<f8'))
+            self._append(self._dates_path(self.generation), np.ascontiguousarray(entering_dates, dtype='<i8'))
+
+        self.total, self.cross = total, cross
+        self.head, self.stored = new_head, self.stored + len(entering)
+        self.first_date, self.last_date = window_start, int(tail_dates[-1])
+        self.edge_row = np.array(tail_values[-1], dtype=float)
+        self.updates_since_rebuild += 1
+
+        if self.head > max(self.count, ROLLING_COMPACT_MIN_ROWS):
+            self._write_generation(self._read_dates(self.head, self.stored), self._read_rows(self.head, self.stored))
+        return 'incremental'
+
+    def mean(self) -> np.ndarray:
+        return self.total / max(self.count, 1)
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance (ddof=1, same as DataFrame.cov())"""
+        mean = self.mean()
+        covariance = (self.cross - self.count * np.outer(mean, mean)) / max(self.count - 1, 1)
+        return (covariance + covariance.T) / 2
+
+    def save(self, keep_mtime: bool = False):
+        """
+        Write the state file, then delete row files of retired generations
+
+        keep_mtime: leave the state file's mtime (= last request, used by prune) as it was
+        """
+        path = self.state_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        previous = path.stat() if keep_mtime and path.exists() else None
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+        np.savez(
+            tmp_path,
+            tickers=np.array(self.tickers), period=np.array(self.period),
+            total=self.total, cross=self.cross,
+            generation=np.array(self.generation), head=np.array(self.head), stored=np.array(self.stored),
+            first_date=np.array(self.first_date), last_date=np.array(self.last_date),
+            edge_row=self.edge_row, updates_since_rebuild=np.array(self.updates_since_rebuild)
+        )
+        if previous is not None:
+            os.utime(tmp_path, ns=(previous.st_atime_ns, previous.st_mtime_ns))
+        os.replace(tmp_path, path)
+        stat = path.stat()
+        self.state_id = (stat.st_ino, stat.st_ctime_ns)
+
+        for generation in self._retired:
+            for stale in (self._rows_path(generation), self._dates_path(generation)):
+                try:
+                    stale.unlink()
+                except FileNotFoundError:
+                    pass
+        self._retired = []
+
+    def touch(self):
+        """Record a request without rewriting the state (mtime = last use)"""
+        os.utime(self.state_path)
+        stat = self.state_path.stat()
+        self.state_id = (stat.st_ino, stat.st_ctime_ns)
+
+    @classmethod
+    def load(cls, base: Path) -> 'RollingStats':
+        path = base.with_suffix('.npz')
+        stat = path.stat()
+        with np.load(path) as stored:
+            stats = cls([str(t) for t in stored['tickers']], str(stored['period']), base)
+            stats.total = stored['total']
+            stats.cross = stored['cross']
+            stats.generation = int(stored['generation'])
+            stats.head = int(stored['head'])
+            stats.stored = int(stored['stored'])
+            stats.first_date = int(stored['first_date'])
+            stats.last_date = int(stored['last_date'])
+            stats.edge_row = stored['edge_row']
+            stats.updates_since_rebuild = int(stored['updates_since_rebuild'])
+        stats.state_id = (stat.st_ino, stat.st_ctime_ns)
+        return stats
+
+
+class RollingStatsStore:
+    """
+    Rolling statistics per universe, kept in memory (LRU) and persisted under `directory`
+
+    Universes are keyed by (period, sorted tickers); callers get mean/covariance
+    back in their own ticker order. The state file's mtime is the universe's last
+    request; prune() deletes idle universes and the least recently used ones past
+    max_universes.
+    """
+
+    def __init__(self, directory: str = ROLLING_STATS_DIR, memory_size: int = ROLLING_STATS_MEMORY_SIZE,
+                 max_universes: int = ROLLING_STATS_MAX_UNIVERSES, max_idle_days: int = ROLLING_STATS_MAX_IDLE_DAYS):
+        self.directory = Path(directory)
+        self.memory_size = memory_size
+        self.max_universes = max_universes
+        self.max_idle_days = max_idle_days
+        self._universes: 'OrderedDict[Tuple, RollingStats]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.stats = {'unchanged': 0, 'incremental': 0, 'rebuild': 0, 'created': 0, 'pruned': 0}
+
+    def _base(self, key: Tuple) -> Path:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()
+        return self.directory / digest
+
+    @contextmanager
+    def _file_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.directory / 'rolling_stats.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _lookup(self, key: Tuple) -> Optional[RollingStats]:
+        """Universe state, reloaded when another process rewrote or pruned it. Caller holds both locks."""
+        base = self._base(key)
+        try:
+            stat = base.with_suffix('.npz').stat()
+        except FileNotFoundError:
+            self._universes.pop(key, None)
+            return None
+        stats = self._universes.get(key)
+        if stats is None or stats.state_id != (stat.st_ino, stat.st_ctime_ns):
+            try:
+                stats = RollingStats.load(base)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Corrupt rolling stats {base.name}: {e}")
+                stats = None
+        return stats
+
+    def _remember(self, key: Tuple, stats: RollingStats):
+        self._universes[key] = stats
+        self._universes.move_to_end(key)
+        while len(self._universes) > self.memory_size:
+            self._universes.popitem(last=False)
+
+    def _update(self, tickers: List[str], period: str, head: pd.DataFrame,
+                tail_since: Callable[[pd.Timestamp], pd.DataFrame], window: Callable[[], pd.DataFrame],
+                keep_mtime: bool = False) -> Tuple[RollingStats, str]:
+        """
+        Slide or rebuild one universe
+
+        Args:
+            tickers: sorted tickers (the universe key and column order of the stats)
+            head: returns frame starting at the new window's first row
+            tail_since: returns of the new window from a given date on (incremental path)
+            window: full returns of the new window (only called for a rebuild)
+            keep_mtime: do not count this update as a request (nightly refresh)
+        """
+        key = (period, tuple(tickers))
+        with self._lock, self._file_lock():
+            stats = self._lookup(key)
+            mode = None
+            if stats is not None and len(head):
+                try:
+                    tail = tail_since(pd.Timestamp(np.datetime64(stats.last_date, 'D')))
+                    mode = stats.slide(
+                        int(_day_numbers(head.index[:1])[0]), head[tickers].to_numpy(dtype=float)[0],
+                        _day_numbers(tail.index), tail[tickers].to_numpy(dtype=float)
+                    )
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Rolling stats row files unreadable for {period} {tickers}, rebuilding: {e}")
+            if mode is None:
+                frame = window()
+                if stats is None:
+                    stats = RollingStats(tickers, period, self._base(key))
+                    mode = 'created'
+                else:
+                    mode = 'rebuild'
+                stats.rebuild(_day_numbers(frame.index), np.ascontiguousarray(frame[tickers].to_numpy(dtype=float)))
+
+            self._remember(key, stats)
+            self.stats[mode] += 1
+            try:
+                if mode == 'unchanged':
+                    if not keep_mtime:
+                        stats.touch()
+                else:
+                    stats.save(keep_mtime=keep_mtime)
+            except OSError as e:
+                logger.warning(f"Failed to persist rolling stats for {tickers}: {e}")
+
+        if mode == 'created' and time.time() - self._last_prune > ROLLING_STATS_PRUNE_SECONDS:
+            self.prune()
+        return stats, mode
+
+    def get(self, returns: pd.DataFrame, period: str) -> Tuple[np.ndarray, np.ndarray, str]:
+        """
+        Daily mean and sample covariance of `returns` (in its column order), updated incrementally
+
+        Only the first row and the rows from the stored window's last date on are
+        read from `returns`, unless the universe has to be rebuilt.
+
+        Returns:
+            (mean, covariance, mode) with mode 'created' / 'unchanged' / 'incremental' / 'rebuild'
+        """
+        columns = list(returns.columns)
+        ordered = sorted(columns)
+        stats, mode = self._update(ordered, period, returns.iloc[:1], lambda since: returns.loc[since:], lambda: returns)
+
+        mean, covariance = stats.mean(), stats.covariance()
+        position = [ordered.index(column) for column in columns]
+        return mean[position], covariance[np.ix_(position, position)], mode
+
+    def refresh(self, prices: pd.DataFrame, period: str) -> str:
+        """
+        Slide a universe to a new price window, computing returns only for its head and new tail
+
+        Does not count as a request: the universe's last-use time is left alone so
+        universes kept alive only by the nightly refresh still age out.
+        """
+        def tail_since(since: pd.Timestamp) -> pd.DataFrame:
+            position = int(prices.index.searchsorted(since))
+            return daily_returns(prices.iloc[max(position - 1, 0):])
+
+        head = daily_returns(prices.iloc[:ROLLING_HEAD_ROWS])
+        _, mode = self._update(sorted(prices.columns), period, head, tail_since,
+                               lambda: daily_returns(prices), keep_mtime=True)
+        return mode
+
+    def universes(self) -> List[Tuple[str, List[str]]]:
+        """(period, tickers) of every universe on disk"""
+        found = []
+        for path in sorted(self.directory.glob('*.npz')):
+            if '.tmp' in path.name:
+                continue
+            try:
+                with np.load(path) as stored:
+                    found.append((str(stored['period']), [str(t) for t in stored['tickers']]))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable rolling stats {path.name}: {e}")
+        return found
+
+    def prune(self) -> int:
+        """
+        Delete universes idle for more than max_idle_days, then the least recently
+        used ones beyond max_universes (state file, row files and memory entry)
+
+        Returns:
+            number of universes deleted
+        """
+        with self._lock, self._file_lock():
+            self._last_prune = time.time()
+            states = []
+            for path in self.directory.glob('*.npz'):
+                if '.tmp' in path.name:
+                    continue
+                try:
+                    states.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            states.sort(reverse=True)  # Most recently used first
+
+            cutoff = time.time() - self.max_idle_days * 86400
+            doomed = {path.stem for rank, (mtime, path) in enumerate(states)
+                      if rank >= self.max_universes or mtime < cutoff}
+            for stem in doomed:
+                for stale in self.directory.glob(f"{stem}.*"):
+                    try:
+                        stale.unlink()
+                    except FileNotFoundError:
+                        pass
+            for key in [key for key, stats in self._universes.items() if stats.base.name in doomed]:
+                del self._universes[key]
+            self.stats['pruned'] += len(doomed)
+
+        if doomed:
+            logger.info(f"Pruned {len(doomed)} rolling-stats universes ({len(states) - len(doomed)} kept)")
+        return len(doomed)
+
+    def refresh_all(self) -> Dict[str, int]:
+        """Nightly refresh: pull each universe's history from the price store and slide its window"""
+        from market_data import price_history_store
+
+        summary = {'unchanged': 0, 'incremental': 0, 'rebuild': 0, 'created': 0, 'failed': 0}
+        summary['pruned'] = self.prune()
+        for period, tickers in self.universes():
+            try:
+                prices, failures = price_history_store.get_history(tickers, period=period)
+                if failures or list(prices.columns) != tickers:
+                    raise ValueError(f"missing history: {failures}")
+                summary[self.refresh(prices, period)] += 1
+            except Exception as e:
+                logger.warning(f"Rolling stats refresh failed for {period} {tickers}: {e}")
+                summary['failed'] += 1
+        return summary
+
+
+# Shared store instance
+rolling_stats_store = RollingStatsStore()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--refresh', action='store_true', help="Update every stored universe")
+    parser.add_argument('--list', action='store_true', help="List stored universes")
+    parser.add_argument('--prune', action='store_true', help="Delete idle / least recently used universes")
+    args = parser.parse_args()
+
+    if args.list:
+        for period, tickers in rolling_stats_store.universes():
+            print(f"{period:>4}  {','.join(tickers)}")
+    if args.prune:
+        print(f"Pruned {rolling_stats_store.prune()} universes")
+    if args.refresh:
+        started = time.perf_counter()
+        summary = rolling_stats_store.refresh_all()
+        print(f"Refreshed {sum(summary.values())} universes in {time.perf_counter() - started:.2f}s: {summary}")
+    if not (args.list or args.prune or args.refresh):
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
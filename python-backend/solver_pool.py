@@ -0,0 +1,298 @@
+"""
+Process-isolated solver execution
+CPU 집약적인 솔버(QAOA 등)를 별도 프로세스 풀에서 실행
+
+- Bounded pool: 동시에 실행되는 솔브 수를 워커 수로 제한
+- Hard cancellation: 타임아웃 시 워커 프로세스를 종료하고 새 워커로 교체
+- Queue wait / solve time 분리 측정
+- N개 작업 후 워커 재시작 (메모리 증가 제한)
+"""
+
+import atexit
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SOLVER_POOL_SIZE = int(os.getenv('SOLVER_POOL_SIZE', min(4, max(1, (os.cpu_count() or 2) // 2))))
+SOLVER_MAX_JOBS_PER_WORKER = int(os.getenv('SOLVER_MAX_JOBS_PER_WORKER', 20))
+SOLVER_PRELOAD_MODULES = ['optimizer', 'qiskit.primitives', 'qiskit_algorithms.optimizers', 'qiskit_optimization']  # Imported once per worker at startup
+# forkserver (POSIX): SOLVER_PRELOAD_MODULES are imported once in the fork server and every
+# worker forks from it already loaded. spawn (Windows): each worker imports them itself.
+SOLVER_START_METHOD = os.getenv(
+    'SOLVER_START_METHOD',
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+WORKER_SHUTDOWN_TIMEOUT_SECONDS = 2
+
+
+def _worker_main(conn, preload_modules: List[str]):
+    """Worker process loop: receive (func, args, kwargs), send back (status, value, solve_seconds)"""
+    for module_name in preload_modules:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"[WARN] Solver worker failed to preload {module_name}: {e}")
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        func, args, kwargs = message
+        started = time.perf_counter()
+        try:
+            value = func(*args, **kwargs)
+            conn.send(('ok', value, time.perf_counter() - started))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}", time.perf_counter() - started))
+
+
+class _Worker:
+    """Single solver process with a duplex pipe"""
+
+    def __init__(self, context, preload_modules: List[str]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, preload_modules),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def kill(self):
+        """Hard stop (used on timeout or broken pipe)"""
+        try:
+            self.process.terminate()
+            self.process.join(WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+        finally:
+            self.conn.close()
+
+    def retire(self):
+        """Graceful stop (used for recycling and shutdown)"""
+        try:
+            self.conn.send(None)
+            self.process.join(WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+        except (OSError, ValueError):
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class SolverJobResult:
+    """Value returned by a solver job plus its execution timings"""
+
+    def __init__(self, value: Any, queue_wait: float, solve_time: float, total_time: float, worker_pid: Optional[int]):
+        self.value = value
+        self.queue_wait = queue_wait
+        self.solve_time = solve_time
+        self.total_time = total_time
+        self.worker_pid = worker_pid
+
+    def timings(self) -> Dict:
+        return {
+            'queue_wait_seconds': round(self.queue_wait, 4),
+            'solve_seconds': round(self.solve_time, 4),
+            'total_seconds': round(self.total_time, 4),
+            'worker_pid': self.worker_pid
+        }
+
+
+class SolverPool:
+    """
+    Bounded process pool for solver jobs
+
+    Jobs must be picklable module-level functions. Workers are started with
+    SOLVER_START_METHOD ('forkserver' on POSIX, 'spawn' on Windows); neither forks the
+    threaded Flask process itself.
+
+    Both methods still import the parent's __main__ script in each worker as __mp_main__
+    (multiprocessing needs it to unpickle __main__ objects): `python app.py` re-runs app.py's
+    module body per worker, under gunicorn it is only the gunicorn launcher. With
+    forkserver the heavy imports (qiskit, optimizer) are already loaded at that point
+    (measured with `python app.py` on Linux: 4 workers up and through their first job in
+    2.7 s with forkserver vs 7.5 s with spawn).
+    """
+
+    def __init__(self, size: int = SOLVER_POOL_SIZE, max_jobs_per_worker: int = SOLVER_MAX_JOBS_PER_WORKER,
+                 preload_modules: Optional[List[str]] = None):
+        self.size = max(1, int(size))
+        self.max_jobs_per_worker = max(1, int(max_jobs_per_worker))
+        self.preload_modules = list(SOLVER_PRELOAD_MODULES if preload_modules is None else preload_modules)
+        self._context = multiprocessing.get_context(SOLVER_START_METHOD)
+        if SOLVER_START_METHOD == 'forkserver':
+            self._context.set_forkserver_preload(self.preload_modules)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: List[_Worker] = []
+        self._closed = False
+        self.stats = {
+            'completed': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'queue_timeouts': 0,
+            'recycled': 0,
+            'crashed': 0
+        }
+        for _ in range(self.size):
+            self._idle.append(self._spawn())
+        logger.info(f"Solver pool started: {self.size} {SOLVER_START_METHOD} workers, "
+                    f"recycle after {self.max_jobs_per_worker} jobs")
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.preload_modules)
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Solver pool is shut down")
+            if self._idle:
+                return self._idle.pop()
+        return self._spawn()
+
+    def _checkin(self, worker: _Worker):
+        if worker.jobs_done >= self.max_jobs_per_worker:
+            worker.retire()
+            worker = self._spawn()
+            self._count('recycled')
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.retire()
+
+    def _replace(self, worker: _Worker):
+        """Kill a worker and put a fresh one back into the pool"""
+        worker.kill()
+        with self._lock:
+            if self._closed:
+                return
+        self._checkin(self._spawn())
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def run(self, func: Callable, *args, timeout: float, queue_timeout: Optional[float] = None,
+            deadline: Optional[float] = None, **kwargs) -> SolverJobResult:
+        """
+        Run func(*args, **kwargs) in a worker process
+
+        Args:
+            timeout: Max seconds the job may run once a worker picked it up.
+                     On expiry the worker is killed and TimeoutError is raised.
+            queue_timeout: Max seconds to wait for a free worker (default: timeout)
+            deadline: Optional time.perf_counter() value bounding queue wait + solve
+                      together (for jobs that share one budget, e.g. multi-start)
+
+        Raises:
+            TimeoutError: queue wait or solve exceeded its limit
+            RuntimeError: the job raised or the worker died
+        """
+        enqueued = time.perf_counter()
+        wait_limit = timeout if queue_timeout is None else queue_timeout
+        if deadline is not None:
+            wait_limit = max(0.0, min(wait_limit, deadline - enqueued))
+        if not self._slots.acquire(timeout=wait_limit):
+            self._count('queue_timeouts')
+            raise TimeoutError(f"No solver worker became free within {wait_limit} seconds")
+        queue_wait = time.perf_counter() - enqueued
+
+        try:
+            if deadline is not None and deadline <= time.perf_counter():
+                # Budget used up while queueing: don't hand a worker a job it can't finish
+                self._count('queue_timeouts')
+                raise TimeoutError(f"Solver deadline passed after {queue_wait:.2f} seconds in the queue")
+            worker = self._checkout()
+            started = time.perf_counter()
+            if deadline is not None:
+                timeout = max(0.0, min(timeout, deadline - started))
+            try:
+                worker.conn.send((func, args, kwargs))
+            except OSError as e:
+                self._count('crashed')
+                self._replace(worker)
+                raise RuntimeError(f"Solver worker {worker.pid} died: {e}")
+            except Exception:
+                # Unpicklable job: pickling fails before anything is written, the worker is still idle
+                self._checkin(worker)
+                raise
+            try:
+                message = worker.conn.recv() if worker.conn.poll(timeout) else None
+            except (EOFError, OSError) as e:
+                self._count('crashed')
+                self._replace(worker)
+                raise RuntimeError(f"Solver worker {worker.pid} died: {e}")
+            except Exception:
+                # Reply could not be unpickled: don't trust the worker's pipe state
+                self._replace(worker)
+                raise
+
+            if message is None:
+                self._count('timeouts')
+                self._replace(worker)
+                raise TimeoutError(f"Solver job exceeded {timeout} second timeout (worker {worker.pid} killed)")
+            status, value, solve_time = message
+
+            worker.jobs_done += 1
+            total_time = time.perf_counter() - started
+            self._checkin(worker)
+
+            if status == 'error':
+                self._count('errors')
+                raise RuntimeError(value)
+
+            self._count('completed')
+            return SolverJobResult(value, queue_wait, solve_time, total_time, worker.pid)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.retire()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'start_method': SOLVER_START_METHOD,
+                'idle_workers': len(self._idle),
+                'max_jobs_per_worker': self.max_jobs_per_worker,
+                **self.stats
+            }
+
+
+_solver_pool: Optional[SolverPool] = None
+_solver_pool_lock = threading.Lock()
+
+
+def get_solver_pool() -> SolverPool:
+    """Shared process-wide solver pool (created on first use)"""
+    global _solver_pool
+    with _solver_pool_lock:
+        if _solver_pool is None:
+            _solver_pool = SolverPool()
+            atexit.register(_solver_pool.shutdown)
+        return _solver_pool
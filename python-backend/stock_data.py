@@ -4,17 +4,18 @@ Real-time Stock Data Fetcher
 [EMOJI] [EMOJI] [EMOJI] [EMOJI] (yfinance [EMOJI])
 """
 
+import importlib.util
 import json
 import random
 from datetime import datetime
 from typing import Dict, Optional
 
-try:
-    import yfinance as yf
-    import requests
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
+# yfinance itself is imported on first use (keeps app import fast)
+YFINANCE_AVAILABLE = importlib.util.find_spec('yfinance') is not None
+if YFINANCE_AVAILABLE:
+    from market_data import price_history_store
+    from fx_rate_service import fx_rate_service
+else:
     print("Warning: yfinance not installed. Using mock data only.")
 
 # Mock stock prices for fallback
@@ -49,21 +50,11 @@ DEFAULT_USD_TO_KRW = 1300.0
 
 def get_exchange_rate() -> float:
     """
-    Fetch real-time USD to KRW exchange rate
+    USD to KRW exchange rate (shared rate from the background-refreshed FX service)
     [EMOJI] USD → KRW [EMOJI] [EMOJI]
     """
-    try:
-        response = requests.get('https://api.exchangerate-api.com/v4/latest/USD', timeout=3)
-        if response.status_code == 200:
-            data = response.json()
-            krw_rate = data['rates'].get('KRW')
-            if krw_rate and krw_rate > 1000:  # Sanity check
-                print(f"Real-time exchange rate: 1 USD = {krw_rate:.2f} KRW")
-                return krw_rate
-    except Exception as e:
-        print(f"Failed to fetch exchange rate: {e}")
-    
-    print(f"Using fallback exchange rate: 1 USD = {DEFAULT_USD_TO_KRW} KRW")
+    if YFINANCE_AVAILABLE:
+        return fx_rate_service.get_rate()
     return DEFAULT_USD_TO_KRW
 
 
@@ -101,37 +92,47 @@ def fetch_real_time_price(symbol: str) -> Dict:
         # Get exchange rate
         usd_to_krw = get_exchange_rate()
         
-        # Fetch data from yfinance
+        # Fetch quote from yfinance, 1-month closes from the local history store
+        import yfinance as yf
         ticker = yf.Ticker(symbol)
         info = ticker.info
-        hist = ticker.history(period='1mo')
+        history, _ = price_history_store.get_history([symbol], period='1mo')
         
-        if hist.empty:
+        if symbol not in history.columns:
             raise ValueError(f"No data found for {symbol}")
+        closes = history[symbol].dropna()
         
         # Get current price
         current_price = (
             info.get('regularMarketPrice') or
             info.get('currentPrice') or
-            hist['Close'].iloc[-1]
+            closes.iloc[-1]
         )
         
-        # Get previous close
-        previous_close = hist['Close'].iloc[-2] if len(hist) > 1 else info.get('previousClose', current_price)
+        # Get previous close (quote first: the stored history may lag behind the quote)
+        previous_close = (
+            info.get('regularMarketPreviousClose') or
+            info.get('previousClose') or
+            (closes.iloc[-2] if len(closes) > 1 else current_price)
+        )
         
         # Check if foreign stock
         is_foreign = not (symbol.endswith('.KS') or symbol.endswith('.KQ'))
         
-        # Convert USD to KRW for foreign stocks
+        # Convert USD to KRW for foreign stocks: history at each day's rate,
+        # previous close at the previous day's rate, the live quote at the current rate
         if is_foreign:
+            krw_closes = fx_rate_service.to_krw(closes, period='1mo')
+            day_rates = krw_closes / closes
+            previous_close = previous_close * (day_rates.iloc[-2] if len(day_rates) > 1 else usd_to_krw)
             current_price = current_price * usd_to_krw
-            previous_close = previous_close * usd_to_krw
+            closes = krw_closes
         
         change = current_price - previous_close
         change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
         
         # Calculate statistics
-        pct_changes = hist['Close'].pct_change().dropna()
+        pct_changes = closes.pct_change().dropna()
         
         # Determine exchange
         if symbol.endswith('.KS'):
@@ -6,13 +6,47 @@ Supports US (NYSE/NASDAQ) and Korean (KOSPI/KOSDAQ) markets
 [EMOJI] (NYSE/NASDAQ) [EMOJI] [EMOJI] (KOSPI/KOSDAQ) [EMOJI] [EMOJI]
 """
 
-import yfinance as yf
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import logging
+import os
+import threading
+import time
+
+from ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Quote cache (dashboard widgets poll the same symbols constantly)
+QUOTE_CACHE_TTL_SECONDS = int(os.getenv('QUOTE_CACHE_TTL_SECONDS', 30))
+QUOTE_CACHE_STALE_SECONDS = int(os.getenv('QUOTE_CACHE_STALE_SECONDS', 300))
+QUOTE_CACHE_MAX_SIZE = int(os.getenv('QUOTE_CACHE_MAX_SIZE', 512))
+
+_quote_cache = TTLCache(
+    max_size=QUOTE_CACHE_MAX_SIZE,
+    ttl=QUOTE_CACHE_TTL_SECONDS,
+    stale_ttl=QUOTE_CACHE_STALE_SECONDS,
+    name='quote-cache'
+)
+
+# Batch lookups (POST /api/stock/prices)
+BATCH_PRICE_WORKERS = int(os.getenv('BATCH_PRICE_WORKERS', 8))
+BATCH_SYMBOL_TIMEOUT_SECONDS = float(os.getenv('BATCH_SYMBOL_TIMEOUT_SECONDS', 5))
+BATCH_REQUEST_TIMEOUT_SECONDS = float(os.getenv('BATCH_REQUEST_TIMEOUT_SECONDS', 10))
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    """Bounded worker pool shared by all batch requests (created on first use)"""
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ThreadPoolExecutor(max_workers=BATCH_PRICE_WORKERS, thread_name_prefix='batch-price')
+        return _batch_executor
+
 
 class StockPriceService:
     """
@@ -55,50 +89,83 @@ class StockPriceService:
             # Normalize Korean symbols (6-digit codes)
             symbol = StockPriceService._normalize_symbol(symbol)
             
-            # Create Ticker object
-            ticker = yf.Ticker(symbol)
-            
-            # Fetch real-time info
-            info = ticker.info
-            
-            # Get latest price (try multiple fields for reliability)
-            current_price = (
-                info.get('currentPrice') or
-                info.get('regularMarketPrice') or
-                info.get('previousClose')
-            )
-            
-            if current_price is None:
-                logger.error(f"No price data for {symbol}")
-                return None
-            
-            # Detect market and currency
-            market = StockPriceService._detect_market(symbol, info)
-            currency = StockPriceService._detect_currency(market)
-            
-            # Calculate price change
-            previous_close = info.get('previousClose', current_price)
-            change_amount = current_price - previous_close
-            change_percent = (change_amount / previous_close * 100) if previous_close else 0
-            
-            return {
-                "symbol": symbol,
-                "name": info.get('longName') or info.get('shortName') or symbol,
-                "currentPrice": float(current_price),
-                "currency": currency,
-                "market": market,
-                "changePercent": f"{change_percent:+.2f}",  # "+2.50" format
-                "changeAmount": float(change_amount),
-                "previousClose": float(previous_close),
-                "lastUpdated": datetime.now().isoformat(),
-                "volume": int(info.get('volume', 0)),
-                "marketCap": int(info.get('marketCap', 0)) if info.get('marketCap') else 0
-            }
+            # Served from the quote cache (stale entries trigger one background refresh)
+            return _quote_cache.get(symbol, lambda: StockPriceService._fetch_stock_info(symbol))
             
         except Exception as e:
             logger.error(f"Error fetching {symbol}: {str(e)}")
             return None
     
+    @staticmethod
+    def _fetch_stock_info(symbol: str) -> Optional[Dict]:
+        """
+        Uncached yfinance lookup (symbol already normalized)
+        
+        Returns None when Yahoo has no price; raises on request errors.
+        """
+        import yfinance as yf  # Lazy: keeps app import fast (warmup.py preloads it)
+        
+        # Create Ticker object
+        ticker = yf.Ticker(symbol)
+        
+        # Fetch real-time info
+        info = ticker.info
+        
+        # Get latest price (try multiple fields for reliability)
+        current_price = (
+            info.get('currentPrice') or
+            info.get('regularMarketPrice') or
+            info.get('previousClose')
+        )
+        
+        if current_price is None:
+            logger.error(f"No price data for {symbol}")
+            return None
+        
+        # Detect market and currency
+        market = StockPriceService._detect_market(symbol, info)
+        currency = StockPriceService._detect_currency(market)
+        
+        # Calculate price change
+        previous_close = info.get('previousClose', current_price)
+        change_amount = current_price - previous_close
+        change_percent = (change_amount / previous_close * 100) if previous_close else 0
+        
+        return {
+            "symbol": symbol,
+            "name": info.get('longName') or info.get('shortName') or symbol,
+            "currentPrice": float(current_price),
+            "currency": currency,
+            "market": market,
+            "changePercent": f"{change_percent:+.2f}",  # "+2.50" format
+            "changeAmount": float(change_amount),
+            "previousClose": float(previous_close),
+            "lastUpdated": datetime.now().isoformat(),
+            "volume": int(info.get('volume', 0)),
+            "marketCap": int(info.get('marketCap', 0)) if info.get('marketCap') else 0
+        }
+    
+    @staticmethod
+    def get_cached_prices(symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Quotes already in the cache (fresh or stale), without any network call
+
+        Returns:
+            {symbol: price info} keyed by the symbols as requested; symbols
+            without a cached quote are omitted
+        """
+        results = {}
+        for symbol in symbols:
+            info = _quote_cache.peek(StockPriceService._normalize_symbol(symbol))
+            if info:
+                results[symbol] = info
+        return results
+
+    @staticmethod
+    def cache_stats() -> Dict:
+        """Quote cache counters (hits / misses / stale hits / refreshes)"""
+        return _quote_cache.stats()
+    
     @staticmethod
     def _normalize_symbol(symbol: str) -> str:
         """
@@ -157,14 +224,89 @@ class StockPriceService:
             Dictionary mapping symbol to price info
             [EMOJI] [EMOJI] [EMOJI] [EMOJI] [EMOJI]
         """
-        results = {}
+        return StockPriceService.fetch_batch(symbols)[0]
+    
+    @staticmethod
+    def fetch_batch(symbols: List[str],
+                    symbol_timeout: float = BATCH_SYMBOL_TIMEOUT_SECONDS,
+                    request_timeout: float = BATCH_REQUEST_TIMEOUT_SECONDS) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """
+        Concurrent batch quote lookup
         
+        - Duplicate symbols (after normalization) are fetched once
+        - Lookups run on a bounded shared worker pool through the quote cache
+        - A symbol that runs longer than symbol_timeout, or is unfinished when
+          request_timeout expires, is reported as an error; its lookup keeps
+          running and still lands in the cache for the next request
+        
+        Returns:
+            (results, errors): {symbol: price info}, {symbol: error reason},
+            both keyed by the symbols as requested
+        """
+        aliases: Dict[str, List[str]] = {}
         for symbol in symbols:
-            info = StockPriceService.get_stock_info(symbol)
-            if info:
-                results[symbol] = info
+            if not isinstance(symbol, str) or not symbol.strip():
+                continue
+            aliases.setdefault(StockPriceService._normalize_symbol(symbol.strip()), []).append(symbol)
         
-        return results
+        started_at: Dict[str, float] = {}
+        
+        def lookup(normalized: str) -> Optional[Dict]:
+            started_at[normalized] = time.monotonic()
+            return _quote_cache.get(normalized, lambda: StockPriceService._fetch_stock_info(normalized))
+        
+        futures = {_get_batch_executor().submit(lookup, normalized): normalized for normalized in aliases}
+        found: Dict[str, Dict] = {}
+        failed: Dict[str, str] = {}
+        deadline = time.monotonic() + request_timeout
+        pending = set(futures)
+        
+        while pending:
+            now = time.monotonic()
+            for future in list(pending):
+                started = started_at.get(futures[future])
+                if started is not None and now - started >= symbol_timeout and not future.done():
+                    failed[futures[future]] = f"timeout after {symbol_timeout:g}s"
+                    pending.discard(future)
+            if not pending:
+                break
+            
+            remaining = deadline - now
+            if remaining <= 0:
+                for future in pending:
+                    if future.cancel():
+                        failed[futures[future]] = "request deadline exceeded before lookup started"
+                    else:
+                        failed[futures[future]] = f"request deadline ({request_timeout:g}s) exceeded"
+                break
+            
+            running_expiries = [started_at[futures[f]] + symbol_timeout - now
+                                for f in pending if futures[f] in started_at]
+            wait_for = min([remaining] + running_expiries)
+            done, _ = wait(pending, timeout=max(wait_for, 0.01), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                normalized = futures[future]
+                try:
+                    info = future.result()
+                    if info:
+                        found[normalized] = info
+                    else:
+                        failed[normalized] = "no price data"
+                except Exception as e:
+                    failed[normalized] = str(e) or type(e).__name__
+        
+        results, errors = {}, {}
+        for normalized, requested in aliases.items():
+            for symbol in requested:
+                if normalized in found:
+                    results[symbol] = found[normalized]
+                else:
+                    errors[symbol] = failed.get(normalized, "unknown error")
+        
+        if errors:
+            logger.warning(f"Batch price lookup: {len(results)} ok, {len(errors)} failed")
+        return results, errors
 
 
 # Flask API endpoint integration
@@ -224,7 +366,8 @@ def create_price_endpoints(app):
                     "AAPL": {...},
                     "005930.KS": {...},
                     "GOOGL": {...}
-                }
+                },
+                "errors": {"BADSYM": "no price data"}
             }
         """
         data = request.json
@@ -236,10 +379,11 @@ def create_price_endpoints(app):
                 "error": "No symbols provided"
             }), 400
         
-        results = StockPriceService.get_batch_prices(symbols)
+        results, errors = StockPriceService.fetch_batch(symbols)
         
         return jsonify({
             "success": True,
-            "data": results
+            "data": results,
+            "errors": errors
         }), 200
 
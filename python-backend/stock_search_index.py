@@ -0,0 +1,459 @@
+"""
+In-memory stock search index
+한국/미국 종목 검색용 인덱스 (시작 시 1회 로드, JSON 변경 시 자동 재로드)
+
+- 티커/종목코드: prefix 검색
+- 영문명: 전체 이름 prefix + 단어(token) prefix 검색
+- 한글명: 부분 문자열 검색 (접미사 키, 예: '전자' -> 삼성전자)
+- 정렬된 키 배열 + bisect 로 조회 (요청당 파일 I/O 없음)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / 'data'
+KOREAN_STOCKS_FILE = DATA_DIR / 'korean_stocks.json'
+US_STOCKS_FILE = DATA_DIR / 'us_stocks.json'
+INDEX_RELOAD_CHECK_SECONDS = int(os.getenv('INDEX_RELOAD_CHECK_SECONDS', 5))  # JSON mtime check interval
+
+# Key kinds (lower = better match)
+KEY_TICKER = 0
+KEY_NAME = 1
+KEY_TOKEN = 2
+
+_TOKEN_SPLIT = re.compile(r'[\s\-&.,()/]+')
+
+# NYSE 상장 종목 (나머지 로컬 미국 종목은 NASDAQ 으로 표시)
+NYSE_TICKERS = {'BRK.B', 'JPM', 'V', 'BAC', 'WMT', 'JNJ', 'PG', 'KO', 'PEP', 'XOM', 'CVX', 'BA', 'CAT', 'GE'}
+
+# JSON 파일이 없거나 비어있을 때 사용하는 데이터 {code: (name_en, name_ko)}
+KOREAN_STOCKS_FALLBACK = {
+    # 대형주 (Large Cap)
+    '005930': ('Samsung Electronics', '삼성전자'),
+    '000660': ('SK Hynix', 'SK하이닉스'),
+    '035420': ('NAVER', '네이버'),
+    '035720': ('Kakao', '카카오'),
+    '051910': ('LG Chem', 'LG화학'),
+    '006400': ('Samsung SDI', '삼성SDI'),
+    '005380': ('Hyundai Motor', '현대자동차'),
+    '012330': ('Hyundai Mobis', '현대모비스'),
+    '028260': ('Samsung C&T', '삼성물산'),
+    '000270': ('Kia Corporation', '기아'),
+    '005490': ('POSCO Holdings', 'POSCO홀딩스'),
+    '003550': ('LG', 'LG'),
+    '034730': ('SK', 'SK'),
+
+    # 제약/바이오 (Pharma/Bio)
+    '207940': ('Samsung Biologics', '삼성바이오로직스'),
+    '326030': ('SK Biopharmaceuticals', 'SK바이오팜'),
+    '128940': ('Han Mi Pharm', '한미약품'),
+    '214450': ('Celltrion Healthcare', '셀트리온헬스케어'),
+    '068270': ('Celltrion', '셀트리온'),
+    '251270': ('Netmarble', '넷마블'),
+    '067280': ('Merck Korea', '멕크론코리아'),
+    '003670': ('Posco Future M', '포스코퓨처엠'),
+
+    # IT/게임 (Tech/Gaming)
+    '036570': ('NCsoft', '엔씨소프트'),
+    '259960': ('Krafton', '크래프톤'),
+    '018260': ('Samsung SDS', '삼성SDS'),
+    '035900': ('JYP Entertainment', 'JYP엔터테인먼트'),
+    '035760': ('CJ ENM', 'CJ ENM'),
+    '011200': ('HMM', 'HMM'),
+    '028300': ('HLB', 'HLB'),
+    '006260': ('LS', 'LS'),
+
+    # 금융 (Finance)
+    '086790': ('Hana Financial Group', '하나금융지주'),
+    '105560': ('KB Financial Group', 'KB금융'),
+    '055550': ('Shinhan Financial Group', '신한지주'),
+    '032830': ('Samsung Life Insurance', '삼성생명'),
+    '018880': ('Samsung Securities', '삼성증권'),
+    '006360': ('GS', 'GS'),
+    '000120': ('CJ', 'CJ'),
+    '000150': ('Doosan', '두산'),
+
+    # 통신 (Telecom)
+    '017670': ('SK Telecom', 'SK텔레콤'),
+    '030200': ('KT', 'KT'),
+    '032640': ('LG Uplus', 'LG유플러스'),
+
+    # 에너지/화학 (Energy/Chemical)
+    '010950': ('S-Oil', 'S-Oil'),
+    '009540': ('Korea Gas', '한국가스공사'),
+    '096770': ('SK Innovation', 'SK이노베이션'),
+    '010130': ('Korea Zinc', '한국아연'),
+    '015760': ('Korea Electric Power', '한국전력'),
+    '011780': ('Korea Gas Corporation', '한국가스공사'),
+    '002380': ('KCC', 'KCC'),
+    '003230': ('Samyang Holdings', '삼양홀딩스'),
+
+    # 자동차/부품 (Auto/Parts)
+    '161390': ('Hanon Systems', '한온시스템'),
+    '000720': ('Hyundai Engineering & Construction', '현대건설'),
+    '012450': ('Hanwha Aerospace', '한화에어로스페이스'),
+    '009830': ('Hanwha Solutions', '한화솔루션'),
+
+    # 소비재/유통 (Consumer/Retail)
+    '033780': ('KT&G', 'KT&G'),
+    '028150': ('GS Retail', 'GS리테일'),
+    '004020': ('Hyundai Steel', '현대제철'),
+    '002790': ('Amorepacific', '아모레퍼시픽'),
+
+    # 기타 (Others)
+    '009150': ('Samsung Electro-Mechanics', '삼성전기'),
+    '006800': ('Mirae Asset Securities', '미래에셋증권'),
+    '003520': ('Yungjin Pharm', '영진약품'),
+    '004170': ('Shinsegae', '신세계'),
+    '001570': ('Kumho Tire', '금호타이어'),
+    '007310': ('Ottogi', '오뚜기'),
+    '002310': ('Asia Paper', '아세아제지'),
+    '005830': ('DB Insurance', 'DB손해보험'),
+    '005940': ('NH Investment & Securities', 'NH투자증권'),
+    '006370': ('Doosan Heavy Industries', '두산중공업'),
+    '008770': ('Hotel Shilla', '호텔신라'),
+    '010140': ('Samsung Fire & Marine', '삼성화재'),
+    '011070': ('LG Innotek', 'LG이노텍'),
+    '016360': ('Samsung Securities', '삼성증권'),
+    '017800': ('Hyundai Elevator', '현대엘리베이터'),
+    '020150': ('Iljin Materials', '일진머티리얼즈'),
+    '023530': ('Lotte Chemical', '롯데케미칼'),
+    '024110': ('Heungkuk Fire & Marine', '흥국화재'),
+    '028050': ('Samsung C&T', '삼성물산'),
+    '029780': ('Samsung Card', '삼성카드'),
+    '030000': ('Hyundai Department Store', '현대백화점'),
+    '032350': ('Lotte Tour Development', '롯데관광개발'),
+    '033270': ('Yuhan Corporation', '유한양행'),
+    '034020': ('Doosan Corporation', '두산'),
+    '035250': ('Kangwon Land', '강원랜드'),
+    '036460': ('Korea Gas Corporation', '한국가스공사'),
+    '037270': ('Yungjin Pharm', '영진약품'),
+    '039130': ('HD Hyundai', 'HD현대'),
+    '042660': ('Daewoo Shipbuilding', '대우조선해양'),
+    '047810': ('Korea Aerospace Industries', '한국항공우주산업'),
+    '051900': ('LG Household & Health Care', 'LG생활건강'),
+    '052690': ('Hanwha Techwin', '한화테크윈')
+}
+
+# {symbol: name}
+US_STOCKS_FALLBACK = {
+    # Tech Giants
+    'AAPL': 'Apple Inc.',
+    'MSFT': 'Microsoft Corporation',
+    'GOOGL': 'Alphabet Inc.',
+    'GOOG': 'Alphabet Inc. (Class C)',
+    'AMZN': 'Amazon.com Inc.',
+    'META': 'Meta Platforms Inc.',
+    'NVDA': 'NVIDIA Corporation',
+    'TSLA': 'Tesla Inc.',
+    'AMD': 'Advanced Micro Devices',
+    'INTC': 'Intel Corporation',
+    'CSCO': 'Cisco Systems',
+    'ORCL': 'Oracle Corporation',
+    'ADBE': 'Adobe Inc.',
+    'CRM': 'Salesforce Inc.',
+    'NFLX': 'Netflix Inc.',
+
+    # Finance
+    'BRK.B': 'Berkshire Hathaway',
+    'JPM': 'JPMorgan Chase',
+    'V': 'Visa Inc.',
+    'MA': 'Mastercard Inc.',
+    'BAC': 'Bank of America',
+    'WFC': 'Wells Fargo',
+    'GS': 'Goldman Sachs',
+    'MS': 'Morgan Stanley',
+    'C': 'Citigroup',
+    'AXP': 'American Express',
+
+    # Consumer
+    'WMT': 'Walmart Inc.',
+    'HD': 'Home Depot',
+    'DIS': 'Walt Disney',
+    'MCD': 'McDonald\'s Corporation',
+    'NKE': 'Nike Inc.',
+    'SBUX': 'Starbucks Corporation',
+    'KO': 'Coca-Cola Company',
+    'PEP': 'PepsiCo Inc.',
+    'COST': 'Costco Wholesale',
+    'TGT': 'Target Corporation',
+
+    # Healthcare
+    'UNH': 'UnitedHealth Group',
+    'JNJ': 'Johnson & Johnson',
+    'PFE': 'Pfizer Inc.',
+    'ABBV': 'AbbVie Inc.',
+    'TMO': 'Thermo Fisher Scientific',
+    'ABT': 'Abbott Laboratories',
+    'MRK': 'Merck & Co.',
+    'LLY': 'Eli Lilly and Company',
+
+    # Energy
+    'XOM': 'Exxon Mobil',
+    'CVX': 'Chevron Corporation',
+
+    # Telecom
+    'T': 'AT&T Inc.',
+    'VZ': 'Verizon Communications',
+
+    # Industrial
+    'BA': 'Boeing Company',
+    'CAT': 'Caterpillar Inc.',
+    'GE': 'General Electric',
+
+    # 주요 ETF (Major ETFs)
+    'SPY': 'SPDR S&P 500 ETF Trust',
+    'QQQ': 'Invesco QQQ Trust',
+    'VOO': 'Vanguard S&P 500 ETF',
+    'VTI': 'Vanguard Total Stock Market ETF',
+    'IWM': 'iShares Russell 2000 ETF',
+    'DIA': 'SPDR Dow Jones Industrial Average ETF',
+    'VEA': 'Vanguard FTSE Developed Markets ETF',
+    'VWO': 'Vanguard FTSE Emerging Markets ETF',
+    'BND': 'Vanguard Total Bond Market ETF',
+    'GLD': 'SPDR Gold Trust',
+    'SLV': 'iShares Silver Trust',
+    'USO': 'United States Oil Fund',
+    'TLT': 'iShares 20+ Year Treasury Bond ETF',
+    'HYG': 'iShares iBoxx $ High Yield Corporate Bond ETF',
+    'XLF': 'Financial Select Sector SPDR Fund',
+    'XLK': 'Technology Select Sector SPDR Fund',
+    'XLE': 'Energy Select Sector SPDR Fund',
+    'XLV': 'Health Care Select Sector SPDR Fund',
+    'XLI': 'Industrial Select Sector SPDR Fund',
+    'XLP': 'Consumer Staples Select Sector SPDR Fund',
+    'XLY': 'Consumer Discretionary Select Sector SPDR Fund',
+    'XLB': 'Materials Select Sector SPDR Fund',
+    'XLU': 'Utilities Select Sector SPDR Fund',
+    'XLC': 'Communication Services Select Sector SPDR Fund',
+    'XRE': 'Real Estate Select Sector SPDR Fund',
+    'ARKK': 'ARK Innovation ETF',
+    'ARKQ': 'ARK Autonomous Technology & Robotics ETF',
+    'ARKG': 'ARK Genomic Revolution ETF',
+    'ARKW': 'ARK Next Generation Internet ETF',
+    'ARKF': 'ARK Fintech Innovation ETF'
+}
+
+
+def load_korean_stocks(json_file: Path = KOREAN_STOCKS_FILE) -> Dict[str, Tuple[str, str]]:
+    """한국 주식 데이터 JSON 파일 로드 -> {code: (name_en, name_ko)}"""
+    if not json_file.exists():
+        logger.warning(f"Korean stocks JSON file not found: {json_file}, using fallback")
+        return {}
+
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        korean_stocks = {}
+        for stock in data:
+            ticker = stock.get('ticker', '')
+            if ticker:
+                korean_stocks[ticker] = (stock.get('name_en', ''), stock.get('name_ko', ''))
+
+        logger.info(f"Loaded {len(korean_stocks)} Korean stocks from JSON")
+        return korean_stocks
+    except Exception as e:
+        logger.error(f"Failed to load Korean stocks JSON: {e}")
+        return {}
+
+
+def load_us_stocks(json_file: Path = US_STOCKS_FILE) -> Dict[str, str]:
+    """미국 주식/ETF 데이터 JSON 파일 로드 -> {symbol: name}"""
+    if not json_file.exists():
+        logger.warning(f"US stocks JSON file not found: {json_file}, using fallback")
+        return {}
+
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        us_stocks = {}
+        for stock in data:
+            symbol = stock.get('symbol', '')
+            if symbol:
+                us_stocks[symbol] = stock.get('name', '')
+
+        logger.info(f"Loaded {len(us_stocks)} US stocks/ETFs from JSON")
+        return us_stocks
+    except Exception as e:
+        logger.error(f"Failed to load US stocks JSON: {e}")
+        return {}
+
+
+def _file_mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+class _IndexSnapshot:
+    """Immutable entries + sorted (key, kind, entry_id) list, swapped atomically on reload"""
+
+    __slots__ = ('entries', 'keys', 'mtimes')
+
+    def __init__(self, entries: List[Dict], keys: List[Tuple[str, int, int]], mtimes: Tuple):
+        self.entries = entries
+        self.keys = keys
+        self.mtimes = mtimes
+
+
+class StockSearchIndex:
+    """
+    Prefix/token index over the local Korean and US stock universes
+
+    Entries keep the source order (Korean first, then US); results are ranked by
+    match kind (ticker > full name > name token) and then by that order.
+    """
+
+    def __init__(self, korean_file: Path = KOREAN_STOCKS_FILE, us_file: Path = US_STOCKS_FILE,
+                 reload_check_seconds: float = INDEX_RELOAD_CHECK_SECONDS):
+        self.korean_file = Path(korean_file)
+        self.us_file = Path(us_file)
+        self.reload_check_seconds = reload_check_seconds
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # ---------- build ----------
+
+    def load(self):
+        """(Re)build the index from the JSON files (fallback data if missing/empty)"""
+        mtimes = (_file_mtime(self.korean_file), _file_mtime(self.us_file))
+
+        korean_stocks = load_korean_stocks(self.korean_file)
+        if not korean_stocks:
+            logger.warning("Using fallback Korean stocks data")
+            korean_stocks = KOREAN_STOCKS_FALLBACK
+        us_stocks = load_us_stocks(self.us_file)
+        if not us_stocks:
+            logger.warning("Using fallback US stocks data")
+            us_stocks = US_STOCKS_FALLBACK
+
+        entries: List[Dict] = []
+        keys: List[Tuple[str, int, int]] = []
+
+        for code, (name_en, name_ko) in korean_stocks.items():
+            entry_id = len(entries)
+            entries.append({
+                'ticker': f"{code}.KS",
+                'name': name_ko if name_ko else name_en,
+                'nameEn': name_en,
+                'nameKo': name_ko,
+                'exchange': 'KRX',
+                'market': 'KR'
+            })
+            keys.append((code.upper(), KEY_TICKER, entry_id))
+            self._add_name_keys(keys, name_en, entry_id)
+            if name_ko:
+                name_ko_key = name_ko.upper()
+                keys.append((name_ko_key, KEY_NAME, entry_id))
+                # 한글명은 띄어쓰기 없이 쓰이므로 모든 접미사를 키로 (부분 문자열 검색)
+                for start in range(1, len(name_ko_key)):
+                    if not name_ko_key[start].isspace():
+                        keys.append((name_ko_key[start:], KEY_TOKEN, entry_id))
+
+        seen = {entry['ticker'] for entry in entries}
+        for symbol, name in us_stocks.items():
+            if symbol in seen:
+                continue
+            seen.add(symbol)
+            entry_id = len(entries)
+            entries.append({
+                'ticker': symbol,
+                'name': name,
+                'exchange': 'NYSE' if symbol in NYSE_TICKERS else 'NASDAQ',
+                'market': 'US'
+            })
+            keys.append((symbol.upper(), KEY_TICKER, entry_id))
+            self._add_name_keys(keys, name, entry_id)
+
+        keys.sort()
+        self._snapshot = _IndexSnapshot(entries, keys, mtimes)
+        self._checked_at = time.monotonic()
+        logger.info(f"Stock search index built: {len(entries)} entries, {len(keys)} keys")
+
+    @staticmethod
+    def _add_name_keys(keys: List[Tuple[str, int, int]], name: str, entry_id: int):
+        if not name:
+            return
+        name_key = name.upper()
+        keys.append((name_key, KEY_NAME, entry_id))
+        tokens = [token for token in _TOKEN_SPLIT.split(name_key) if token]
+        for token in tokens[1:]:
+            keys.append((token, KEY_TOKEN, entry_id))
+
+    def _current(self) -> _IndexSnapshot:
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < self.reload_check_seconds:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                self.load()
+            elif time.monotonic() - self._checked_at >= self.reload_check_seconds:
+                self._checked_at = time.monotonic()
+                if (_file_mtime(self.korean_file), _file_mtime(self.us_file)) != snapshot.mtimes:
+                    logger.info("Stock list JSON changed, reloading search index")
+                    self.load()
+            return self._snapshot
+
+    # ---------- lookup ----------
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Entries whose ticker, name or name token starts with query
+
+        Args:
+            query: 검색어 (대소문자 무시)
+            limit: 최대 결과 수 (None이면 전체)
+
+        Returns:
+            결과 dict 리스트 (ticker, name, exchange, market, [nameEn, nameKo])
+        """
+        query = (query or '').strip().upper()
+        if not query:
+            return []
+
+        snapshot = self._current()
+        keys = snapshot.keys
+        best: Dict[int, Tuple[int, int]] = {}
+        position = bisect_left(keys, (query,))
+        while position < len(keys):
+            key, kind, entry_id = keys[position]
+            if not key.startswith(query):
+                break
+            rank = (kind, 0 if key == query else 1)
+            if entry_id not in best or rank < best[entry_id]:
+                best[entry_id] = rank
+            position += 1
+
+        ordered = sorted(best, key=lambda entry_id: (best[entry_id], entry_id))
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [dict(snapshot.entries[entry_id]) for entry_id in ordered]
+
+    def stats(self) -> Dict:
+        snapshot = self._current()
+        return {
+            'entries': len(snapshot.entries),
+            'keys': len(snapshot.keys),
+            'korean': sum(1 for entry in snapshot.entries if entry['market'] == 'KR'),
+            'us': sum(1 for entry in snapshot.entries if entry['market'] == 'US')
+        }
+
+
+# Shared index instance (built at app startup)
+stock_search_index = StockSearchIndex()
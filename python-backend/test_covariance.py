@@ -0,0 +1,120 @@
+"""
+Covariance estimator checks against pandas and loop-based reference formulas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from covariance import (
+    TRADING_DAYS,
+    constant_correlation_covariance,
+    covariance_cache,
+    estimate_covariance,
+    ewma_covariance,
+    ledoit_wolf_covariance,
+    sample_covariance,
+    validate_estimator,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    covariance_cache.clear()
+    yield
+    covariance_cache.clear()
+
+
+def make_returns(seed: int = 0, days: int = 120, n_assets: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(size=(n_assets, n_assets)) * 0.01
+    values = rng.standard_t(df=5, size=(days, n_assets)) @ mixing + 0.0005
+    return pd.DataFrame(values, index=pd.bdate_range('2024-01-01', periods=days),
+                        columns=[f"T{i}" for i in range(n_assets)])
+
+
+def test_sample_matches_dataframe_cov():
+    returns = make_returns()
+    covariance, _ = sample_covariance(returns)
+    np.testing.assert_allclose(covariance, returns.cov().values, rtol=1e-12)
+
+
+def test_ledoit_wolf_matches_reference_loops():
+    """Ledoit & Wolf (2004): shrink towards mu * I, intensity min(b^2, d^2) / d^2"""
+    returns = make_returns(1)
+    x = returns.values - returns.values.mean(axis=0)
+    t, n = x.shape
+    sample = x.T @ x / t
+    target = np.trace(sample) / n * np.eye(n)
+    d2 = np.sum((sample - target) ** 2)
+    b2 = sum(np.sum((np.outer(row, row) - sample) ** 2) for row in x) / t ** 2
+    shrinkage = min(b2, d2) / d2
+
+    covariance, info = ledoit_wolf_covariance(returns)
+    assert info['shrinkage'] == pytest.approx(shrinkage, rel=1e-10)
+    np.testing.assert_allclose(covariance, shrinkage * target + (1 - shrinkage) * sample, rtol=1e-10)
+
+
+def test_constant_correlation_matches_reference_loops():
+    """Ledoit & Wolf (2003) constant-correlation target, pi / rho / gamma written entry by entry"""
+    returns = make_returns(2)
+    y = returns.values - returns.values.mean(axis=0)
+    t, n = y.shape
+    s = y.T @ y / t
+    std = np.sqrt(np.diag(s))
+    r_bar = sum(s[i, j] / (std[i] * std[j]) for i in range(n) for j in range(n) if i != j) / (n * (n - 1))
+    target = np.array([[s[i, i] if i == j else r_bar * std[i] * std[j] for j in range(n)] for i in range(n)])
+
+    def pi(i, j):
+        return np.mean((y[:, i] * y[:, j] - s[i, j]) ** 2)
+
+    def theta(k, i, j):
+        return np.mean((y[:, k] ** 2 - s[k, k]) * (y[:, i] * y[:, j] - s[i, j]))
+
+    pi_hat = sum(pi(i, j) for i in range(n) for j in range(n))
+    rho_hat = sum(pi(i, i) for i in range(n)) + sum(
+        r_bar / 2 * (std[j] / std[i] * theta(i, i, j) + std[i] / std[j] * theta(j, i, j))
+        for i in range(n) for j in range(n) if i != j
+    )
+    gamma_hat = np.sum((target - s) ** 2)
+    shrinkage = max(0.0, min(1.0, (pi_hat - rho_hat) / gamma_hat / t))
+
+    covariance, info = constant_correlation_covariance(returns)
+    assert info['average_correlation'] == pytest.approx(r_bar, rel=1e-10)
+    assert info['shrinkage'] == pytest.approx(shrinkage, rel=1e-8)
+    np.testing.assert_allclose(covariance, shrinkage * target + (1 - shrinkage) * s, rtol=1e-8)
+
+
+def test_ewma_matches_pandas_ewm():
+    returns = make_returns(3)
+    covariance, info = ewma_covariance(returns, decay=0.94)
+    reference = returns.ewm(alpha=1 - 0.94, adjust=True).cov(bias=True).loc[returns.index[-1]]
+    assert info['decay'] == 0.94
+    np.testing.assert_allclose(covariance, reference.values, rtol=1e-10)
+
+
+@pytest.mark.parametrize('estimator', ['ledoit-wolf', 'constant-correlation'])
+def test_shrinkage_is_positive_definite_with_few_observations(estimator):
+    """More assets than days: the sample covariance is singular, the shrunk one is not"""
+    returns = make_returns(4, days=15, n_assets=20)
+    covariance, info = estimate_covariance(returns, estimator)
+    assert np.linalg.eigvalsh(returns.cov().values)[0] < 1e-12
+    assert np.linalg.eigvalsh(covariance)[0] > 0
+    assert 0 < info['shrinkage'] <= 1
+
+
+def test_estimate_is_annualized_in_column_order_and_cached():
+    returns = make_returns(5)
+    covariance, info = estimate_covariance(returns, 'sample')
+    np.testing.assert_allclose(covariance, returns.cov().values * TRADING_DAYS, rtol=1e-12)
+    assert info == {'estimator': 'sample', 'cached': False}
+
+    reordered = returns[['T2', 'T0', 'T3', 'T1']]
+    covariance_reordered, info = estimate_covariance(reordered, 'sample')
+    np.testing.assert_allclose(covariance_reordered, reordered.cov().values * TRADING_DAYS, rtol=1e-12)
+    assert info['cached'] is True
+
+
+def test_unknown_estimator_is_rejected():
+    with pytest.raises(ValueError):
+        validate_estimator('shrink-everything')
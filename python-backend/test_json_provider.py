@@ -0,0 +1,49 @@
+"""
+SanitizingJSONProvider checks: emojis removed from string values only, as the old clean_dict did
+"""
+
+import json
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from json_provider import SanitizingJSONProvider, remove_emojis
+
+PAYLOAD = {
+    'message': '최적화 완료 🚀',
+    '📈 trend': 'up ✅',  # Emoji in a key: kept, only the value is cleaned
+    'quote "🎯" key': ['a "quoted 🎯" value', 'back\\slash 🔥', 'ascii'],
+    'nested': {'name': '삼성전자 ⭐', 'weights': [0.5, 0.5], 'ok': True, 'none': None},
+    'colon': 'value: with 🌟 colon'
+}
+
+
+def clean_dict(obj):
+    """Pre-provider after_request sanitizer (values only)"""
+    if isinstance(obj, dict):
+        return {k: clean_dict(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [clean_dict(item) for item in obj]
+    if isinstance(obj, str):
+        return remove_emojis(obj)
+    return obj
+
+
+@pytest.fixture
+def provider():
+    app = Flask(__name__)
+    app.json = SanitizingJSONProvider(app)
+    return app.json
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'indent': 2}])  # orjson (when installed) and json paths
+def test_only_values_are_sanitized(provider, kwargs):
+    text = provider.dumps(PAYLOAD, **kwargs)
+    assert json.loads(text) == clean_dict(PAYLOAD)
+    assert '📈 trend' in json.loads(text)
+
+
+def test_ascii_and_numpy_payloads_pass_through(provider):
+    payload = {'weights': np.array([0.25, 0.75]), 'risk': np.float64(0.1), 'name': 'AAPL'}
+    assert json.loads(provider.dumps(payload)) == {'weights': [0.25, 0.75], 'risk': 0.1, 'name': 'AAPL'}
@@ -0,0 +1,143 @@
+"""
+Solver checks against brute-force references
+최적화 솔버 단위 테스트 (작은 문제에서 전수/격자 탐색 결과와 비교)
+"""
+
+import numpy as np
+import pytest
+
+import optimizer
+from optimizer import _project_onto_simplex, _qubo_energies, _solve_exact_qubo, _solve_mean_variance
+
+
+def _project_by_bisection(v: np.ndarray) -> np.ndarray:
+    """Reference simplex projection: find theta with sum(max(v - theta, 0)) = 1 by bisection"""
+    low, high = v.min() - 1.0, v.max()
+    for _ in range(200):
+        theta = (low + high) / 2
+        if np.maximum(v - theta, 0.0).sum() > 1.0:
+            low = theta
+        else:
+            high = theta
+    return np.maximum(v - (low + high) / 2, 0.0)
+
+
+def _brute_force_energies(linear: np.ndarray, quadratic: np.ndarray) -> np.ndarray:
+    """linear @ x + x^T Q x for every state, x_k = (index >> k) & 1"""
+    num_vars = len(linear)
+    states = (np.arange(1 << num_vars)[:, None] >> np.arange(num_vars)) & 1
+    return states @ linear + np.einsum('si,ij,sj->s', states, quadratic, states)
+
+
+def _random_qubo(rng: np.random.Generator, num_vars: int):
+    return rng.normal(size=num_vars), rng.normal(size=(num_vars, num_vars))
+
+
+def _random_covariance(rng: np.random.Generator, n_assets: int) -> np.ndarray:
+    returns = rng.normal(0.0005, 0.02, size=(250, n_assets)) @ rng.normal(size=(n_assets, n_assets)) * 0.5
+    return np.cov(returns, rowvar=False) * 252
+
+
+# ---------- simplex projection ----------
+
+@pytest.mark.parametrize('n_assets', [1, 2, 5, 50])
+def test_simplex_projection_matches_bisection(n_assets):
+    rng = np.random.default_rng(n_assets)
+    for scale in (0.1, 1.0, 10.0):
+        v = rng.normal(scale=scale, size=n_assets)
+        np.testing.assert_allclose(_project_onto_simplex(v), _project_by_bisection(v), atol=1e-10)
+
+
+def test_simplex_projection_keeps_points_on_the_simplex():
+    w = np.array([0.2, 0.0, 0.5, 0.3])
+    np.testing.assert_allclose(_project_onto_simplex(w), w, atol=1e-12)
+
+
+def test_simplex_projection_is_the_closest_grid_point():
+    rng = np.random.default_rng(7)
+    grid = np.array([(a, b, 1 - a - b) for a in np.linspace(0, 1, 201) for b in np.linspace(0, 1, 201) if a + b <= 1 + 1e-12])
+    grid = np.maximum(grid, 0.0)
+    for _ in range(5):
+        v = rng.normal(size=3)
+        projected = _project_onto_simplex(v)
+        assert projected.min() >= 0 and projected.sum() == pytest.approx(1.0)
+        closest = grid[np.argmin(((grid - v) ** 2).sum(axis=1))]
+        assert np.sum((projected - v) ** 2) <= np.sum((closest - v) ** 2) + 1e-12
+        np.testing.assert_allclose(projected, closest, atol=0.01)
+
+
+# ---------- FISTA mean-variance ----------
+
+@pytest.mark.parametrize('lambda_param', [0.0, 0.3, 0.5, 0.9])
+def test_mean_variance_matches_grid_search(lambda_param):
+    rng = np.random.default_rng(11)
+    mean_returns = rng.normal(0.1, 0.1, size=3)
+    cov_matrix = _random_covariance(rng, 3)
+
+    weights, _, converged = _solve_mean_variance(mean_returns, cov_matrix, lambda_param)
+
+    step = np.linspace(0, 1, 401)
+    grid = np.array([(a, b, 1 - a - b) for a in step for b in step if a + b <= 1 + 1e-12])
+    grid = np.maximum(grid, 0.0)
+    objective = -lambda_param * grid @ mean_returns + (1 - lambda_param) * np.einsum('ki,ij,kj->k', grid, cov_matrix, grid)
+    solved = -lambda_param * mean_returns @ weights + (1 - lambda_param) * weights @ cov_matrix @ weights
+
+    assert converged
+    assert weights.min() >= 0 and weights.sum() == pytest.approx(1.0)
+    assert solved <= objective.min() + 1e-9
+    np.testing.assert_allclose(weights, grid[np.argmin(objective)], atol=0.01)
+
+
+@pytest.mark.parametrize('n_assets', [5, 30])
+def test_mean_variance_satisfies_kkt(n_assets):
+    """Optimal iff the gradient is equal on the support and not smaller off it"""
+    rng = np.random.default_rng(n_assets)
+    mean_returns = rng.normal(0.1, 0.1, size=n_assets)
+    cov_matrix = _random_covariance(rng, n_assets)
+    lambda_param = 0.5
+
+    weights, _, converged = _solve_mean_variance(mean_returns, cov_matrix, lambda_param)
+    gradient = -lambda_param * mean_returns + 2 * (1 - lambda_param) * cov_matrix @ weights
+    support = weights > 1e-8
+
+    assert converged
+    np.testing.assert_allclose(gradient[support], gradient[support].mean(), atol=1e-6)
+    assert np.all(gradient[~support] >= gradient[support].mean() - 1e-6)
+
+
+def test_mean_variance_warm_start_reaches_the_same_optimum():
+    rng = np.random.default_rng(3)
+    mean_returns = rng.normal(0.1, 0.1, size=8)
+    cov_matrix = _random_covariance(rng, 8)
+
+    cold, _, _ = _solve_mean_variance(mean_returns, cov_matrix, 0.4)
+    warm, _, _ = _solve_mean_variance(mean_returns, cov_matrix, 0.4, initial_weights=rng.random(8),
+                                      max_eigenvalue=float(np.linalg.eigvalsh(cov_matrix)[-1]))
+    np.testing.assert_allclose(warm, cold, atol=1e-6)
+
+
+# ---------- exact QUBO enumeration ----------
+
+@pytest.mark.parametrize('num_vars', [1, 4, 9])
+def test_qubo_energy_table_matches_brute_force(num_vars):
+    linear, quadratic = _random_qubo(np.random.default_rng(num_vars), num_vars)
+    np.testing.assert_allclose(_qubo_energies(linear, quadratic), _brute_force_energies(linear, quadratic), atol=1e-9)
+
+
+@pytest.mark.parametrize('num_vars, block_bits', [(6, 16), (8, 3), (10, 4), (12, 1)])
+def test_exact_solver_matches_brute_force(monkeypatch, num_vars, block_bits):
+    """Small block sizes force the Gray-code walk over the high bits"""
+    monkeypatch.setattr(optimizer, 'EXACT_SOLVER_BLOCK_BITS', block_bits)
+    precision = 2
+    n_assets = num_vars // precision
+    for seed in range(3):
+        linear, quadratic = _random_qubo(np.random.default_rng(seed), num_vars)
+        energies = _brute_force_energies(linear, quadratic)
+
+        solution = _solve_exact_qubo(linear, quadratic, n_assets, precision)
+        bits = np.array([solution.variables_dict[f'x_{i}_{bit}'] for i in range(n_assets) for bit in range(precision)])
+
+        assert solution.fval == pytest.approx(energies.min(), abs=1e-9)
+        assert linear @ bits + bits @ quadratic @ bits == pytest.approx(energies.min(), abs=1e-9)
+        assert solution.metadata['max_energy'] == pytest.approx(energies.max(), abs=1e-9)
+        assert solution.metadata['states'] == 1 << num_vars
@@ -0,0 +1,167 @@
+"""
+RollingStats checks: incremental add/subtract window updates against DataFrame.mean()/cov(),
+boundary-row validation, on-disk footprint and pruning
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rolling_stats
+from rolling_stats import RollingStatsStore, daily_returns
+
+WINDOW = 120
+TICKERS = ['AAPL', 'MSFT', 'NVDA', 'TSLA']
+
+
+@pytest.fixture
+def returns() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = rng.normal(0.0005, 0.02, size=(300, 4)) @ rng.normal(size=(4, 4)) * 0.3
+    return pd.DataFrame(values, index=pd.bdate_range('2023-01-02', periods=300), columns=TICKERS)
+
+
+@pytest.fixture
+def store(tmp_path) -> RollingStatsStore:
+    return RollingStatsStore(directory=str(tmp_path))
+
+
+def assert_matches_pandas(result, frame: pd.DataFrame):
+    mean, covariance, _ = result
+    np.testing.assert_allclose(mean, frame.mean().values, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(covariance, frame.cov().values, rtol=1e-7, atol=1e-15)
+
+
+def test_sliding_window_updates_incrementally(store, returns):
+    assert store.get(returns.iloc[:WINDOW], '6mo')[2] == 'created'
+
+    start = 0
+    for shift in [1, 1, 3, 1, 5, 2, 1]:
+        start += shift
+        frame = returns.iloc[start:start + WINDOW]
+        result = store.get(frame, '6mo')
+        assert result[2] == 'incremental'
+        assert_matches_pandas(result, frame)
+
+
+def test_growing_and_shrinking_window(store, returns):
+    store.get(returns.iloc[:100], '1y')
+
+    result = store.get(returns.iloc[:110], '1y')  # Rows added only
+    assert result[2] == 'incremental'
+    assert_matches_pandas(result, returns.iloc[:110])
+
+    result = store.get(returns.iloc[10:110], '1y')  # Rows removed only
+    assert result[2] == 'incremental'
+    assert_matches_pandas(result, returns.iloc[10:110])
+
+
+def test_same_window_is_unchanged(store, returns):
+    store.get(returns.iloc[:WINDOW], '6mo')
+    assert store.get(returns.iloc[:WINDOW], '6mo')[2] == 'unchanged'
+
+
+def test_revised_boundary_moved_back_or_jumped_window_rebuilds(store, returns):
+    store.get(returns.iloc[10:10 + WINDOW], '6mo')
+
+    revised = returns.iloc[11:11 + WINDOW].copy()
+    revised.iloc[WINDOW - 2, 0] *= 1.01  # Adjusted close changed on the stored window's last day
+    result = store.get(revised, '6mo')
+    assert result[2] == 'rebuild'
+    assert_matches_pandas(result, revised)
+
+    revised = returns.iloc[12:12 + WINDOW].copy()
+    revised.iloc[0, 1] *= 1.01  # ... or on the new window's first day
+    assert store.get(revised, '6mo')[2] == 'rebuild'
+
+    result = store.get(returns.iloc[0:WINDOW], '6mo')  # Moved back
+    assert result[2] == 'rebuild'
+    assert_matches_pandas(result, returns.iloc[0:WINDOW])
+
+    result = store.get(returns.iloc[WINDOW + 20:2 * WINDOW + 20], '6mo')  # No overlap
+    assert result[2] == 'rebuild'
+    assert_matches_pandas(result, returns.iloc[WINDOW + 20:2 * WINDOW + 20])
+
+
+def test_periodic_rebuild_bounds_drift(monkeypatch, store, returns):
+    monkeypatch.setattr(rolling_stats, 'ROLLING_REBUILD_EVERY', 3)
+    store.get(returns.iloc[:WINDOW], '6mo')
+
+    modes = [store.get(returns.iloc[day:day + WINDOW], '6mo')[2] for day in range(1, 6)]
+    assert modes == ['incremental', 'incremental', 'incremental', 'rebuild', 'incremental']
+
+
+def test_state_file_holds_no_return_rows_and_rows_are_appended(tmp_path, store, returns):
+    store.get(returns.iloc[:WINDOW], '6mo')
+    store.get(returns.iloc[3:WINDOW + 3], '6mo')
+
+    (state,) = tmp_path.glob('*.npz')
+    with np.load(state) as stored:
+        assert all(stored[name].size <= len(TICKERS) ** 2 for name in stored.files)
+    (rows,) = tmp_path.glob('*.rows')
+    assert rows.stat().st_size == (WINDOW + 3) * len(TICKERS) * 8  # Entering rows appended, nothing rewritten
+
+
+def test_row_files_are_compacted(monkeypatch, tmp_path, store, returns):
+    monkeypatch.setattr(rolling_stats, 'ROLLING_COMPACT_MIN_ROWS', 10)
+    monkeypatch.setattr(rolling_stats, 'ROLLING_REBUILD_EVERY', 1000)
+    window = 20
+    for day in range(60):
+        result = store.get(returns.iloc[day:day + window], '3mo')
+    assert_matches_pandas(result, returns.iloc[59:59 + window])
+
+    (rows,) = tmp_path.glob('*.rows')  # Retired generations deleted
+    assert rows.stat().st_size <= 2 * window * len(TICKERS) * 8
+
+
+def test_fresh_store_returns_caller_column_order_and_persists(tmp_path, store, returns):
+    frame = returns.iloc[:WINDOW][['TSLA', 'AAPL', 'NVDA', 'MSFT']]
+    result = store.get(frame, '6mo')
+    assert result[2] == 'created'
+    assert_matches_pandas(result, frame)
+
+    # Fresh store on the same directory (another worker): loads the universe from disk, other column order
+    next_frame = returns.iloc[1:WINDOW + 1][['MSFT', 'NVDA', 'TSLA', 'AAPL']]
+    result = RollingStatsStore(directory=str(tmp_path)).get(next_frame, '6mo')
+    assert result[2] == 'incremental'
+    assert_matches_pandas(result, next_frame)
+
+    # The first store notices the state changed on disk instead of sliding from its stale copy
+    result = store.get(returns.iloc[2:WINDOW + 2], '6mo')
+    assert result[2] == 'incremental'
+    assert_matches_pandas(result, returns.iloc[2:WINDOW + 2])
+
+
+def test_refresh_from_prices_matches_full_returns(store):
+    rng = np.random.default_rng(3)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(200, 3)), axis=0)),
+                          index=pd.bdate_range('2024-01-01', periods=200), columns=['A', 'B', 'C'])
+    store.get(daily_returns(prices.iloc[:150]), '6mo')
+
+    assert store.refresh(prices.iloc[2:153], '6mo') == 'incremental'
+    result = store.get(daily_returns(prices.iloc[2:153]), '6mo')
+    assert result[2] == 'unchanged'
+    assert_matches_pandas(result, daily_returns(prices.iloc[2:153]))
+
+
+def test_prune_drops_idle_then_least_recently_used(tmp_path, returns):
+    store = RollingStatsStore(directory=str(tmp_path), max_universes=2, max_idle_days=30)
+    frame = returns.iloc[:WINDOW]
+    for columns in (['AAPL', 'MSFT'], ['MSFT', 'NVDA'], ['NVDA', 'TSLA'], ['AAPL', 'TSLA']):
+        store.get(frame[columns], '6mo')
+
+    states = {path.stem: path for path in tmp_path.glob('*.npz')}
+    now = time.time()
+    ages = {'AAPL,MSFT': 40, 'MSFT,NVDA': 3, 'NVDA,TSLA': 2, 'AAPL,TSLA': 1}  # Days since last request
+    for path in states.values():
+        with np.load(path) as stored:
+            age = ages[','.join(stored['tickers'])]
+        os.utime(path, (now - age * 86400, now - age * 86400))
+
+    assert store.prune() == 2  # AAPL,MSFT idle too long, MSFT,NVDA over the count bound
+    assert sorted(','.join(tickers) for _, tickers in store.universes()) == ['AAPL,TSLA', 'NVDA,TSLA']
+    assert len(list(tmp_path.glob('*.rows'))) == 2 and len(list(tmp_path.glob('*.dates'))) == 2
+    assert store.get(frame[['AAPL', 'MSFT']], '6mo')[2] == 'created'
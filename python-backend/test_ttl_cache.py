@@ -0,0 +1,196 @@
+"""
+TTLCache checks: TTL expiry, LRU eviction, single-flight loads, stale-while-revalidate
+"""
+
+import threading
+import time
+
+import pytest
+
+import ttl_cache
+from ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', fake)
+    return fake
+
+
+def counting_loader(value='v'):
+    calls = []
+
+    def load():
+        calls.append(True)
+        return f"{value}{len(calls)}"
+    return load, calls
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_hit_until_ttl_then_reload(clock):
+    cache = TTLCache(ttl=10)
+    load, calls = counting_loader()
+
+    assert cache.get('k', load) == 'v1'
+    clock.now += 9.9
+    assert cache.get('k', load) == 'v1'
+    clock.now += 0.2
+    assert cache.get('k', load) == 'v2'
+    assert len(calls) == 2
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_none_is_not_cached(clock):
+    cache = TTLCache(ttl=10)
+    calls = []
+    assert cache.get('k', lambda: calls.append(True)) is None
+    assert cache.get('k', lambda: calls.append(True)) is None
+    assert len(calls) == 2 and cache.peek('k') is None
+
+
+def test_lru_eviction_keeps_recently_used(clock):
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a', lambda: pytest.fail("a should be cached")) == 1
+    cache.set('c', 3)
+
+    assert cache.peek('b') is None
+    assert cache.peek('a') == 1 and cache.peek('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_set_ttl_override_and_invalidate(clock):
+    cache = TTLCache(ttl=10)
+    cache.set('short', 1, ttl=1)
+    cache.set('long', 2)
+    clock.now += 2
+    assert cache.peek('short') is None and cache.peek('long') == 2
+
+    cache.invalidate('long')
+    assert cache.peek('long') is None
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def slow_load():
+        calls.append(True)
+        release.wait(5)
+        return 'shared'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('k', slow_load))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.stats()['misses'] == 8)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['shared'] * 8
+    assert len(calls) == 1
+
+
+def test_loader_error_reaches_every_waiter_and_is_not_cached():
+    cache = TTLCache(ttl=60)
+    release = threading.Event()
+
+    def failing_load():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    errors = []
+
+    def caller():
+        try:
+            cache.get('k', failing_load)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.stats()['misses'] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ["upstream down"] * 4
+    assert cache.get('k', lambda: 'recovered') == 'recovered'
+
+
+def test_stale_value_served_while_one_background_refresh_runs(clock):
+    cache = TTLCache(ttl=10, stale_ttl=100)
+    cache.set('k', 'old')
+    clock.now += 15
+
+    release = threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(True)
+        release.wait(5)
+        return 'new'
+
+    assert cache.get('k', refresh) == 'old'
+    assert cache.get('k', refresh) == 'old'  # Refresh already running: not scheduled again
+    release.set()
+    wait_until(lambda: cache.peek('k') == 'new')
+
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats['stale_hits'] == 2 and stats['refreshes'] == 1
+
+
+def test_past_stale_window_is_a_miss(clock):
+    cache = TTLCache(ttl=10, stale_ttl=5)
+    cache.set('k', 'old')
+    clock.now += 16
+    assert cache.get('k', lambda: 'new') == 'new'
+    assert cache.stats()['misses'] == 1
+
+
+def test_uncacheable_value_is_returned_but_never_stored():
+    cache = TTLCache(ttl=60)
+    release = threading.Event()
+
+    def fallback_load():
+        release.wait(5)
+        return {'status': 'fallback'}
+
+    def cacheable(value):
+        return value['status'] != 'fallback'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('k', fallback_load, cacheable=cacheable)))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.stats()['misses'] == 3)
+    assert cache.peek('k') is None  # Nothing visible while the load runs
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [{'status': 'fallback'}] * 3
+    assert cache.peek('k') is None
+    assert cache.get('k', lambda: {'status': 'ok'}, cacheable=cacheable) == {'status': 'ok'}
+    assert cache.peek('k') == {'status': 'ok'}
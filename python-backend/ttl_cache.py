@@ -0,0 +1,164 @@
+"""
+Bounded in-process cache with per-entry TTL
+LRU 제거 + TTL 만료 + stale-while-revalidate
+
+- Fresh entry: 그대로 반환 (hit)
+- Stale entry (TTL 경과, stale 기간 이내): 기존 값 반환 + 백그라운드 갱신 1회 (stale)
+- Miss: loader 호출. 같은 키에 대한 동시 miss는 한 번만 로드 (single-flight)
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'stale_until')
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with TTL and stale-while-revalidate
+
+    Args:
+        max_size: 최대 엔트리 수 (초과 시 LRU 제거)
+        ttl: fresh 유지 시간 (초)
+        stale_ttl: TTL 경과 후 stale 값을 제공할 추가 시간 (초, 0이면 비활성화)
+        refresh_workers: 백그라운드 갱신 스레드 수
+        name: 로그/스레드 이름
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 30.0, stale_ttl: float = 0.0,
+                 refresh_workers: int = 2, name: str = 'cache'):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self._refresh_workers = refresh_workers
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._refreshing = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'refreshes': 0, 'refresh_errors': 0, 'evictions': 0}
+
+    def get(self, key: Hashable, loader: Callable[[], Any],
+            cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Cached value for key, loading it with loader() on a miss
+
+        loader() returning None, or a value for which cacheable(value) is false, is
+        returned (also to concurrent callers waiting on the same key) but never stored.
+        Exceptions from loader() propagate to the caller and the waiters.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry.value
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self._stats['stale_hits'] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._get_executor().submit(self._refresh, key, loader, cacheable)
+                return entry.value
+
+            self._stats['misses'] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+            if value is not None and (cacheable is None or cacheable(value)):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def peek(self, key: Hashable, allow_stale: bool = True) -> Any:
+        """Cached value without loading (None if absent/expired)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now < entry.expires_at or (allow_stale and now < entry.stale_until):
+                return entry.value
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(value, now + ttl, now + ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['stale_hits'] + self._stats['misses']
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'stale_ttl_seconds': self.stale_ttl,
+                **self._stats,
+                'hit_rate': round((self._stats['hits'] + self._stats['stale_hits']) / lookups, 4) if lookups else 0.0
+            }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Called with self._lock held; threads start lazily on first refresh
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._refresh_workers,
+                                                thread_name_prefix=f"{self.name}-refresh")
+        return self._executor
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], cacheable: Optional[Callable[[Any], bool]]):
+        try:
+            value = loader()
+            if value is not None and (cacheable is None or cacheable(value)):
+                self.set(key, value)
+            with self._lock:
+                self._stats['refreshes'] += 1
+        except Exception as e:
+            logger.warning(f"[{self.name}] Background refresh failed for {key}: {e}")
+            with self._lock:
+                self._stats['refresh_errors'] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -0,0 +1,106 @@
+"""
+Background warm-up and readiness
+무거운 의존성(qiskit, yfinance)을 요청 경로 밖에서 미리 로드
+
+- app.py import 는 가볍게 유지하고 (qiskit/yfinance 는 첫 사용 시 import),
+  warm-up 스레드가 LAZY_MODULES 를 import 하고 solver pool 을 띄움
+- /api/health/live: 프로세스가 응답하면 200 (liveness)
+- /api/health/ready: warm-up 완료 시 200, 진행 중이면 503 (readiness)
+- gunicorn: post_fork 에서 워커마다 시작 (master 에서 스레드를 띄운 채 fork 하지 않음)
+- dev server: app.py __main__ 에서 시작
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Imported lazily by the request code; profile_imports.py fails if app.py imports them eagerly
+LAZY_MODULES = [
+    'qiskit',
+    'qiskit.primitives',
+    'qiskit_algorithms.optimizers',
+    'qiskit_optimization',
+    'yfinance',
+    'requests',
+]
+WARMUP_SOLVER_POOL = os.getenv('WARMUP_SOLVER_POOL', '1') == '1'  # Spawn solver workers during warm-up
+
+
+class Warmup:
+    """Runs the warm-up steps once per process on a daemon thread"""
+
+    def __init__(self, modules: Optional[List[str]] = None, solver_pool: bool = WARMUP_SOLVER_POOL):
+        self.modules = list(LAZY_MODULES if modules is None else modules)
+        self.solver_pool = solver_pool
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._thread: Optional[threading.Thread] = None
+        self.state = 'idle'  # idle -> running -> ready
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self) -> 'Warmup':
+        """Start warm-up in this process if it hasn't run yet (idempotent, fork-aware)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's thread and results don't carry over
+                self._reset()
+            if self._thread is None:
+                self.state = 'running'
+                self.started_at = time.perf_counter()
+                self._thread = threading.Thread(target=self._run, name='warmup', daemon=True)
+                self._thread.start()
+        return self
+
+    def _step(self, name: str, func):
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            logger.warning(f"Warm-up step {name} failed: {e}")
+        finally:
+            self.steps[name] = round(time.perf_counter() - started, 4)
+
+    def _run(self):
+        for module_name in self.modules:
+            self._step(f"import:{module_name}", lambda: importlib.import_module(module_name))
+        if self.solver_pool:
+            from solver_pool import get_solver_pool
+            self._step('solver_pool', get_solver_pool)
+        self.finished_at = time.perf_counter()
+        self.state = 'ready'
+        logger.info(f"Warm-up finished in {self.finished_at - self.started_at:.2f}s"
+                    + (f" ({len(self.errors)} step(s) failed)" if self.errors else ""))
+
+    @property
+    def ready(self) -> bool:
+        """Finished in this process (failed optional steps don't block readiness; see errors)"""
+        return self._pid == os.getpid() and self.state == 'ready'
+
+    def status(self) -> Dict:
+        forked = self._pid != os.getpid()
+        elapsed = None
+        if self.started_at is not None and not forked:
+            elapsed = round((self.finished_at or time.perf_counter()) - self.started_at, 4)
+        return {
+            'ready': self.ready,
+            'state': 'idle' if forked else self.state,
+            'elapsed_seconds': elapsed,
+            'steps': {} if forked else dict(self.steps),
+            'errors': {} if forked else dict(self.errors)
+        }
+
+
+# Shared warm-up instance
+warmup = Warmup()
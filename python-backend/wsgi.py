@@ -0,0 +1,38 @@
+"""
+Production WSGI entry point
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app (gunicorn.conf.py) this module is imported once in the gunicorn
+master: the heavy libraries, the optimizer and the stock search index are loaded
+before the workers fork, so every worker shares them copy-on-write instead of
+importing them again. `python app.py` (Flask dev server) stays the development /
+Windows entry point.
+"""
+
+import importlib
+import logging
+
+from warmup import LAZY_MODULES
+
+logger = logging.getLogger(__name__)
+
+# Imported in the master even though app.py only imports LAZY_MODULES on first use
+PRELOAD_MODULES = [
+    'numpy',
+    'pandas',
+    *LAZY_MODULES,
+    'optimizer',
+    'covariance',
+    'rolling_stats',
+]
+
+for module_name in PRELOAD_MODULES:
+    try:
+        importlib.import_module(module_name)
+    except ImportError as e:
+        logger.warning(f"Preload of {module_name} failed (workers import it on demand): {e}")
+
+from app import app  # noqa: E402  (also builds the stock search index)
+
+application = app